@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Time amenity/type inference: saunalib.classify vs a re.I regex per rule
+
+Generates N venues with a few synthetic reviews each, classifies them with
+saunalib.classify and with the enrich-saunas.js approach (every pattern
+tested separately with re.I), checks both give the same answer, and times
+the compiled classifier across worker processes.
+
+Usage: python3 scripts/benchmarks/classify.py [--venues N] [--reviews N] [--processes N ...]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from saunalib.classify import (AMENITY_PATTERNS, CATEGORY_MEMBERS, TYPE_RULES,  # noqa: E402
+                               enrich_many, enrich_venue, text_corpus)
+
+FILLER = ("great place friendly staff clean towels parking was easy would come back again the "
+          "lounge area was quiet and the tea was lovely prices are fair for the city booking "
+          "online took a minute locker rooms were spotless").split()
+PHRASES = ["cold plunge", "ice bath", "steam room", "eucalyptus steam", "hot tub", "jacuzzi",
+           "body scrub", "deep tissue massage", "co-ed", "men and women", "private suite",
+           "hourly booking", "finnish sauna", "wood-fired sauna", "infrared sauna", "hammam",
+           "jjimjilbang", "korean body scrub", "book a private room", "swimming pool", "couples"]
+NAMES = ["Banya", "Infrared Studio", "Sauna House", "Spa", "Bathhouse", "Wellness", "Sweat Lodge"]
+
+
+def synthetic_venues(count, reviews, seed=1):
+    rng = random.Random(seed)
+
+    def sentence(words):
+        text = [rng.choice(FILLER) for _ in range(words)]
+        for _ in range(rng.randint(0, 2)):
+            text.insert(rng.randrange(len(text)), rng.choice(PHRASES))
+        return " ".join(text).capitalize() + "."
+
+    return [{
+        "id": i,
+        "name": f"{rng.choice(FILLER).title()} {rng.choice(NAMES)}",
+        "description": sentence(15),
+        "types": rng.sample(["Day Spa", "Traditional Banya", "Korean Spa", "Boutique Sauna"], rng.randint(0, 1)),
+        "amenities": rng.sample(["cold_plunge", "massage", "pool"], rng.randint(0, 2)),
+        "editorial": sentence(20),
+        "reviews": [" ".join(sentence(18) for _ in range(5)) for _ in range(reviews)],
+    } for i in range(count)]
+
+
+NAIVE_AMENITIES = {a: re.compile(p, re.I) for a, p in AMENITY_PATTERNS.items()}
+NAIVE_TYPES = [(t, c, re.compile(p, re.I), name_only) for t, c, p, name_only in TYPE_RULES]
+
+
+def naive(venue):
+    """enrichAmenities() / enrichTypes() from enrich-saunas.js, one regex at a time"""
+    corpus = text_corpus(venue["name"], venue["description"], venue["editorial"], venue["reviews"])
+    amenities = list(venue["amenities"])
+    for amenity, pattern in NAIVE_AMENITIES.items():
+        if amenity not in amenities and pattern.search(corpus):
+            amenities.append(amenity)
+    types = list(venue["types"])
+    for sauna_type, category, pattern, name_only in NAIVE_TYPES:
+        if sauna_type in types or any(t in types for t in CATEGORY_MEMBERS.get(category, ())):
+            continue
+        if pattern.search(venue["name"] if name_only else f"{venue['name']} {venue['description']}"):
+            types.append(sauna_type)
+    return amenities, types
+
+
+def timed(label, fn, venues, chars):
+    start = time.perf_counter()
+    results = fn(venues)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<22} {elapsed:>7.2f}s  {len(venues) / elapsed:>9.0f} venues/s  "
+          f"{chars / elapsed / 1e6:>6.1f} MB/s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--venues", type=int, default=10_000)
+    parser.add_argument("--reviews", type=int, default=5)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    venues = synthetic_venues(args.venues, args.reviews)
+    chars = sum(len(text_corpus(v["name"], v["description"], v["editorial"], v["reviews"])) for v in venues)
+    print(f"{args.venues} venues, {args.reviews} reviews each, {chars / 1e6:.1f} MB of text")
+
+    expected = timed("regex per rule", lambda vs: [naive(v) for v in vs], venues, chars)
+    compiled = timed("saunalib.classify", lambda vs: [enrich_venue(v) for v in vs], venues, chars)
+    mismatches = sum(1 for want, got in zip(expected, compiled) if want != (got["amenities"], got["types"]))
+    print(f"  {'✅' if not mismatches else '❌'} {mismatches} venues differ")
+    for processes in sorted(set(args.processes)):
+        timed(f"classify, {processes} process(es)",
+              lambda vs: list(enrich_many(vs, processes=processes)), venues, chars)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Time fuzzy duplicate detection on synthetic venues
+
+Generates N venues clustered around a few dozen US city centres, copies a few percent of them with the
+kind of drift two sources produce (a suffixed name, "Street" vs "St", a
+nudged pin), and reports how long saunalib.duplicates takes to find them
+and how many of the planted copies it recovered.
+
+Usage: python3 scripts/benchmarks/duplicates.py [--rows N ...] [--seed N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from saunalib.duplicates import find_duplicates  # noqa: E402
+
+SYLLABLES = [
+    "ka", "lo", "mi", "ra", "tu", "ve", "no", "sha", "zen", "pur", "aks", "el", "fin", "or",
+    "ly", "bo", "que", "dar", "hel", "sin", "ki", "lum", "sau", "tor", "vik", "an", "ber", "dal",
+]
+KINDS = ["Sauna", "Spa", "Bathhouse", "Wellness", "Sauna House", "Day Spa", "Banya"]
+STREETS = ["Main Street", "Oak Avenue", "Broadway", "Elm Street", "Lake Shore Drive",
+           "Pine Street", "Milwaukee Avenue", "Clark Street", "Halsted Street", "Western Avenue"]
+
+
+def synthetic_venues(count, duplicate_share=0.03, cities=40, seed=1):
+    rng = random.Random(seed)
+    centres = [(rng.uniform(30, 48), rng.uniform(-122, -74), rng.randint(10000, 99000))
+               for _ in range(cities)]
+    venues = []
+    for i in range(count):
+        lat, lng, zip_base = rng.choice(centres)
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).title()
+        venues.append({
+            "id": i,
+            "name": f"{name} {rng.choice(KINDS)}",
+            "address": f"{rng.randint(1, 9999)} {rng.choice(STREETS)}, Springfield, ST "
+                       f"{zip_base + rng.randint(0, 60)}",
+            "lat": rng.gauss(lat, 0.08),
+            "lng": rng.gauss(lng, 0.1),
+        })
+    planted = set()
+    for original in rng.sample(venues, int(count * duplicate_share)):
+        copy = dict(original, id=len(venues))
+        copy["name"] += rng.choice([" - Chicago", " Lakeview", "", " & Spa"])
+        copy["address"] = copy["address"].replace(" Street", " St").replace(" Avenue", " Ave")
+        copy["lat"] += rng.uniform(-0.0003, 0.0003)
+        copy["lng"] += rng.uniform(-0.0003, 0.0003)
+        venues.append(copy)
+        planted.add((original["id"], copy["id"]))
+    return venues, planted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}  {'seconds':>8}  {'pairs':>6}  {'recall':>6}")
+    for count in args.rows:
+        venues, planted = synthetic_venues(count, seed=args.seed)
+        start = time.perf_counter()
+        pairs = find_duplicates(venues)
+        elapsed = time.perf_counter() - start
+        found = {(a["id"], b["id"]) for _, a, b, _ in pairs}
+        recall = len(planted & found) / len(planted) if planted else 1.0
+        print(f"{len(venues):>8}  {elapsed:>8.3f}  {len(pairs):>6}  {recall:>6.1%}")
+
+
+if __name__ == "__main__":
+    main()
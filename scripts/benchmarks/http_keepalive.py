@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Compare connections opened by urllib vs saunalib's keep-alive client
+
+Runs N GET requests against a local HTTP/1.1 server and reports how many TCP
+connections each approach opened and how long it took.
+
+Usage: python3 scripts/benchmarks/http_keepalive.py [--requests N] [--workers N]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from saunalib.httpclient import HTTPClient  # noqa: E402
+
+BODY = b'{"status": "OK", "results": [{"place_id": "ChIJbenchmark"}]}'
+
+
+class CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        with self._lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(label, server, fetch, requests, workers):
+    server.connections = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda _: fetch(), range(requests)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {requests:>6} requests  {server.connections:>6} connections  {elapsed * 1000:>8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    server = CountingServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/maps/api/place/textsearch/json"
+
+    def with_urllib():
+        with urllib.request.urlopen(url) as resp:
+            return resp.read()
+
+    client = HTTPClient()
+
+    run("urllib", server, with_urllib, args.requests, args.workers)
+    run("HTTPClient", server, lambda: client.get(url).body, args.requests, args.workers)
+
+    client.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Resolver and photo-pipeline throughput against the local fake Places API
+
+Starts saunalib.fake_places (made-up answers, fixed latency) and
+saunalib.fake_supabase in-process, then runs Place ID resolution and the
+photo scrape pipeline at each concurrency level and reports lookups and
+photos per second. Nothing leaves the machine and no quota is spent.
+
+Usage: python3 scripts/benchmarks/places.py [--venues N] [--concurrency N ...] [--latency MS]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from saunalib.fake_places import FakePlaces  # noqa: E402
+from saunalib.fake_supabase import FakeSupabase  # noqa: E402
+from saunalib.httpclient import supabase_client  # noqa: E402
+from saunalib.photos import PhotoPipeline  # noqa: E402
+from saunalib.ratelimit import SCHEDULERS  # noqa: E402
+from saunalib.resolver import resolve_place_ids  # noqa: E402
+
+
+def venues(count):
+    return [{"name": f"Bench Sauna {i}", "address": f"{i} Main St, Springfield, IL 62701",
+             "city_slug": "nyc"} for i in range(count)]
+
+
+def bench_resolver(count, concurrency):
+    start = time.perf_counter()
+    results = list(resolve_place_ids(venues(count), concurrency=concurrency))
+    elapsed = time.perf_counter() - start
+    errors = sum(1 for _, _, error in results if error)
+    print(f"  resolve   {concurrency:>5} concurrent  {count:>6} lookups  {elapsed:>7.2f}s  "
+          f"{count / elapsed:>8.1f}/s  {errors} errors")
+
+
+def bench_photos(supabase, count, concurrency, photos):
+    client = supabase_client(supabase.url, key="local")
+    rows = supabase.store.insert([{**venue, "place_id": f"ChIJbench{i}"}
+                                  for i, venue in enumerate(venues(count))],
+                                 select="id,name,address,city_slug,place_id")
+    pipeline = PhotoPipeline(client, max_photos=photos, max_width=400,
+                             workers={"details": concurrency, "download": concurrency,
+                                      "upload": concurrency})
+    start = time.perf_counter()
+    updated = pipeline.run(rows)
+    elapsed = time.perf_counter() - start
+    client.close()
+    done = pipeline.stats["upload"].done
+    print(f"  photos    {concurrency:>5} concurrent  {done:>6} photos   {elapsed:>7.2f}s  "
+          f"{done / elapsed:>8.1f}/s  {sum(updated.values())}/{count} saunas updated")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--venues", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--latency", type=float, default=50, help="fake Places latency in ms")
+    parser.add_argument("--photos", type=int, default=2, help="photos per venue")
+    args = parser.parse_args()
+
+    # Let the fake set the pace, not the production rate limits
+    for scheduler in SCHEDULERS.values():
+        scheduler.configure(rate=1_000_000, burst=1_000_000)
+
+    with tempfile.TemporaryDirectory() as fixtures, \
+            FakePlaces(fixtures, synthesize=True, latency=args.latency / 1000) as places, \
+            FakeSupabase() as supabase:
+        os.environ["PLACES_URL"] = places.url
+        os.environ.setdefault("GOOGLE_PLACES_API_KEY", "local")
+        print(f"Fake Places at {places.url} ({args.latency:.0f} ms latency)")
+        for concurrency in args.concurrency:
+            bench_resolver(args.venues, concurrency)
+        for concurrency in args.concurrency:
+            bench_photos(supabase, max(1, args.venues // 4), concurrency, args.photos)
+        print(places.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Compare saunalib.spatial's grid index with brute-force haversine scans
+
+For each size, places N venues around a few dozen US city centres and times
+k-nearest and radius queries from random venues both ways, checking the
+grid returns exactly what the full scan does.
+
+Usage: python3 scripts/benchmarks/spatial.py [--points N ...] [--queries N] [-k N] [--km R]
+"""
+
+import argparse
+import heapq
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from saunalib.spatial import GridIndex, haversine_km  # noqa: E402
+
+
+def synthetic_points(count, cities=40, seed=1):
+    rng = random.Random(seed)
+    centres = [(rng.uniform(30, 48), rng.uniform(-122, -74)) for _ in range(cities)]
+    points = []
+    for i in range(count):
+        lat, lng = rng.choice(centres)
+        points.append((i, rng.gauss(lat, 0.1), rng.gauss(lng, 0.12)))
+    return points
+
+
+def brute_nearest(points, lat, lng, k, exclude):
+    return heapq.nsmallest(k, ((haversine_km(lat, lng, p_lat, p_lng), p_id)
+                               for p_id, p_lat, p_lng in points if p_id != exclude))
+
+
+def brute_within(points, lat, lng, km):
+    found = [(d, p_id) for p_id, p_lat, p_lng in points
+             if (d := haversine_km(lat, lng, p_lat, p_lng)) <= km]
+    found.sort()
+    return found
+
+
+def timed(fn, queries):
+    start = time.perf_counter()
+    results = [fn(q) for q in queries]
+    return (time.perf_counter() - start) / len(queries), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--km", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'points':>8}  {'build ms':>8}  {'knn brute':>10}  {'knn grid':>9}  "
+          f"{'radius brute':>12}  {'radius grid':>11}  match")
+    for count in args.points:
+        points = synthetic_points(count)
+        start = time.perf_counter()
+        index = GridIndex(points)
+        build = time.perf_counter() - start
+        queries = random.Random(2).sample(points, min(args.queries, count))
+
+        knn_brute, expected_knn = timed(
+            lambda q: brute_nearest(points, q[1], q[2], args.k, q[0]), queries)
+        knn_grid, got_knn = timed(lambda q: index.nearest(q[1], q[2], args.k, exclude=q[0]), queries)
+        radius_brute, expected_radius = timed(
+            lambda q: brute_within(points, q[1], q[2], args.km), queries)
+        radius_grid, got_radius = timed(lambda q: index.within(q[1], q[2], args.km), queries)
+
+        match = got_knn == expected_knn and got_radius == expected_radius
+        print(f"{count:>8}  {build * 1000:>8.1f}  {knn_brute * 1000:>8.3f}ms  "
+              f"{knn_grid * 1000:>7.3f}ms  {radius_brute * 1000:>10.3f}ms  "
+              f"{radius_grid * 1000:>9.3f}ms  {'yes' if match else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
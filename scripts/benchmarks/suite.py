@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""Benchmark the insert, resolve, sync and snapshot paths against local fakes
+
+For each dataset size, generates synthetic venues that follow the schema in
+SCRAPING_GUIDE.md (real city slugs, coordinates inside each city's bbox,
+valid price tiers, types, amenities and hours) and runs every scenario in a
+fresh child process against saunalib.fake_supabase / fake_places served
+from this process:
+
+- insert:   seed file → hours compile → dedup index → ``ingest()`` into an empty table
+- resolve:  Place ID lookups for every venue through ``resolve_place_ids()``
+- sync:     ``ingest(partial=True)`` of the same venues, 10% of them edited
+- snapshot: ``export_snapshot()`` of the full table to per-city shards (+ gzip)
+
+Each run records wall time, requests issued, request + response body bytes
+and the child's peak RSS to a JSON file, then compares them with the
+baseline committed as benchmarks/baseline.json. Request and byte counts
+don't depend on the machine, so any increase over the baseline is a
+regression; wall time and peak RSS may grow by --threshold. A regression,
+or a missing baseline, makes the exit status 1. Sizes the baseline doesn't
+cover (100000 by default) are reported but not compared.
+
+Usage:
+  python3 scripts/benchmarks/suite.py [--sizes 100 1000 ...] [--scenarios insert sync ...]
+  python3 scripts/benchmarks/suite.py --sizes 100 1000 10000 --save-baseline   # after a known-good run
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from saunalib.cities import CITY_CONFIG  # noqa: E402
+from saunalib.fake_places import FakePlaces  # noqa: E402
+from saunalib.fake_supabase import FakeSupabase, Store  # noqa: E402
+from saunalib.hours import compile_hours  # noqa: E402
+
+SIZES = (100, 1_000, 10_000, 100_000)
+SCENARIOS = ("insert", "resolve", "sync", "snapshot")
+METRICS = ("wall_s", "requests", "bytes", "peak_rss_kb")
+# The fakes answer the same synthetic data the same way on any machine, so these must not grow at all
+EXACT_METRICS = ("requests", "bytes")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_OUT = os.path.join(SCRIPTS_DIR, ".cache", "benchmarks", "latest.json")
+# Wall time varies by tens of percent between runs on a shared machine; only catch gross slowdowns
+DEFAULT_THRESHOLD = 1.0
+# Timings this short are mostly noise; compare them as if they took this long
+MIN_WALL_S = 1.0
+SYNC_EDIT_SHARE = 0.1
+
+TYPES = ["Modern Bathhouse", "Traditional Banya", "Russian Bathhouse", "Korean Spa", "Luxury Spa",
+         "Day Spa", "Italian Spa", "Boutique Sauna", "Infrared Sauna", "World Spa", "Gym Sauna",
+         "Hotel Spa"]
+AMENITIES = ["cold_plunge", "steam_room", "massage", "pool", "coed", "private"]
+HOURS = ["Mon-Fri: 6AM-10PM, Sat-Sun: 8AM-8PM", "Daily: 9AM-9PM", "24/7", "Open 24 hours",
+         "Mon-Thu: 9AM-11PM, Fri-Sat: 9AM-12AM, Sun: 10AM-9PM", "Tue-Sun 10AM-10PM",
+         "Mon-Fri: 7:30AM-11:30AM & 4PM-9PM", "Check website for current hours"]
+WORDS = ["Cedar", "North", "Steam", "Ember", "Birch", "Harbor", "Stone", "Tide", "Aurora",
+         "Granite", "Willow", "Cinder", "Lake", "Frost", "Juniper", "Sol", "Fjord", "Heat"]
+KINDS = ["Sauna", "Bathhouse", "Spa", "Banya", "Sauna House", "Wellness Club"]
+STREETS = ["Main St", "Oak Ave", "Broadway", "Elm St", "Market St", "Pine St", "2nd Ave",
+           "Lake St", "Union St", "Park Ave"]
+
+
+def synthetic_venues(count, seed=1):
+    """``count`` valid seed records spread over the configured cities"""
+    rng = random.Random(seed)
+    slugs = sorted(slug for slug in CITY_CONFIG if CITY_CONFIG[slug].get("bbox"))
+    venues = []
+    for i in range(count):
+        slug = rng.choice(slugs)
+        south, west, north, east = CITY_CONFIG[slug]["bbox"]
+        center = CITY_CONFIG[slug]["center"]
+        lat = min(max(rng.gauss(center["lat"], (north - south) / 8), south), north)
+        lng = min(max(rng.gauss(center["lng"], (east - west) / 8), west), east)
+        rated = rng.random() > 0.05
+        venues.append({
+            "name": f"{rng.choice(WORDS)} {rng.choice(WORDS)} {rng.choice(KINDS)} {i}",
+            "address": f"{rng.randint(1, 9999)} {rng.choice(STREETS)}, "
+                       f"{CITY_CONFIG[slug].get('fullName', slug)} {rng.randint(10000, 99999)}",
+            "neighborhood": f"{rng.choice(WORDS)} District",
+            "lat": round(lat, 6),
+            "lng": round(lng, 6),
+            "rating": round(rng.uniform(3.2, 5.0), 1) if rated else None,
+            "rating_count": rng.randint(3, 4000) if rated else None,
+            "price": rng.choice(["$", "$$", "$$$"]),
+            "types": [rng.choice(TYPES)],
+            "amenities": rng.sample(AMENITIES, rng.randint(0, len(AMENITIES))),
+            "hours": rng.choice(HOURS),
+            "place_id": f"ChIJsynthetic{seed:02d}{i:09d}",
+            "description": "A synthetic venue for benchmarking.",
+            "city_slug": slug,
+            "photos": None,
+            "website_url": f"https://example.com/venue/{i}" if rng.random() > 0.3 else None,
+            "gender_policy": None,
+        })
+    return venues
+
+
+def edited(venues, share=SYNC_EDIT_SHARE, seed=2):
+    """The same venues with ``share`` of them re-rated or given new hours"""
+    rng = random.Random(seed)
+    out = []
+    for venue in venues:
+        if rng.random() < share:
+            venue = {**venue, "rating": round(rng.uniform(3.2, 5.0), 1),
+                     "rating_count": (venue["rating_count"] or 0) + rng.randint(1, 50),
+                     "hours": rng.choice(HOURS)}
+        out.append(venue)
+    return out
+
+
+def write_jsonl(path, records):
+    with open(path, "w", encoding="utf-8") as fp:
+        for record in records:
+            fp.write(json.dumps(record) + "\n")
+
+
+# --- child side: one scenario, timed, in its own process --------------------
+
+def run_scenario(scenario, dataset, workdir):
+    """Run one scenario against SUPABASE_URL / PLACES_URL; returns a short outcome"""
+    from saunalib.existing import CityIndex, ExistingIndex
+    from saunalib.httpclient import supabase_client
+    from saunalib.ingest import ingest
+    from saunalib.ratelimit import SCHEDULERS
+    from saunalib.resolver import resolve_place_ids
+    from saunalib.seed import iter_seed_files
+    from saunalib.snapshot import export_snapshot
+
+    # Measure the code, not the production rate limits
+    for scheduler in SCHEDULERS.values():
+        scheduler.configure(rate=1_000_000, burst=1_000_000)
+    client = supabase_client()
+    try:
+        if scenario in ("insert", "sync"):
+            records = compile_hours(iter_seed_files([dataset]))
+            index = (CityIndex(client, fuzzy=True) if scenario == "sync"
+                     else ExistingIndex.fetch(client, fuzzy=True))
+            result = ingest(records, client, index=index, partial=scenario == "sync")
+            return {"inserted": len(result.inserted), "updated": len(result.updated),
+                    "unchanged": result.unchanged, "failed": len(result.failed)}
+        if scenario == "resolve":
+            venues = [record for _, record in iter_seed_files([dataset])]
+            found = sum(1 for _, place_id, _ in resolve_place_ids(venues, concurrency=32) if place_id)
+            return {"found": found}
+        if scenario == "snapshot":
+            result = export_snapshot(client, os.path.join(workdir, "snapshot"), compress=("gzip",),
+                                     state_path=os.path.join(workdir, "snapshot-state.json"))
+            return {"rows": result.rows, "cities": len(result.cities)}
+        raise SystemExit(f"unknown scenario {scenario!r}")
+    finally:
+        client.close()
+
+
+def child(scenario, dataset, workdir):
+    start = time.perf_counter()
+    outcome = run_scenario(scenario, dataset, workdir)
+    wall = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak //= 1024  # bytes there, kilobytes on Linux
+    print(json.dumps({"wall_s": round(wall, 4), "peak_rss_kb": peak, "outcome": outcome}))
+
+
+# --- parent side ------------------------------------------------------------
+
+def _traffic(supabase, places):
+    requests = sum(supabase.requests.values()) + sum(
+        counts.get("requests", 0) for counts in places.stats.values())
+    return requests, supabase.bytes_received + supabase.bytes_sent + places.bytes_sent
+
+
+def measure(scenario, size, supabase, places, workdir):
+    venues = synthetic_venues(size)
+    supabase.store = Store()
+    if scenario in ("sync", "snapshot"):
+        rows = [record for _, record in compile_hours((None, v) for v in venues)]
+        supabase.store.insert(rows, select="id")
+    dataset = os.path.join(workdir, f"{scenario}-{size}.jsonl")
+    write_jsonl(dataset, edited(venues) if scenario == "sync" else venues)
+
+    requests_before, bytes_before = _traffic(supabase, places)
+    env = {**os.environ, "SUPABASE_URL": supabase.url, "SUPABASE_SERVICE_KEY": "local",
+           "PLACES_URL": places.url, "GOOGLE_PLACES_API_KEY": "local"}
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", scenario, dataset,
+                           workdir], env=env, capture_output=True, text=True)
+    if proc.returncode:
+        raise SystemExit(f"{scenario} at {size} failed:\n{proc.stderr}")
+    measured = json.loads(proc.stdout.strip().splitlines()[-1])
+    requests_after, bytes_after = _traffic(supabase, places)
+    os.remove(dataset)
+    return {"wall_s": measured["wall_s"], "requests": requests_after - requests_before,
+            "bytes": bytes_after - bytes_before, "peak_rss_kb": measured["peak_rss_kb"],
+            "outcome": measured["outcome"]}
+
+
+def compare(results, baseline, threshold):
+    """Print each metric against the baseline; returns the regressions"""
+    regressions = []
+    for key, metrics in results.items():
+        before = baseline.get(key)
+        cells = []
+        for metric in METRICS:
+            value = metrics[metric]
+            if not before or metric not in before:
+                cells.append(f"{metric} {value:g}")
+                continue
+            old = before[metric]
+            floor = MIN_WALL_S if metric == "wall_s" else 1
+            change = (max(value, floor) - max(old, floor)) / max(old, floor)
+            mark = ""
+            if value > old if metric in EXACT_METRICS else change > threshold:
+                mark = " ❌"
+                regressions.append((key, metric, old, value))
+            cells.append(f"{metric} {value:g} ({change:+.0%}){mark}")
+        print(f"  {key:<16} " + "  ".join(cells) + ("" if before else "  (not in baseline)"))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES),
+                        help="venues per dataset (default 100 1000 10000 100000)")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--latency", type=float, default=0,
+                        help="milliseconds the fakes add to every response")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="results JSON path")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"allowed growth in wall time and peak RSS (default {DEFAULT_THRESHOLD:.0%}); "
+                             "request and byte counts may not grow at all")
+    parser.add_argument("--child", nargs=3, metavar=("SCENARIO", "DATASET", "WORKDIR"),
+                        help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.child:
+        return child(*args.child)
+
+    results = {}
+    latency = args.latency / 1000
+    with tempfile.TemporaryDirectory() as workdir, \
+            FakeSupabase(latency=latency) as supabase, \
+            FakePlaces(os.path.join(workdir, "fixtures"), synthesize=True, latency=latency) as places:
+        for size in args.sizes:
+            for scenario in args.scenarios:
+                key = f"{scenario}/{size}"
+                results[key] = measure(scenario, size, supabase, places, workdir)
+                metrics = results[key]
+                print(f"✓ {key:<16} {metrics['wall_s']:>8.2f}s  {metrics['requests']:>7} requests  "
+                      f"{metrics['bytes'] / 1e6:>8.1f} MB  {metrics['peak_rss_kb'] / 1024:>6.0f} MB RSS  "
+                      f"{metrics['outcome']}")
+
+    run = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs",
+        "latency_ms": args.latency,
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as fp:
+        json.dump(run, fp, indent=2)
+    print(f"\nResults saved to: {os.path.relpath(args.out)}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as fp:
+            json.dump(run, fp, indent=2)
+        print(f"✅ Baseline saved to: {os.path.relpath(args.baseline)}")
+        return 0
+    try:
+        with open(args.baseline, encoding="utf-8") as fp:
+            baseline = json.load(fp)
+    except FileNotFoundError:
+        print(f"❌ No baseline at {os.path.relpath(args.baseline)}; run with --save-baseline to store one")
+        return 1
+
+    print(f"\n--- Compared with baseline from {baseline.get('created')} ({baseline.get('machine')}) ---")
+    regressions = compare(results, baseline.get("results", {}), args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} metric(s) regressed (requests and bytes: any increase; "
+              f"time and memory: more than {args.threshold:.0%})")
+        return 1
+    print(f"\n✅ No regressions (requests and bytes at or under the baseline, "
+          f"time and memory within {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Build per-city filter facet indexes from the snapshot shards
+
+Reads public/data/saunas/<city_slug>.json (written by export-snapshot.py),
+or the live table with --from-db, and writes
+public/data/saunas/facets/<city_slug>.json (plus all.json) mapping every
+neighborhood, type category, price tier and amenity to sorted sauna ids
+and counts.
+
+Usage: python3 scripts/build-facets.py [--dir public/data/saunas] [--from-db]
+"""
+
+import argparse
+import glob
+import json
+import os
+
+from saunalib.config import read_key
+from saunalib.facets import build_facets
+from saunalib.httpclient import supabase_client
+from saunalib.snapshot import MANIFEST_NAME, minified
+from saunalib.supabase import iter_rows
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "public", "data", "saunas")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build per-city filter facet indexes")
+    parser.add_argument("--dir", default=DEFAULT_DIR,
+                        help="snapshot shard directory (default public/data/saunas)")
+    parser.add_argument("--from-db", action="store_true", help="read rows from Supabase, not the shards")
+    return parser.parse_args(argv)
+
+
+def iter_shard_rows(shard_dir):
+    for path in sorted(glob.glob(os.path.join(shard_dir, "*.json"))):
+        if os.path.basename(path) == MANIFEST_NAME:
+            continue
+        with open(path, encoding="utf-8") as fp:
+            yield from json.load(fp)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    select = "id,city_slug,neighborhood,types,price,amenities"
+    if args.from_db:
+        client = supabase_client(key=read_key())
+        try:
+            indexes = build_facets(iter_rows(client, select=select))
+        finally:
+            client.close()
+    else:
+        if not os.path.exists(os.path.join(args.dir, MANIFEST_NAME)):
+            raise SystemExit(f"No snapshot in {os.path.relpath(args.dir)}: "
+                             "run export-snapshot.py first or pass --from-db")
+        indexes = build_facets(iter_shard_rows(args.dir))
+
+    out_dir = os.path.join(args.dir, "facets")
+    os.makedirs(out_dir, exist_ok=True)
+    for slug, index in sorted(indexes.items()):
+        data = index.to_json()
+        with open(os.path.join(out_dir, f"{slug}.json"), "w", encoding="utf-8") as fp:
+            fp.write(minified(data))
+        sizes = ", ".join(f"{len(values)} {facet}" for facet, values in data["facets"].items())
+        print(f"  ✓ {slug}: {len(data['ids'])} saunas — {sizes}")
+    print(f"\n✅ Wrote {len(indexes)} facet indexes to {os.path.relpath(out_dir)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Enrich every sauna row with amenity/type inference, hours masks and coordinate checks
+
+Usage:
+  python3 scripts/enrich-saunas.py --dry-run
+  python3 scripts/enrich-saunas.py --city nyc --refetch --processes 8 --concurrency 16
+
+Python counterpart of enrich-saunas.js for the whole table. Rows are paged
+out of Supabase and classified in chunks on a process pool (see
+saunalib/enrich.py), so the CPU-bound part scales with the number of cores.
+With --refetch, Place Details (editorial summary and reviews) are fetched
+first on an async pool of --concurrency requests, for richer matching.
+
+Added amenities and types and recompiled ``hours_mask`` values are PATCHed
+in bulk and written, as each chunk finishes, to
+scripts/enrich-report-<city>-<ms>.csv in the same format as the Node script. Coordinates outside the city, outliers and
+shared pins are listed in the report as error rows; they are never changed
+automatically. Hours that can't be fully understood go to
+scripts/hours-report-<city>-<ms>.csv.
+"""
+
+import argparse
+import os
+import sys
+
+from saunalib.enrich import DEFAULT_CHUNK_SIZE, DEFAULT_CONCURRENCY, enrich_table
+from saunalib.httpclient import supabase_client
+from saunalib.ratelimit import SCHEDULERS
+from saunalib.reports import ChangeReport, HoursReport, report_path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Enrich sauna rows in parallel")
+    parser.add_argument("--dry-run", action="store_true", help="write the CSV report only, no DB writes")
+    parser.add_argument("--refetch", action="store_true",
+                        help="fetch Place Details reviews for richer text matching")
+    parser.add_argument("--city", help="only rows with this city_slug (e.g. nyc, sf)")
+    parser.add_argument("--limit", type=int, help="process only N rows")
+    parser.add_argument("--processes", type=int,
+                        help="worker processes for classification (default: one per CPU)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Place Details requests in flight (default {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"rows per worker task and bulk upsert (default {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--no-hours", action="store_true",
+                        help="skip hours_mask (for tables without the column)")
+    parser.add_argument("--no-geo-check", action="store_true", help="skip the coordinate checks")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    client = supabase_client()
+
+    print("\n=== Enriching sauna data ===")
+    if args.dry_run:
+        print("  [DRY RUN — no DB writes]")
+    if args.refetch:
+        print("  [REFETCH — using Google Places API]")
+    if args.city:
+        print(f"  [CITY: {args.city}]")
+    if args.limit:
+        print(f"  [LIMIT: {args.limit}]")
+    print()
+
+    def progress(result):
+        print(f"  ✓ {result.processed} processed, {result.changed} changed"
+              + (f", {result.refreshed} refreshed" if args.refetch else ""))
+
+    report = ChangeReport(report_path("enrich", args.city))
+    hours_report = HoursReport(report_path("hours", args.city))
+    try:
+        result = enrich_table(client, params={"city_slug": f"eq.{args.city}"} if args.city else None,
+                              limit=args.limit, refetch=args.refetch, hours=not args.no_hours,
+                              geo=not args.no_geo_check, processes=args.processes,
+                              concurrency=args.concurrency, chunk_size=args.chunk_size,
+                              dry_run=args.dry_run, report=report, hours_report=hours_report,
+                              on_chunk=progress)
+    finally:
+        client.close()
+        report.close()
+        hours_report.close()
+
+    if report.path:
+        print(f"\nCSV report saved to: {os.path.relpath(report.path)}")
+    if hours_report.path:
+        print(f"⚠️  {result.unparsed_hours} hours string(s) not fully understood: "
+              f"{os.path.relpath(hours_report.path)}")
+
+    print("\n--- Summary ---")
+    print(f"  Processed:   {result.processed}")
+    print(f"  Changed:     {result.changed}")
+    if args.refetch:
+        print(f"  Refreshed:   {result.refreshed}")
+    if not args.dry_run:
+        print(f"  Updated:     {result.updated}")
+    print(f"  Coordinates: {len(result.flagged)} flagged")
+    print(f"  Errors:      {result.errors}")
+    print(f"  {SCHEDULERS['supabase'].summary()}")
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Export the saunas table to compact per-city JSON shards
+
+Streaming Python counterpart of prefetch-saunas.js: pages through
+/rest/v1/saunas and writes public/data/saunas/<city_slug>.json (minified),
+with optional .gz/.br copies, plus manifest.json with each city's count,
+bbox, hash and last-modified time, so the site can fetch /data/saunas/
+manifest.json and then just the city it shows. Cities whose content hash is
+unchanged since the last export keep their files as they are, and if the
+server confirms every page unchanged via ETag nothing is rewritten.
+
+Usage:
+  python3 scripts/export-snapshot.py [--gzip] [--brotli] [--prebuilt]
+  python3 scripts/export-snapshot.py --out /tmp/snapshot --force
+"""
+
+import argparse
+import os
+import time
+
+from saunalib.config import read_key
+from saunalib.httpclient import supabase_client
+from saunalib.ratelimit import SCHEDULERS
+from saunalib.snapshot import MANIFEST_NAME, STATE_PATH, export_snapshot
+from saunalib.supabase import DEFAULT_PAGE_SIZE
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUT = os.path.join(ROOT, "public", "data", "saunas")
+PREBUILT_PATH = os.path.join(ROOT, "src", "data", "saunas-prebuilt.json")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Export the saunas table to per-city JSON snapshots")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="output directory (default public/data/saunas)")
+    parser.add_argument("--gzip", action="store_true", help="also write .json.gz copies")
+    parser.add_argument("--brotli", action="store_true", help="also write .json.br copies (pip install brotli)")
+    parser.add_argument("--prebuilt", action="store_true",
+                        help="also write src/data/saunas-prebuilt.json (minified) for the frontend")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE,
+                        help=f"rows per request (default {DEFAULT_PAGE_SIZE})")
+    parser.add_argument("--force", action="store_true", help="ignore the previous export's ETags and hashes")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.force and os.path.exists(STATE_PATH):
+        os.remove(STATE_PATH)
+    compress = [kind for kind, wanted in (("gzip", args.gzip), ("br", args.brotli)) if wanted]
+
+    client = supabase_client(key=read_key())
+    start = time.perf_counter()
+    try:
+        result = export_snapshot(client, args.out, compress=compress,
+                                 combined=PREBUILT_PATH if args.prebuilt else None,
+                                 page_size=args.page_size)
+    finally:
+        client.close()
+    elapsed = time.perf_counter() - start
+
+    if result.not_modified:
+        print(f"✅ Snapshot unchanged (ETag) — nothing written ({elapsed:.2f}s)")
+        return
+    for slug, city in result.cities.items():
+        mark = "✓" if city["changed"] else "="
+        print(f"  {mark} {slug}: {city['count']} saunas, {city['bytes'] / 1024:.1f} KB")
+    for slug in result.removed:
+        print(f"  ✗ {slug}: no rows left, files removed")
+    if result.manifest_changed:
+        print(f"  ✓ {os.path.relpath(os.path.join(args.out, MANIFEST_NAME))} updated")
+    changed = sum(city["changed"] for city in result.cities.values())
+    print(f"\n✅ {result.rows} saunas in {result.pages} page(s), {changed}/{len(result.cities)} "
+          f"cities rewritten → {os.path.relpath(args.out)} ({elapsed:.2f}s)")
+    if args.prebuilt:
+        state = "updated" if result.combined_changed else "unchanged"
+        print(f"  {os.path.relpath(PREBUILT_PATH)} {state}")
+    print(f"  {SCHEDULERS['supabase'].summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Serve recorded (or made-up) Google Places responses for offline runs
+
+Record real Text Search / Details / Photo answers once, then replay them
+with latency, quota errors and page tokens, without spending quota:
+
+  python3 scripts/fake-places.py --record          # forwards to Google, saves fixtures
+  PLACES_URL=http://127.0.0.1:8765 python3 scripts/update-place-ids.py ...
+  python3 scripts/fake-places.py --synthesize --latency 120 --qps 50
+
+Fixtures are kept in scripts/.cache/places-fixtures/ (one JSON file per
+request, the API key left out). --synthesize answers requests that have no
+fixture with deterministic fake places and photos.
+"""
+
+import argparse
+
+from saunalib.fake_places import DEFAULT_FIXTURES, DEFAULT_PORT, DEFAULT_TOKEN_DELAY, FakePlaces
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a local record/replay fake of Google Places")
+    parser.add_argument("--record", action="store_true",
+                        help="forward requests to Google and save them as fixtures")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES, help="fixture directory")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default {DEFAULT_PORT})")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on")
+    parser.add_argument("--synthesize", action="store_true",
+                        help="make up answers for requests without a fixture")
+    parser.add_argument("--results", type=int, default=1,
+                        help="Text Search results per made-up query (over 20 are paged)")
+    parser.add_argument("--photos", type=int, default=5, help="photos per made-up place")
+    parser.add_argument("--latency", type=float, default=0, help="milliseconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0, help="up to this many more milliseconds")
+    parser.add_argument("--qps", type=int, help="answer OVER_QUERY_LIMIT above this many requests/s")
+    parser.add_argument("--daily-limit", type=int,
+                        help="answer OVER_QUERY_LIMIT after this many requests")
+    parser.add_argument("--error-rate", type=float, default=0,
+                        help="fraction of requests answered OVER_QUERY_LIMIT (0-1)")
+    parser.add_argument("--token-delay", type=float, default=DEFAULT_TOKEN_DELAY,
+                        help=f"seconds before a next_page_token works (default {DEFAULT_TOKEN_DELAY})")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = FakePlaces(args.fixtures, mode="record" if args.record else "playback",
+                        host=args.host, port=args.port, synthesize=args.synthesize,
+                        results=args.results, photos=args.photos, latency=args.latency / 1000,
+                        jitter=args.jitter / 1000, error_rate=args.error_rate, qps=args.qps,
+                        daily_limit=args.daily_limit, token_delay=args.token_delay,
+                        verbose=args.verbose)
+    mode = "recording from Google" if args.record else "replaying fixtures"
+    if args.synthesize and not args.record:
+        mode += " (made-up answers for the rest)"
+    print(f"✅ Fake Places on {server.url}, {mode}")
+    print(f"  export PLACES_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n{server.summary() or 'No requests'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Serve a local SQLite-backed fake of Supabase for offline runs
+
+Implements the PostgREST calls the scripts make on /rest/v1/saunas (and
+Storage uploads), so they can be developed, load-tested and benchmarked
+without touching production. Point a script at it with SUPABASE_URL:
+
+  python3 scripts/fake-supabase.py --seed scripts/data/*.json
+  SUPABASE_URL=http://127.0.0.1:54321 SUPABASE_SERVICE_KEY=local \\
+      python3 scripts/ingest-saunas.py scripts/data/la.json
+
+--latency/--jitter delay every response and --error-rate answers that
+fraction of requests with --error-status, to exercise retries.
+"""
+
+import argparse
+import os
+
+from saunalib.fake_supabase import DEFAULT_PORT, FakeSupabase
+from saunalib.schema import coerce_record
+from saunalib.seed import iter_seed_files
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a local fake of the Supabase REST API")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default {DEFAULT_PORT})")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on")
+    parser.add_argument("--db", default=":memory:",
+                        help="SQLite file to keep the data in (default: in memory)")
+    parser.add_argument("--seed", nargs="+", default=[], metavar="FILE",
+                        help="seed files to load into an empty table first")
+    parser.add_argument("--latency", type=float, default=0, help="milliseconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0, help="up to this many more milliseconds")
+    parser.add_argument("--error-rate", type=float, default=0,
+                        help="fraction of requests to fail (0-1)")
+    parser.add_argument("--error-status", type=int, default=503, help="status for failed requests")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = FakeSupabase(args.db, host=args.host, port=args.port, latency=args.latency / 1000,
+                          jitter=args.jitter / 1000, error_rate=args.error_rate,
+                          error_status=args.error_status, verbose=args.verbose)
+    if args.seed and not len(server.store):
+        records = [coerce_record(record) for _, record in iter_seed_files(args.seed)]
+        server.store.insert(records, select="id")
+        print(f"🌱 Loaded {len(records)} saunas from {len(args.seed)} seed file(s)")
+
+    print(f"✅ Fake Supabase on {server.url} ({len(server.store)} saunas"
+          f"{', ' + os.path.relpath(args.db) if args.db != ':memory:' else ', in memory'})")
+    print(f"  export SUPABASE_URL={server.url} SUPABASE_SERVICE_KEY=local")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        requests = ", ".join(f"{method} {n}" for method, n in sorted(server.requests.items()))
+        print(f"\nServed {requests or 'no requests'} ({server.errors} injected errors)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""Insert saunas from one or more city seed files into Supabase
+
+Usage:
+  python3 scripts/ingest-saunas.py scripts/data/*.json
+  python3 scripts/ingest-saunas.py new-city.csv --batch-size 500 --parallel 8
+
+Seed files are JSON arrays, JSON Lines, CSV (list columns "a; b") or YAML,
+with one object per sauna using the column names in SCRAPING_GUIDE.md.
+
+Re-running is safe: existing rows are read once and matched by place_id or
+by normalized name + address, so only new venues are inserted and only
+venues whose data changed are updated. Records that merely look like an
+existing venue (similar name at the same street number or a few metres away)
+are held back and listed; pass --allow-similar to insert them anyway.
+
+Progress is journaled to scripts/.cache/journals/ingest-saunas.jsonl;
+--resume skips records written by an interrupted run and --retry-failed
+reruns only the records that failed (or were invalid) last time.
+
+Coordinates are checked for the whole batch first (needs NumPy): records
+outside their city's bbox or too far from its center are rejected, and
+outliers or different venues sharing a pin are flagged. --no-geo-check skips
+this.
+
+Each record's hours text is compiled into the ``hours_mask`` column (a 7×96
+quarter-hour bitmask, see saunalib/hours.py); hours that can't be fully
+understood are still ingested but listed in
+scripts/hours-report-<city>-<ms>.csv to be fixed by hand. Rows are written
+as the records are read; a report identical to the newest one for the same
+city is removed again at the end, and none is written on --dry-run.
+--no-hours skips the column, for tables that don't have it yet.
+
+With --sync, only the rows of the cities in the seed files are read, the
+columns that differ are applied to the stored rows and upserted one request
+per chunk, and every field-level change is written to
+scripts/sync-report-<city>-<ms>.csv in the enrich-report format as soon as
+it is found.
+"""
+
+import argparse
+import filecmp
+import os
+import sys
+from collections import Counter
+
+from saunalib.existing import CityIndex, ExistingIndex
+from saunalib.geocheck import check_coordinates
+from saunalib.hours import compile_hours
+from saunalib.httpclient import supabase_client
+from saunalib.ingest import CHANGED, DEFAULT_BATCH_SIZE, DEFAULT_PARALLEL, NEW, ingest
+from saunalib.journal import Journal, add_journal_args, journal_path
+from saunalib.ratelimit import SCHEDULERS
+from saunalib.reports import ChangeReport, HoursReport, report_files, report_path
+from saunalib.seed import iter_seed_files
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Insert saunas from city seed files into Supabase")
+    parser.add_argument("files", nargs="+", help="seed files (.json, .jsonl, .csv, .yaml)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"rows per write request (default {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--parallel", type=int, default=DEFAULT_PARALLEL,
+                        help=f"write requests in flight (default {DEFAULT_PARALLEL})")
+    parser.add_argument("--dry-run", action="store_true", help="validate and plan only, no DB writes")
+    parser.add_argument("--no-dedup", action="store_true",
+                        help="skip the existing-row check and insert everything")
+    parser.add_argument("--allow-similar", action="store_true",
+                        help="insert venues that only resemble an existing one")
+    parser.add_argument("--no-geo-check", action="store_true",
+                        help="skip the batch lat/lng geofence and outlier checks")
+    parser.add_argument("--no-hours", action="store_true",
+                        help="skip hours_mask (for tables without the column)")
+    parser.add_argument("--sync", action="store_true",
+                        help="update only changed columns and write a field-level CSV report")
+    add_journal_args(parser)
+    parser.add_argument("-v", "--verbose", action="store_true", help="list every written venue")
+    return parser.parse_args(argv)
+
+
+def _only_city(cities):
+    """The one city a run touched, or None (an ``all`` report)"""
+    return next(iter(cities)) if len(cities) == 1 else None
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    client = supabase_client()
+
+    print(f"📥 Ingesting {len(args.files)} seed file(s)...")
+    if args.dry_run:
+        print("  [DRY RUN — no DB writes]")
+    if args.sync:
+        print("  [SYNC — changed columns only]")
+
+    rejected = None
+    if not args.no_geo_check:
+        geo = check_coordinates(iter_seed_files(args.files))
+        for source, problems in geo.warnings.items():
+            for problem in problems:
+                print(f"⚠️  {source}: {problem}")
+        rejected = geo.errors
+        print(f"  Checked coordinates of {geo.checked} records: "
+              f"{len(geo.errors)} rejected, {len(geo.warnings)} flagged")
+
+    index = None
+    fuzzy = not args.allow_similar
+    if args.sync:
+        index = CityIndex(client, fuzzy=fuzzy)
+    elif not args.no_dedup:
+        index = ExistingIndex.fetch(client, fuzzy=fuzzy)
+        print(f"  Indexed {len(index)} existing saunas")
+    print()
+
+    journal = None
+    records = iter_seed_files(args.files)
+    if not args.dry_run:
+        journal = Journal(journal_path("ingest-saunas"), done_statuses=("inserted", "updated"),
+                          fresh=not (args.resume or args.retry_failed))
+        records = journal.select(records, key=lambda item: item[0],
+                                 resume=args.resume, retry_failed=args.retry_failed)
+    hours_cities = Counter()
+    hours_report = None if args.dry_run else HoursReport(report_path("hours"))
+
+    def note_unparsed(source, record, problems):
+        hours_cities[record.get("city_slug")] += 1
+        if hours_report is not None:
+            hours_report.unparsed(source, record, problems)
+
+    if not args.no_hours:
+        records = compile_hours(records, note_unparsed)
+
+    sync_report = ChangeReport(report_path("sync")) if args.sync else None
+
+    def record_diff(row, changed):
+        for field, after in changed.items():
+            sync_report.change(row["id"], row.get("name"), field, row.get(field), after)
+
+    def hold_similar(source, record, match):
+        score, row, reasons = match
+        other = f"ID {row['id']}" if "id" in row else "an earlier record"
+        print(f"⚠️  {source} {record.get('name')} looks like {row.get('name')} ({other}): "
+              f"{score:.2f}, {', '.join(reasons)}")
+        if journal:
+            journal.record(source, "similar", match_id=row.get("id"), score=round(score, 3))
+
+    def checkpoint(chunk, updated, error):
+        for action, source, record in chunk:
+            if error:
+                journal.record(source, "failed", error=str(error))
+            elif action == NEW:
+                journal.record(source, "inserted")
+            else:
+                journal.record(source, "updated" if updated.get(record["id"]) else "update_failed")
+
+    def report(chunk, inserted, updated, error):
+        if journal:
+            checkpoint(chunk, updated, error)
+        if sync_report is not None and not args.dry_run:
+            for action, _, record in chunk:
+                if action == CHANGED and (error or not updated.get(record["id"])):
+                    sync_report.error(record["id"], record.get("name"), str(error or "update failed"))
+        first, last = chunk[0][1], chunk[-1][1]
+        new = sum(1 for action, _, _ in chunk if action == NEW)
+        changed = sum(1 for action, _, _ in chunk if action == CHANGED)
+        if error:
+            print(f"❌ {first} … {last}: {error}")
+        elif args.dry_run:
+            print(f"  ✓ {first} … {last}: {new} new, {changed} changed")
+        else:
+            print(f"✅ {first} … {last}: inserted {len(inserted)}, updated {sum(updated.values())}")
+        if args.verbose:
+            for action, source, record in chunk:
+                print(f"  • {source} {record.get('name', 'ID ' + str(record.get('id')))} ({action})")
+
+    try:
+        result = ingest(records, client, batch_size=args.batch_size,
+                        parallel=args.parallel, dry_run=args.dry_run, index=index,
+                        partial=args.sync, on_diff=record_diff if args.sync else None, on_similar=hold_similar,
+                        on_chunk=report, rejected=rejected)
+    finally:
+        client.close()
+
+    for error in result.invalid:
+        print(f"⚠️  Skipped {error}")
+        if journal:
+            journal.record(error.source, "invalid", error="; ".join(error.problems))
+    if journal:
+        journal.close()
+
+    failed_rows = sum(len(items) for items, _ in result.failed)
+    if sync_report is not None:
+        path = sync_report.rename(report_path("sync", _only_city(index.cities)))
+        if path:
+            print(f"CSV report saved to: {os.path.relpath(path)}")
+
+    if hours_cities:
+        message = f"⚠️  {sum(hours_cities.values())} hours string(s) not fully understood"
+        if hours_report is None:
+            print(f"{message} (dry run, no report written)")
+        else:
+            city = _only_city(hours_cities)
+            path = hours_report.rename(report_path("hours", city))
+            previous = [other for other, _, _ in report_files("hours", city or "all") if other != path]
+            if previous and filecmp.cmp(path, previous[-1], shallow=False):
+                os.remove(path)
+                print(f"{message}, same as {os.path.relpath(previous[-1])}")
+            else:
+                print(f"{message}: {os.path.relpath(path)}")
+
+    print("\n--- Summary ---")
+    print(f"  Valid:     {result.valid}")
+    if not args.dry_run:
+        print(f"  Inserted:  {len(result.inserted)}")
+        print(f"  Updated:   {len(result.updated)}")
+    print(f"  Unchanged: {result.unchanged}")
+    if result.similar:
+        print(f"  Similar:   {result.similar} (held back; --allow-similar to insert)")
+    print(f"  Invalid:   {len(result.invalid)}")
+    print(f"  Failed:    {failed_rows}")
+    print(f"  {SCHEDULERS['supabase'].summary()}")
+    return 1 if result.invalid or result.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
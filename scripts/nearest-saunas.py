@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Precompute each sauna's nearest other saunas for the frontend
+
+Reads every sauna's coordinates from Supabase (or from seed files, keyed by
+place_id, or name where that is blank) into a grid index and writes the N
+nearest venues per venue to src/data/nearest-saunas.json as
+{"<id>": [{"id": ..., "km": ...}, ...]}.
+
+Usage:
+  python3 scripts/nearest-saunas.py [-n 6] [--max-km 25] [--city nyc]
+  python3 scripts/nearest-saunas.py scripts/data/*.json --out /tmp/nearest.json
+"""
+
+import argparse
+import json
+import os
+import time
+
+from saunalib.httpclient import supabase_client
+from saunalib.seed import iter_seed_files
+from saunalib.spatial import GridIndex
+from saunalib.supabase import iter_rows
+
+DEFAULT_NEIGHBORS = 6
+DEFAULT_OUT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "src", "data", "nearest-saunas.json")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute nearest saunas per sauna")
+    parser.add_argument("files", nargs="*",
+                        help="seed files to read instead of Supabase (keyed by place_id or name)")
+    parser.add_argument("-n", "--neighbors", type=int, default=DEFAULT_NEIGHBORS,
+                        help=f"nearest venues per venue (default {DEFAULT_NEIGHBORS})")
+    parser.add_argument("--max-km", type=float, help="drop neighbours further away than this")
+    parser.add_argument("--city", help="only saunas with this city_slug (Supabase only)")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="output JSON path")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.files:
+        rows = ({**record, "key": record.get("place_id") or record.get("name")}
+                for _, record in iter_seed_files(args.files))
+        index = GridIndex.from_rows(rows, key="key")
+    else:
+        client = supabase_client()
+        params = {"city_slug": f"eq.{args.city}"} if args.city else None
+        try:
+            index = GridIndex.from_rows(iter_rows(client, select="id,lat,lng", params=params))
+        finally:
+            client.close()
+    print(f"📍 Indexed {len(index)} saunas ({index.cell_size:.4f}° cells, {len(index.cells)} occupied)")
+
+    start = time.perf_counter()
+    table = index.nearest_table(args.neighbors, max_km=args.max_km)
+    elapsed = time.perf_counter() - start
+
+    nearest = {
+        str(venue_id): [{"id": other, "km": round(km, 2)} for km, other in neighbours]
+        for venue_id, neighbours in table.items()
+    }
+    with open(args.out, "w") as f:
+        json.dump(nearest, f, separators=(",", ":"))
+
+    print(f"✅ Wrote {args.neighbors} nearest for {len(nearest)} saunas in {elapsed:.2f}s "
+          f"to {os.path.relpath(args.out)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Aggregate the scrape and enrich CSV reports in scripts/ across runs
+
+Usage:
+  python3 scripts/report-stats.py scrape                 # NEW / EXISTS / FILTERED, acceptance rate
+  python3 scripts/report-stats.py enrich --city nyc      # amenities and types added, per value
+  python3 scripts/report-stats.py enrich --field amenities --field hours_mask
+
+Reports are read one row at a time (see saunalib/reports.py), so this works
+the same for five reports or thousands.
+"""
+
+import argparse
+from collections import Counter
+
+from saunalib.reports import (CHANGED, SCRIPTS_DIR, acceptance_rate, added_values, iter_reports,
+                              report_files, status_counts)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate scrape/enrich reports across runs")
+    parser.add_argument("kind", choices=["scrape", "enrich", "sync"], help="which reports to read")
+    parser.add_argument("--city", help="only reports for this city_slug")
+    parser.add_argument("--field", action="append",
+                        help="change reports: list columns to count added values of "
+                             "(default amenities and types)")
+    parser.add_argument("--dir", default=SCRIPTS_DIR, help="directory holding the reports")
+    parser.add_argument("--top", type=int, default=20, help="values to list per field (default 20)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    files = report_files(args.kind, args.city, args.dir)
+    print(f"📊 {len(files)} {args.kind} report(s){f' for {args.city}' if args.city else ''}\n")
+    if not files:
+        return
+
+    if args.kind == "scrape":
+        counts = status_counts(iter_reports(args.kind, args.city, args.dir))
+        for status, count in counts.most_common():
+            print(f"  {status:<10} {count:>8}")
+        print(f"\n  Acceptance rate (NEW vs EXISTS): {acceptance_rate(counts):.1%}")
+        return
+
+    fields = args.field or ["amenities", "types"]
+    added = {field: Counter() for field in fields}
+    changed, errors = Counter(), 0
+    for row in iter_reports(args.kind, args.city, args.dir):
+        if row.get("status") != CHANGED:
+            errors += 1
+            continue
+        changed[row.get("field")] += 1
+        if row.get("field") in added:
+            added[row["field"]].update(added_values([row], row["field"]))
+
+    for field, count in changed.most_common():
+        print(f"  {field:<12} {count:>8} changed")
+    print(f"  {'errors':<12} {errors:>8}")
+    for field in fields:
+        if added[field]:
+            print(f"\n  Added {field}:")
+            for value, count in added[field].most_common(args.top):
+                print(f"    {value:<28} {count:>8}")
+
+
+if __name__ == "__main__":
+    main()
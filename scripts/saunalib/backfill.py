@@ -0,0 +1,104 @@
+"""Command-line driver shared by the find-*-place-ids.py scripts"""
+
+import argparse
+import os
+import sys
+
+from .cache import ResponseCache
+from .journal import Journal, add_journal_args, journal_path
+from .ratelimit import SCHEDULERS
+from .resolver import DEFAULT_CONCURRENCY, resolve_place_ids
+from .supabase import DEFAULT_BATCH_SIZE, bulk_update
+
+# Journal outcomes; "found" means resolved but not yet written to Supabase
+UPDATED = "updated"
+NOT_FOUND = "not_found"
+FOUND = "found"
+LOOKUP_FAILED = "lookup_failed"
+UPDATE_FAILED = "update_failed"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Find and update missing Google Place IDs")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"parallel Text Search lookups (default {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"resolved rows to collect before writing them (default {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--qps", type=float, default=SCHEDULERS["places"].bucket.rate,
+                        help="Places requests per second (default %(default)s)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="ignore the on-disk Text Search cache")
+    add_journal_args(parser)
+    return parser.parse_args(argv)
+
+
+def backfill_place_ids(venues, title, argv=None, job=None):
+    """Resolve Place IDs for ``venues`` and write them to Supabase
+
+    Progress is journaled under ``job`` (the script name by default) so an
+    interrupted run can be continued with --resume or --retry-failed.
+    """
+    args = parse_args(argv)
+    SCHEDULERS["places"].configure(rate=args.qps)
+    job = job or os.path.splitext(os.path.basename(sys.argv[0]))[0]
+    journal = Journal(journal_path(job), done_statuses=(UPDATED, NOT_FOUND),
+                      fresh=not (args.resume or args.retry_failed))
+    print(f"🔍 {title}...\n")
+
+    todo = list(journal.select(venues, key=lambda v: v["id"],
+                               resume=args.resume, retry_failed=args.retry_failed))
+    if len(todo) < len(venues):
+        print(f"  Skipping {len(venues) - len(todo)} venues finished in an earlier run\n")
+
+    # Venues resolved by an interrupted run only need their Supabase write
+    pending = [
+        {"id": v["id"], "place_id": journal.get(v["id"])["place_id"]}
+        for v in todo if (journal.get(v["id"]) or {}).get("status") == FOUND
+    ]
+    lookups = [v for v in todo if (journal.get(v["id"]) or {}).get("status") != FOUND]
+    names = {venue["id"]: venue["name"] for venue in venues}
+    counts = {UPDATED: 0, UPDATE_FAILED: 0, LOOKUP_FAILED: 0}
+
+    def flush():
+        place_ids = {row["id"]: row["place_id"] for row in pending}
+        for sauna_id, ok in bulk_update(pending, batch_size=args.batch_size).items():
+            status = UPDATED if ok else UPDATE_FAILED
+            journal.record(sauna_id, status, place_id=place_ids[sauna_id])
+            counts[status] += 1
+            if not ok:
+                print(f"  ❌ Failed to update {names[sauna_id]} (ID: {sauna_id}) in Supabase")
+        pending.clear()
+
+    cache = None if args.no_cache else ResponseCache()
+    try:
+        for venue, place_id, error in resolve_place_ids(lookups, concurrency=args.concurrency,
+                                                        cache=cache):
+            print(f"Searching for {venue['name']}...", end=" ", flush=True)
+            if error:
+                print(f"Error: {error}")
+                journal.record(venue["id"], LOOKUP_FAILED, error=str(error))
+                counts[LOOKUP_FAILED] += 1
+            elif place_id:
+                print(f"Found: {place_id}")
+                journal.record(venue["id"], FOUND, place_id=place_id)
+                pending.append({"id": venue["id"], "place_id": place_id})
+            else:
+                print("Not found")
+                journal.record(venue["id"], NOT_FOUND)
+            if len(pending) >= args.batch_size:
+                flush()
+        flush()
+    finally:
+        journal.close()
+
+    print(f"\n✅ Updated {counts[UPDATED]}/{len(todo)} Place IDs")
+    failed = counts[LOOKUP_FAILED] + counts[UPDATE_FAILED]
+    if failed:
+        print(f"⚠️  {failed} venues failed; rerun with --retry-failed")
+    if cache is not None:
+        print(f"   {cache.stats()}")
+        cache.close()
+    for scheduler in SCHEDULERS.values():
+        if scheduler.calls:
+            print(f"   {scheduler.summary()}")
+    return counts[UPDATED]
@@ -0,0 +1,97 @@
+"""Persistent SQLite cache for API responses"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".cache", "places.sqlite")
+DEFAULT_TTL = 30 * 24 * 3600
+DEFAULT_NEGATIVE_TTL = 24 * 3600
+DEFAULT_MAX_ENTRIES = 50_000
+
+MISS = object()
+
+
+def normalize_query(*parts):
+    """Cache key for a free-text query: lowercased, punctuation and extra whitespace dropped"""
+    text = " ".join(str(p) for p in parts if p)
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", text.lower())).strip()
+
+
+class ResponseCache:
+    """Key/value cache on disk with a TTL, negative caching and LRU eviction.
+
+    A value of None is a cached "not found" and expires after
+    ``negative_ttl`` rather than ``ttl``, so venues missing from Google today
+    get looked up again tomorrow. Once the table grows past ``max_entries``
+    the least recently read rows are dropped. Safe to share between threads.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL,
+                 negative_ttl=DEFAULT_NEGATIVE_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value TEXT, stored_at REAL NOT NULL, used_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_used_at ON entries (used_at)")
+        self._db.commit()
+
+    def get(self, key):
+        """Return the cached value for ``key``, or ``MISS``"""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, stored_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                value, stored_at = row
+                ttl = self.ttl if value is not None else self.negative_ttl
+                if now - stored_at <= ttl:
+                    self._db.execute("UPDATE entries SET used_at = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                    self.hits += 1
+                    return json.loads(value) if value is not None else None
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._db.commit()
+            self.misses += 1
+            return MISS
+
+    def set(self, key, value):
+        """Store ``value`` (None caches a negative result)"""
+        now = time.time()
+        encoded = json.dumps(value) if value is not None else None
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, value, stored_at, used_at) VALUES (?, ?, ?, ?)",
+                (key, encoded, now, now),
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        (count,) = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()
+        if count > self.max_entries:
+            self._db.execute(
+                "DELETE FROM entries WHERE key IN"
+                " (SELECT key FROM entries ORDER BY used_at ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def stats(self):
+        return f"cache: {self.hits} hits, {self.misses} misses"
+
+    def close(self):
+        with self._lock:
+            self._db.close()
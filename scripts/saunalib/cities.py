@@ -0,0 +1,23 @@
+"""City settings shared with the frontend (src/data/cities.json)"""
+
+import json
+import os
+
+SRC_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                            "src", "data")
+CITIES_PATH = os.path.join(SRC_DATA_DIR, "cities.json")
+
+with open(CITIES_PATH, encoding="utf-8") as _fp:
+    CITY_CONFIG = {slug: city for slug, city in json.load(_fp).items() if slug != "all"}
+
+
+def city_center(slug):
+    """``(lat, lng)`` of a city's map center, or None for an unknown slug"""
+    city = CITY_CONFIG.get(slug)
+    return (city["center"]["lat"], city["center"]["lng"]) if city else None
+
+
+def city_bbox(slug):
+    """``(south, west, north, east)`` the city's venues must fall in, or None"""
+    bbox = CITY_CONFIG.get(slug, {}).get("bbox")
+    return tuple(bbox) if bbox else None
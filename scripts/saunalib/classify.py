@@ -0,0 +1,166 @@
+"""Amenity and type inference from venue text
+
+Python port of the keyword rules in scripts/enrich-saunas.js
+(``AMENITY_PATTERNS``, ``TYPE_RULES``, ``CATEGORY_MEMBERS``), with the
+same results. Patterns are compiled once and each document is lowercased
+once, so no pattern needs ``re.I``. Every match of a pattern contains the
+literal one of its ``|`` branches starts with (``cold``, ``ice``, ...), so
+a rule is only run when ``str in`` finds one of those words, and a rule
+that does match stops at its first hit.
+
+``enrich_many`` classifies batches of venues (name, description, editorial
+summary, review texts) across worker processes.
+"""
+
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .ingest import chunked
+
+AMENITY_PATTERNS = {
+    "cold_plunge": r"cold\s*plunge|ice\s*bath|frigidarium|cold\s*dip|polar\s*plunge|shock\s*pool|cold\s*tub"
+                   r"|cold\s*(pool|immersion)|plunge\s*pool",
+    "steam_room": r"steam\s*room|steam\s*bath|eucalyptus|wet\s*room|\bhammam\b|turkish\s*bath",
+    "coed": r"co[\-\s]?ed|mixed[\-\s]?gender|couples|communal|bathing\s*suit|swimwear\s*required"
+            r"|men\s*and\s*women|all\s*genders?\b",
+    "private": r"private\s*(room|suite|session|sauna|cabin|pod|bath|experience)|suites|personal\s*room"
+               r"|hourly\s*booking",
+    "pool": r"hot\s*tub|jacuzzi|whirlpool|soaking\s*tub|hydrotherapy|swimming\s*pool|lap\s*pool"
+            r"|thermal\s*pool|rooftop\s*pool|indoor\s*pool|outdoor\s*pool",
+    "massage": r"\bmassage\b|body\s*scrub",
+    "dry_sauna": r"dry\s*sauna|heated\s*sauna|traditional\s*sauna|finnish\s*sauna|cedar\s*sauna"
+                 r"|wood[\s\-]*(fired\s*)?sauna|barrel\s*sauna",
+    "infrared_sauna": r"infrared\s*(sauna|room|therapy|cabin|pod|session)|infrared",
+}
+
+# (type, category, pattern, name_only): name_only rules only look at the name
+TYPE_RULES = [
+    ("Russian Banya", "russian", r"\bbanya\b", True),
+    ("Korean Spa", "korean", r"jjimjilbang|korean.*scrub|body\s*scrub.*korean", False),
+    ("Private Sauna Studio", "private",
+     r"private\s*(room\s*)?booking|book\s*a\s*private|hourly\s*(private\s*)?session", False),
+    ("Infrared Sauna", "infrared", r"infrared", True),
+]
+
+# Types that belong to each category, so a rule doesn't add a redundant one
+CATEGORY_MEMBERS = {
+    "russian": ["Russian Banya", "Russian Bathhouse", "Traditional Banya", "Traditional Russian Banya"],
+    "korean": ["Korean Spa", "Korean Day Spa", "Korean Fitness & Spa"],
+    "private": ["Private Sauna Studio", "Boutique Sauna"],
+    "infrared": ["Infrared Sauna"],
+}
+
+DEFAULT_CHUNK_SIZE = 250
+
+
+class KeywordClassifier:
+    """Which of ``rules`` (``(label, pattern)`` pairs) occur in a text"""
+
+    def __init__(self, rules):
+        self.rules = [(label, re.compile(pattern), _leading_words(pattern)) for label, pattern in rules]
+
+    def matches(self, text):
+        """Labels of the rules matching ``text``, in rule order"""
+        if not text:
+            return []
+        text = text.lower()
+        return [label for label, pattern, words in self.rules
+                if any(word in text for word in words) and pattern.search(text)]
+
+
+def _alternatives(pattern):
+    """Top-level ``|`` branches of ``pattern``"""
+    branches, depth, start = [], 0, 0
+    for i, char in enumerate(pattern):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and not depth and pattern[i - 1] != "\\":
+            branches.append(pattern[start:i])
+            start = i + 1
+    return [*branches, pattern[start:]]
+
+
+def _leading_words(pattern):
+    """The literal each branch of ``pattern`` starts with; any match contains one of them"""
+    words = set()
+    for branch in _alternatives(pattern):
+        word = re.match(r"(?:\\b)?([a-z]+)", branch)
+        if not word:
+            return ("",)  # no literal prefix: always run the pattern
+        words.add(word.group(1))
+    return tuple(sorted(words))
+
+
+AMENITIES = KeywordClassifier(list(AMENITY_PATTERNS.items()))
+_NAME_TYPES = KeywordClassifier([(t, p) for t, _, p, name_only in TYPE_RULES if name_only])
+_TEXT_TYPES = KeywordClassifier([(t, p) for t, _, p, name_only in TYPE_RULES if not name_only])
+
+
+def text_corpus(name, description=None, editorial=None, reviews=()):
+    """Name, description, editorial summary and reviews as one text, like buildTextCorpus()"""
+    return " ".join([name or "", description or "", editorial or "", *(r or "" for r in reviews)])
+
+
+def enrich_amenities(amenities, corpus):
+    """``(amenities, added)``: ``amenities`` plus any the text implies"""
+    added = [a for a in AMENITIES.matches(corpus) if a not in (amenities or [])]
+    return [*(amenities or []), *added], added
+
+
+def enrich_types(types, name, description=None):
+    """``(types, added)``: ``types`` plus rule types, skipping categories already covered"""
+    matched = {*_NAME_TYPES.matches(name), *_TEXT_TYPES.matches(f"{name or ''} {description or ''}")}
+    types = list(types or [])
+    added = []
+    for sauna_type, category, _, _ in TYPE_RULES:
+        if sauna_type not in matched or sauna_type in types:
+            continue
+        if any(member in types for member in CATEGORY_MEMBERS.get(category, ())):
+            continue
+        types.append(sauna_type)
+        added.append(sauna_type)
+    return types, added
+
+
+def enrich_venue(venue):
+    """Classify one venue dict (name, description, amenities, types, editorial, reviews)
+
+    Returns ``{"id", "amenities", "types", "added_amenities", "added_types"}``.
+    """
+    corpus = text_corpus(venue.get("name"), venue.get("description"), venue.get("editorial"),
+                         venue.get("reviews") or ())
+    amenities, added_amenities = enrich_amenities(venue.get("amenities"), corpus)
+    types, added_types = enrich_types(venue.get("types"), venue.get("name"), venue.get("description"))
+    return {"id": venue.get("id"), "amenities": amenities, "types": types,
+            "added_amenities": added_amenities, "added_types": added_types}
+
+
+def enrich_batch(venues):
+    return [enrich_venue(venue) for venue in venues]
+
+
+def enrich_many(venues, processes=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield ``enrich_venue`` results for ``venues`` in order, using ``processes`` workers
+
+    Venues are sent to the workers ``chunk_size`` at a time, with at most
+    two chunks per worker in flight so a long input is never all in memory.
+    ``processes=1`` (or a single-CPU machine) classifies in this process.
+    """
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        for venue in venues:
+            yield enrich_venue(venue)
+        return
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        pending = deque()
+        for chunk in chunked(venues, chunk_size):
+            pending.append(pool.submit(enrich_batch, chunk))
+            if len(pending) >= processes * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
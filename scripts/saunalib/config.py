@@ -0,0 +1,31 @@
+"""Connection settings shared by the Python data scripts"""
+
+import os
+
+SUPABASE_URL = "https://oqwwxfecnrspcjjwrylx.supabase.co"
+PLACES_URL = "https://maps.googleapis.com"
+
+
+def supabase_url():
+    """Supabase base URL; set SUPABASE_URL to point the scripts elsewhere (e.g. fake-supabase.py)"""
+    return os.environ.get("SUPABASE_URL") or SUPABASE_URL
+
+
+def places_url():
+    """Google Places base URL; set PLACES_URL to use fake-places.py instead"""
+    return os.environ.get("PLACES_URL") or PLACES_URL
+
+
+def service_key():
+    """Supabase service-role key (required for writes)"""
+    return os.environ["SUPABASE_SERVICE_KEY"]
+
+
+def read_key():
+    """Key for read-only jobs: the service key, else the anon key the frontend uses"""
+    return os.environ.get("SUPABASE_SERVICE_KEY") or os.environ["VITE_SUPABASE_ANON_KEY"]
+
+
+def places_api_key():
+    """Google Places API key"""
+    return os.environ["GOOGLE_PLACES_API_KEY"]
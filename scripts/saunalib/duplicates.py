@@ -0,0 +1,242 @@
+"""Fuzzy duplicate detection for venue records
+
+Python counterpart of ``isSimilar``/``isDuplicate`` in scrape-saunas.js,
+without the pairwise scan: every record is filed under a few blocking keys
+(street number + ZIP, a ~150 m lat/lng grid cell, distinctive name
+trigrams) and only records sharing a key are scored against each other, so
+the work grows roughly linearly with the number of records.
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from itertools import chain
+
+from .existing import normalize_text
+
+DEFAULT_THRESHOLD = 0.75
+# Name trigram blocks bigger than this are too common to be useful ("spa", "sau")
+MAX_BLOCK_SIZE = 40
+# Share of a name's distinctive trigrams another name must have to be scored
+NAME_GRAM_OVERLAP = 0.6
+# Grid cell size in degrees of latitude (~150 m); longitude is scaled per row
+CELL_DEGREES = 0.0014
+
+# Words that say what a venue is rather than which one it is
+GENERIC_NAME_WORDS = {
+    "the", "and", "of", "at", "spa", "sauna", "saunas", "bath", "baths", "bathhouse",
+    "club", "day", "studio", "wellness", "center", "centre", "gym", "fitness", "hotel",
+    "health", "house", "co", "inc", "llc", "nyc",
+}
+
+_STREET_NUMBER = re.compile(r"^\s*(\d+)")
+_ZIP = re.compile(r"\b(\d{5})(?:-\d{4})?\b")
+
+
+def street_number(address):
+    match = _STREET_NUMBER.match(address or "")
+    return match.group(1) if match else ""
+
+
+def zip_code(address):
+    matches = _ZIP.findall(address or "")
+    return matches[-1] if matches else ""
+
+
+def trigrams(text):
+    text = f"  {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class Features:
+    """Normalised pieces of a record that scoring and blocking look at, computed once"""
+
+    __slots__ = ("name", "words", "grams", "distinct_grams", "address_words", "number", "zip",
+                 "coords", "cell")
+
+    def __init__(self, record):
+        self.name = normalize_text(record.get("name"))
+        self.words = set(self.name.split())
+        self.grams = None
+        distinct = " ".join(w for w in self.name.split() if w not in GENERIC_NAME_WORDS)
+        self.distinct_grams = trigrams(distinct) if distinct else set()
+        address = record.get("address")
+        self.address_words = set(normalize_text(address).split())
+        self.number = street_number(address)
+        self.zip = zip_code(address)
+        lat, lng = record.get("lat"), record.get("lng")
+        if isinstance(lat, (int, float)) and isinstance(lng, (int, float)):
+            self.coords = (math.radians(lat), math.radians(lng))
+            self.cell = _cell(lat, lng)
+        else:
+            self.coords = self.cell = None
+
+
+def _name_similarity(a, b):
+    if not a.name or not b.name:
+        return 0.0
+    if a.name == b.name or a.name in b.name or b.name in a.name:
+        return 1.0
+    overlap = len(a.words & b.words) / max(len(a.words), len(b.words))
+    if overlap >= 0.7:
+        return overlap
+    if a.grams is None:
+        a.grams = trigrams(a.name)
+    if b.grams is None:
+        b.grams = trigrams(b.name)
+    return max(overlap, jaccard(a.grams, b.grams))
+
+
+def _address_similarity(a, b):
+    if a.number and b.number and a.number != b.number:
+        return 0.0
+    return jaccard(a.address_words, b.address_words)
+
+
+def _distance_m(a, b):
+    if a.coords is None or b.coords is None:
+        return None
+    (lat1, lng1), (lat2, lng2) = a.coords, b.coords
+    h = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2)
+    return 2 * 6_371_000 * math.asin(math.sqrt(h))
+
+
+def _score(a, b):
+    """``(score, name similarity, address similarity, distance or None)``"""
+    name = _name_similarity(a, b)
+    address = _address_similarity(a, b)
+    score = 0.6 * name + 0.4 * address
+    if name >= 0.7 and a.number and a.number == b.number:
+        # isDuplicate's rule: similar name at the same street number
+        score = max(score, 0.9)
+
+    distance = _distance_m(a, b)
+    if distance is not None:
+        if distance < 50 and name >= 0.5:
+            score = max(score, 0.85)
+        elif distance > 2000:
+            score *= 0.5
+    return score, name, address, distance
+
+
+def _reasons(a, b, name, address, distance):
+    reasons = [f"name {name:.2f}", f"address {address:.2f}"]
+    if name >= 0.7 and a.number and a.number == b.number:
+        reasons.append("same street number")
+    if distance is not None:
+        reasons.append(f"{distance:.0f} m apart")
+    return reasons
+
+
+def name_similarity(a, b):
+    """0..1 similarity of two venue names (1 for containment, like isSimilar)"""
+    return _name_similarity(Features({"name": a}), Features({"name": b}))
+
+
+def address_similarity(a, b):
+    """0..1 similarity of two street addresses; conflicting street numbers score 0"""
+    return _address_similarity(Features({"address": a}), Features({"address": b}))
+
+
+def score_pair(a, b):
+    """Duplicate likelihood of two records, 0..1, with the reasons behind it"""
+    a, b = Features(a), Features(b)
+    score, name, address, distance = _score(a, b)
+    return score, _reasons(a, b, name, address, distance)
+
+
+def _cell(lat, lng):
+    lng_size = CELL_DEGREES / max(0.1, math.cos(math.radians(lat)))
+    return math.floor(lat / CELL_DEGREES), math.floor(lng / lng_size)
+
+
+class DuplicateIndex:
+    """Blocked index of records that can be queried for likely duplicates"""
+
+    def __init__(self, records=(), threshold=DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.records = []
+        self.features = []
+        self.blocks = defaultdict(list)
+        self.gram_blocks = defaultdict(list)
+        for record in records:
+            self.add(record)
+
+    def add(self, record, features=None):
+        features = features or Features(record)
+        position = len(self.records)
+        self.records.append(record)
+        self.features.append(features)
+        if features.number and features.zip:
+            self.blocks["addr", features.number, features.zip].append(position)
+        if features.cell:
+            self.blocks["cell", *features.cell].append(position)
+        for gram in features.distinct_grams:
+            self.gram_blocks[gram].append(position)
+        return position
+
+    def candidates(self, features):
+        """Positions of indexed records worth scoring against ``features``
+
+        Address and grid-cell blocks (including the 8 neighbouring cells) are
+        taken whole; name trigram blocks only count towards a candidate that
+        shares NAME_GRAM_OVERLAP of the query's distinctive trigrams, and blocks
+        over MAX_BLOCK_SIZE are skipped as too common to tell venues apart.
+        """
+        found = set()
+        if features.number and features.zip:
+            found.update(self.blocks.get(("addr", features.number, features.zip), ()))
+        if features.cell:
+            row, col = features.cell
+            for dr in (-1, 0, 1):
+                for dc in (-1, 0, 1):
+                    found.update(self.blocks.get(("cell", row + dr, col + dc), ()))
+
+        blocks = (self.gram_blocks.get(gram, ()) for gram in features.distinct_grams)
+        shared = Counter(chain.from_iterable(b for b in blocks if len(b) <= MAX_BLOCK_SIZE))
+        needed = max(2, math.ceil(len(features.distinct_grams) * NAME_GRAM_OVERLAP))
+        found.update(position for position, count in shared.items() if count >= needed)
+        return found
+
+    def matches(self, record, features=None):
+        """``(score, indexed_record, reasons)`` at or above the threshold, best first"""
+        features = features or Features(record)
+        scored = []
+        for position in self.candidates(features):
+            other = self.records[position]
+            if other is record:
+                continue
+            indexed = self.features[position]
+            score, name, address, distance = _score(features, indexed)
+            if score >= self.threshold:
+                scored.append((score, other, _reasons(features, indexed, name, address, distance)))
+        scored.sort(key=lambda match: -match[0])
+        return scored
+
+    def best_match(self, record):
+        found = self.matches(record)
+        return found[0] if found else None
+
+
+def find_duplicates(records, threshold=DEFAULT_THRESHOLD):
+    """Merge candidates within ``records``: ``(score, a, b, reasons)``, best first
+
+    Each record is compared only with earlier records it shares a block
+    with, so every pair is reported once.
+    """
+    index = DuplicateIndex(threshold=threshold)
+    pairs = []
+    for record in records:
+        features = Features(record)
+        for score, other, reasons in index.matches(record, features):
+            pairs.append((score, other, record, reasons))
+        index.add(record, features)
+    pairs.sort(key=lambda pair: -pair[0])
+    return pairs
@@ -0,0 +1,207 @@
+"""Parallel enrichment of the whole `saunas` table
+
+Python counterpart of enrich-saunas.js for large runs. Rows are paged out of
+the table with ``iter_rows``, city by city, and handled ``chunk_size`` at a
+time:
+
+- with ``refetch``, each chunk's Place Details (editorial summary and review
+  texts) are fetched on an asyncio pool of ``concurrency`` requests through
+  the shared Places client and rate limiter
+- the CPU-bound work (amenity and type inference from saunalib.classify,
+  hours compilation from saunalib.hours, per-row coordinate checks from
+  saunalib.geocheck) runs on a ProcessPoolExecutor, one chunk per task
+- finished chunks are merged back in table order into one upsert of the
+  changed rows (``bulk_update``; each carries its NOT NULL columns and all
+  the enriched ones, so the chunk shares one column set) and rows of the
+  enrich report, written as they come
+
+At most two chunks per worker process are in flight, so the next chunk's
+Details are being fetched while earlier ones are classified. Coordinate
+checks that compare venues with each other (outliers, shared pins) run
+per city, as each city's last row is merged, on the coordinates kept for
+that city; venues of two different cities are never compared. Memory grows
+with the largest city, not with the table.
+"""
+
+import asyncio
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from . import places
+from .classify import enrich_venue
+from .geocheck import check_coordinates
+from .hours import hours_mask
+from .httpclient import HTTPError
+from .ingest import chunked
+from .ratelimit import RetryBudgetExceeded
+from .schema import NOT_NULL_COLUMNS
+from .supabase import bulk_update, iter_rows
+
+DEFAULT_CHUNK_SIZE = 200
+DEFAULT_CONCURRENCY = 8
+SELECT = "id,name,address,description,types,amenities,place_id,city_slug,lat,lng"
+HOURS_SELECT = ",hours,hours_mask"
+# City by city, so the cross-checks can run as each city is finished
+ORDER = "city_slug.asc,id.asc"
+
+
+class EnrichResult:
+    def __init__(self):
+        self.processed = 0
+        self.refreshed = 0
+        self.changed = 0
+        self.errors = 0
+        self.unparsed_hours = 0
+        self.flagged = set()  # ids with coordinate problems
+        self.updated = 0
+        self.failed = 0
+
+
+def enrich_row(row, hours=True):
+    """``(update, changes, hours problems)`` for one row (plus any Details text)"""
+    venue = enrich_venue(row)
+    update, changes = {}, []
+    for field, added in (("amenities", "added_amenities"), ("types", "added_types")):
+        if venue[added]:
+            update[field] = venue[field]
+            changes.append((field, row.get(field) or [], venue[field]))
+
+    problems = []
+    if hours and row.get("hours"):
+        mask, problems = hours_mask(row["hours"])
+        if mask != row.get("hours_mask"):
+            update["hours_mask"] = mask
+            changes.append(("hours_mask", row.get("hours_mask"), mask))
+    return update, changes, problems
+
+
+def enrich_chunk(rows, hours=True, geo=True):
+    """Worker task: ``(id, update, changes, hours problems, coordinate errors)`` per row"""
+    errors = check_coordinates(((row["id"], row) for row in rows), cross_checks=False).errors if geo else {}
+    return [(row["id"], *enrich_row(row, hours), errors.get(row["id"], [])) for row in rows]
+
+
+async def _refresh_details(rows, concurrency):
+    """Add ``editorial`` and ``reviews`` to rows with a place_id, ``concurrency`` at a time"""
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+    limit = asyncio.Semaphore(concurrency)
+
+    async def refresh(row):
+        async with limit:
+            try:
+                row["editorial"], row["reviews"] = await asyncio.to_thread(
+                    places.get_place_text, row["place_id"])
+            except (places.PlacesError, HTTPError, OSError, RetryBudgetExceeded, ValueError) as e:
+                row["refresh_error"] = str(e)
+
+    await asyncio.gather(*(refresh(row) for row in rows if row.get("place_id")))
+
+
+def refresh_details(rows, concurrency=DEFAULT_CONCURRENCY):
+    """Fetch Place Details text for ``rows`` (in place); failures go to ``refresh_error``"""
+    if any(row.get("place_id") for row in rows):
+        asyncio.run(_refresh_details(rows, concurrency))
+    return rows
+
+
+def enrich_table(client=None, params=None, limit=None, refetch=False, hours=True, geo=True,
+                 processes=None, concurrency=DEFAULT_CONCURRENCY, chunk_size=DEFAULT_CHUNK_SIZE,
+                 dry_run=False, report=None, hours_report=None, on_chunk=None):
+    """Enrich every row matching ``params`` (PostgREST filters); returns an EnrichResult
+
+    Changes, errors and coordinate problems are written to ``report`` (a
+    saunalib.reports.ChangeReport) and hours that can't be fully understood
+    to ``hours_report`` (an HoursReport) as each chunk is merged.
+    ``on_chunk(result)`` is called after each chunk has been merged and
+    written. ``dry_run`` computes changes without PATCHing anything.
+    """
+    processes = processes or os.cpu_count() or 1
+    result = EnrichResult()
+    city_rows = []  # (id, name/city/coordinates) of the city being merged
+    written = (*NOT_NULL_COLUMNS, "amenities", "types", *(("hours_mask",) if hours else ()))
+    rows = iter_rows(client, select=SELECT + (HOURS_SELECT if hours else ""),
+                     params={"order": ORDER, **(params or {})})
+    if limit:
+        rows = (row for _, row in zip(range(limit), rows))
+
+    def chunks():
+        for chunk in chunked(rows, chunk_size):
+            if refetch:
+                refresh_details(chunk, concurrency)
+            yield chunk
+
+    def error(sauna_id, name, message):
+        result.errors += 1
+        if report:
+            report.error(sauna_id, name, message)
+
+    def flag(sauna_id, name, problems):
+        if problems:
+            result.flagged.add(sauna_id)
+        if report:
+            for problem in problems:
+                report.error(sauna_id, name, f"coordinates: {problem}")
+
+    def cross_check():
+        """Outlier and shared-pin checks over the city just merged"""
+        if city_rows:
+            records = dict(city_rows)
+            for sauna_id, problems in check_coordinates(city_rows).warnings.items():
+                flag(sauna_id, records[sauna_id]["name"], problems)
+            city_rows.clear()
+
+    def merge(chunk, outcomes):
+        updates, names = [], {}
+        for row, (sauna_id, update, changes, problems, geo_errors) in zip(chunk, outcomes):
+            result.processed += 1
+            names[sauna_id] = row["name"]
+            if row.get("refresh_error"):
+                error(sauna_id, row["name"], f"details: {row['refresh_error']}")
+            elif "reviews" in row:
+                result.refreshed += 1
+            if changes:
+                result.changed += 1
+            if report:
+                for field, before, after in changes:
+                    report.change(sauna_id, row["name"], field, before, after)
+            if problems:
+                result.unparsed_hours += 1
+                if hours_report:
+                    hours_report.unparsed(sauna_id, row, problems)
+            flag(sauna_id, row["name"], geo_errors)
+            if geo:
+                if city_rows and city_rows[-1][1]["city_slug"] != row.get("city_slug"):
+                    cross_check()
+                city_rows.append((sauna_id, {k: row.get(k) for k in ("name", "city_slug", "lat", "lng")}))
+            if update:
+                updates.append({"id": sauna_id, **{col: row.get(col) for col in written}, **update})
+        if updates and not dry_run:
+            for sauna_id, ok in bulk_update(updates, batch_size=len(updates), client=client).items():
+                if ok:
+                    result.updated += 1
+                else:
+                    result.failed += 1
+                    error(sauna_id, names[sauna_id], "update failed")
+        if on_chunk:
+            on_chunk(result)
+
+    if processes == 1:
+        for chunk in chunks():
+            merge(chunk, enrich_chunk(chunk, hours, geo))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            pending = deque()
+            for chunk in chunks():
+                pending.append((chunk, pool.submit(enrich_chunk, chunk, hours, geo)))
+                if len(pending) >= processes * 2:
+                    chunk, future = pending.popleft()
+                    merge(chunk, future.result())
+            while pending:
+                chunk, future = pending.popleft()
+                merge(chunk, future.result())
+
+    cross_check()
+    return result
+
@@ -0,0 +1,17 @@
+"""Exceptions shared by the saunalib modules"""
+
+
+class HTTPError(Exception):
+    """Non-2xx response; ``status`` and ``body`` mirror urllib's HTTPError"""
+
+    def __init__(self, method, url, status, reason, body, headers=None):
+        super().__init__(f"HTTP {status} {reason} for {method} {url}")
+        self.method = method
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.body = body
+        self.headers = headers
+
+    def text(self):
+        return self.body.decode("utf-8", "replace")
@@ -0,0 +1,114 @@
+"""In-memory index of rows already in the `saunas` table
+
+Lets the ingester recognise a seed record it has written before, either by
+Google ``place_id`` or by a normalized ``(name, address)`` fingerprint, and
+skip it or send only what changed. With ``fuzzy`` it can also point out rows a
+record merely resembles (see saunalib.duplicates).
+"""
+
+import re
+import unicodedata
+
+from .supabase import iter_rows
+
+_WORD_ABBREVIATIONS = {
+    "street": "st", "avenue": "ave", "boulevard": "blvd", "road": "rd", "drive": "dr",
+    "lane": "ln", "place": "pl", "parkway": "pkwy", "court": "ct", "highway": "hwy",
+    "suite": "ste", "floor": "fl", "north": "n", "south": "s", "east": "e", "west": "w",
+    "northeast": "ne", "northwest": "nw", "southeast": "se", "southwest": "sw",
+}
+_COUNTRY_SUFFIX = re.compile(r",?\s*(usa|united states|canada)\s*$")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_text(text):
+    """Lowercase, strip accents and punctuation, abbreviate street words"""
+    text = text or ""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    text = _COUNTRY_SUFFIX.sub("", text.lower().strip()).replace("&", " and ")
+    words = _NON_ALNUM.sub(" ", text).split()
+    return " ".join(_WORD_ABBREVIATIONS.get(w, w) for w in words)
+
+
+def fingerprint(name, address):
+    return f"{normalize_text(name)}|{normalize_text(address)}"
+
+
+def changed_fields(record, row):
+    """Columns of ``record`` whose value differs from the stored ``row``"""
+    return {
+        col: value for col, value in record.items()
+        if col != "id" and row.get(col) != value
+    }
+
+
+class ExistingIndex:
+    """Lookup of stored rows keyed on ``place_id`` and on ``fingerprint()``"""
+
+    def __init__(self, rows=(), fuzzy=False):
+        self.by_place_id = {}
+        self.by_fingerprint = {}
+        self.duplicates = None
+        if fuzzy:
+            from .duplicates import DuplicateIndex  # duplicates imports normalize_text from here
+            self.duplicates = DuplicateIndex()
+        for row in rows:
+            self.add(row)
+
+    @classmethod
+    def fetch(cls, client=None, params=None, fuzzy=False):
+        """Build the index from one paged read of the table"""
+        return cls(iter_rows(client, params=params), fuzzy=fuzzy)
+
+    def __len__(self):
+        return len(self.by_fingerprint)
+
+    def add(self, row):
+        if row.get("place_id"):
+            self.by_place_id.setdefault(row["place_id"], row)
+        self.by_fingerprint.setdefault(fingerprint(row.get("name"), row.get("address")), row)
+        if self.duplicates is not None:
+            self.duplicates.add(row)
+
+    def match(self, record):
+        """The stored row ``record`` corresponds to, or None"""
+        if record.get("place_id") and record["place_id"] in self.by_place_id:
+            return self.by_place_id[record["place_id"]]
+        return self.by_fingerprint.get(fingerprint(record.get("name"), record.get("address")))
+
+    def similar(self, record):
+        """``(score, row, reasons)`` for the row ``record`` most likely duplicates, or None"""
+        if self.duplicates is None:
+            return None
+        return self.duplicates.best_match(record)
+
+
+class CityIndex:
+    """``ExistingIndex`` per ``city_slug``, fetched when a city is first seen
+
+    Used by sync runs, which only need the rows of the cities being synced.
+    """
+
+    def __init__(self, client=None, fuzzy=False):
+        self.client = client
+        self.fuzzy = fuzzy
+        self.cities = {}
+
+    def __len__(self):
+        return sum(len(index) for index in self.cities.values())
+
+    def for_city(self, city_slug):
+        if city_slug not in self.cities:
+            self.cities[city_slug] = ExistingIndex.fetch(
+                self.client, params={"city_slug": f"eq.{city_slug}"}, fuzzy=self.fuzzy)
+        return self.cities[city_slug]
+
+    def add(self, row):
+        self.for_city(row.get("city_slug")).add(row)
+
+    def match(self, record):
+        return self.for_city(record.get("city_slug")).match(record)
+
+    def similar(self, record):
+        return self.for_city(record.get("city_slug")).similar(record)
@@ -0,0 +1,95 @@
+"""Per-city filter facet index for the frontend's useFilters hook
+
+For each ``city_slug`` (and "all"), every neighborhood, type category,
+price tier and amenity maps to the sorted ids of the saunas that have it,
+plus a count. Filtering by several facets is then an intersection of
+sorted id lists instead of a scan over every sauna.
+
+Type categories come from src/data/type-categories.json, the same mapping
+``getCategory`` uses.
+"""
+
+import json
+import os
+from collections import defaultdict
+
+from .cities import SRC_DATA_DIR
+
+TYPE_CATEGORIES_PATH = os.path.join(SRC_DATA_DIR, "type-categories.json")
+FACETS = ("neighborhood", "category", "price", "amenity")
+
+with open(TYPE_CATEGORIES_PATH, encoding="utf-8") as _fp:
+    TYPE_TO_CATEGORY = json.load(_fp)
+
+
+def get_category(raw_type):
+    return TYPE_TO_CATEGORY.get(raw_type, raw_type)
+
+
+def facet_values(row):
+    """``{facet: set of values}`` for one sauna row, as useFilters reads them"""
+    return {
+        "neighborhood": {row["neighborhood"]} if row.get("neighborhood") else set(),
+        "category": {get_category(t) for t in row.get("types") or []},
+        "price": {row["price"]} if row.get("price") else set(),
+        "amenity": set(row.get("amenities") or []),
+    }
+
+
+class FacetIndex:
+    """Sorted id lists per facet value for one city"""
+
+    def __init__(self, city_slug):
+        self.city_slug = city_slug
+        self.ids = []
+        self.postings = {facet: defaultdict(list) for facet in FACETS}
+
+    def add(self, row):
+        self.ids.append(row["id"])
+        for facet, values in facet_values(row).items():
+            for value in values:
+                self.postings[facet][value].append(row["id"])
+
+    def to_json(self):
+        facets = {
+            facet: {value: sorted(ids) for value, ids in sorted(postings.items())}
+            for facet, postings in self.postings.items()
+        }
+        return {
+            "city_slug": self.city_slug,
+            "ids": sorted(self.ids),
+            "facets": facets,
+            "counts": {facet: {value: len(ids) for value, ids in values.items()}
+                       for facet, values in facets.items()},
+        }
+
+
+def build_facets(rows):
+    """``{city_slug: FacetIndex}`` over ``rows``, with "all" covering every city
+
+    Rows without a city_slug count as "nyc", like useFilters.
+    """
+    indexes = {"all": FacetIndex("all")}
+    for row in rows:
+        slug = row.get("city_slug") or "nyc"
+        if slug not in indexes:
+            indexes[slug] = FacetIndex(slug)
+        indexes[slug].add(row)
+        indexes["all"].add(row)
+    return indexes
+
+
+def intersect(*id_lists):
+    """Ids in every list: amenities, or filters on different facets, combine with AND"""
+    if not id_lists:
+        return []
+    lists = sorted(id_lists, key=len)
+    result = set(lists[0])
+    for ids in lists[1:]:
+        result.intersection_update(ids)
+    return sorted(result)
+
+
+def union(*id_lists):
+    """Ids in any list: selected type categories combine with OR"""
+    return sorted(set().union(*id_lists))
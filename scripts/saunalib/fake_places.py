@@ -0,0 +1,370 @@
+"""A local record/replay server for the Google Places endpoints the scripts use
+
+Text Search, Place Details and Place Photo are served on the same paths as
+maps.googleapis.com, so pointing ``PLACES_URL`` at it is all a script needs.
+
+- ``record`` mode forwards each request to Google (with the caller's key)
+  and saves the answer as a fixture file, keyed on the endpoint and its
+  parameters minus the key.
+- ``playback`` mode serves those fixtures and never touches the network.
+  Requests without a fixture get a 404, unless ``synthesize`` is on, in
+  which case a deterministic answer is made up from the request: a
+  place_id per query, ``photos`` references, an editorial summary and
+  reviews per place and a checkerboard PNG per photo. That is enough to
+  drive the resolver, the photo pipeline and enrichment at any scale.
+
+Both modes add ``latency`` (plus up to ``jitter``) seconds per request.
+``qps`` and ``daily_limit`` answer requests over the quota the way Google
+does: ``OVER_QUERY_LIMIT`` with HTTP 200, or a 429 for photos.
+``error_rate`` does the same for a random fraction of requests. Text Search
+results beyond 20 are paged with ``next_page_token``s that, like Google's,
+only work ``token_delay`` seconds after they were issued.
+"""
+
+import base64
+import functools
+import hashlib
+import json
+import os
+import random
+import secrets
+import struct
+import threading
+import time
+import urllib.parse
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .httpclient import HTTPClient
+from .places import DETAILS_PATH, PHOTO_PATH, TEXT_SEARCH_PATH
+
+DEFAULT_PORT = 8765
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                ".cache", "places-fixtures")
+UPSTREAM = "https://maps.googleapis.com"
+ENDPOINTS = {TEXT_SEARCH_PATH: "textsearch", DETAILS_PATH: "details", PHOTO_PATH: "photo"}
+PAGE_SIZE = 20
+# Google needs a moment before a next_page_token becomes valid
+DEFAULT_TOKEN_DELAY = 2.0
+_IMAGE_PATH = "/fake-photo/"
+_FAKE_REVIEWS = [
+    "Great finnish sauna and a proper ice bath, friendly staff.",
+    "Came with my partner, the couples suite was worth it.",
+    "Clean locker rooms, the hot tub was a bit crowded on Sunday.",
+    "Booked a body scrub, would come back.",
+    "Quiet lounge, good tea, easy parking.",
+]
+
+
+def fixture_name(endpoint, params):
+    """File name of the fixture for a request; the API key is not part of it"""
+    key = "&".join(f"{k}={v}" for k, v in sorted(params.items()) if k != "key")
+    return f"{endpoint}-{hashlib.sha1(key.encode()).hexdigest()[:16]}.json"
+
+
+def _digest(text):
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def _png_chunk(kind, data):
+    return (struct.pack(">I", len(data)) + kind + data
+            + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+
+@functools.lru_cache(maxsize=256)
+def pattern_png(width, height, seed):
+    """A valid PNG checkerboard picked by ``seed`` (hex); cheap to make at any size
+
+    The grid size and colours come from the seed, so different photos don't
+    look like near-duplicates to a perceptual hash.
+    """
+    digest = bytes.fromhex(seed[:12])
+    columns, rows = 1 + digest[0] % 12, 1 + digest[1] % 12
+    colours = (digest[2:5], bytes(255 - c for c in digest[2:5]))
+    lines = [b"\x00" + b"".join(colours[(x * columns // width + parity) % 2] for x in range(width))
+             for parity in (0, 1)]
+    pixels = b"".join(lines[y * rows // height % 2] for y in range(height))
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + _png_chunk(b"IHDR", header)
+            + _png_chunk(b"IDAT", zlib.compress(pixels, 6)) + _png_chunk(b"IEND", b""))
+
+
+class _Quota:
+    """Requests per second and per server lifetime
+
+    ``take()`` returns None, or Google's error message when over quota.
+    """
+
+    def __init__(self, qps=None, daily_limit=None):
+        self.qps = qps
+        self.daily_limit = daily_limit
+        self.used = 0
+        self.second = 0
+        self.in_second = 0
+        self._lock = threading.Lock()
+
+    def take(self):
+        with self._lock:
+            now = int(time.monotonic())
+            if now != self.second:
+                self.second, self.in_second = now, 0
+            if self.daily_limit is not None and self.used >= self.daily_limit:
+                return "You have exceeded your daily request quota for this API."
+            if self.qps is not None and self.in_second >= self.qps:
+                return "You have exceeded your rate-limit for this API."
+            self.used += 1
+            self.in_second += 1
+            return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        if self.server.verbose:
+            super().log_message(*args)
+
+    def _send(self, status, body, content_type="application/json", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.count_sent(len(body))
+
+    def _send_json(self, value):
+        self._send(200, json.dumps(value).encode())
+
+    def do_GET(self):
+        server = self.server
+        parts = urllib.parse.urlsplit(self.path)
+        params = dict(urllib.parse.parse_qsl(parts.query, keep_blank_values=True))
+        if parts.path.startswith(_IMAGE_PATH):
+            return self._image(parts.path[len(_IMAGE_PATH):])
+        endpoint = ENDPOINTS.get(parts.path)
+        if endpoint is None:
+            return self._send(404, b'{"error": "unknown endpoint"}')
+        server.count("requests", endpoint)
+
+        if server.latency or server.jitter:
+            time.sleep(server.latency + random.uniform(0, server.jitter))
+        refused = server.quota.take()
+        if refused is None and server.error_rate and random.random() < server.error_rate:
+            refused = "Injected OVER_QUERY_LIMIT."
+        if refused:
+            server.count("throttled", endpoint)
+            if endpoint == "photo":
+                return self._send(429, json.dumps({"error_message": refused}).encode())
+            return self._send_json({"status": "OVER_QUERY_LIMIT", "error_message": refused})
+
+        token = params.get("pagetoken")
+        if endpoint == "textsearch" and token and not server.token_ready(token):
+            return self._send_json({"status": "INVALID_REQUEST", "results": []})
+
+        if server.mode == "record":
+            fixture = server.record(endpoint, parts.path, params)
+        else:
+            fixture = server.load(endpoint, params)
+            if fixture is None and server.synthesize:
+                fixture = server.synthesized(endpoint, params)
+            if fixture is None:
+                server.count("missing", endpoint)
+                message = f"no fixture {fixture_name(endpoint, params)} for {self.path}"
+                return self._send(404, json.dumps({"error_message": message}).encode())
+
+        if endpoint == "photo":
+            # Google redirects to the image on googleusercontent.com
+            location = f"{_IMAGE_PATH}{fixture['name']}"
+            return self._send(302, b"", headers={"Location": location})
+        body = fixture["body"]
+        if endpoint == "textsearch" and body.get("next_page_token"):
+            server.issue_token(body["next_page_token"])
+        self._send_json(body)
+
+    def _image(self, name):
+        server = self.server
+        fixture = server.load_file(name) or server.synthesized_photos.get(name)
+        if fixture is None:
+            return self._send(404, b"")
+        self._send(200, base64.b64decode(fixture["body"]), content_type=fixture["content_type"])
+
+
+class FakePlaces(ThreadingHTTPServer):
+    """The fake served on ``host:port`` (0 picks a free port) from a background thread"""
+
+    daemon_threads = True
+    # Room for a thousand lookups connecting at once
+    request_queue_size = 1024
+
+    def __init__(self, fixtures=DEFAULT_FIXTURES, mode="playback", host="127.0.0.1", port=0,
+                 synthesize=False, results=1, photos=5, latency=0.0, jitter=0.0, error_rate=0.0,
+                 qps=None, daily_limit=None, token_delay=DEFAULT_TOKEN_DELAY, upstream=UPSTREAM,
+                 verbose=False):
+        super().__init__((host, port), _Handler)
+        if mode not in ("record", "playback"):
+            raise ValueError(f"mode must be record or playback, not {mode!r}")
+        self.fixtures = fixtures
+        self.mode = mode
+        self.synthesize = synthesize
+        self.results = results
+        self.photos = photos
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.quota = _Quota(qps, daily_limit)
+        self.token_delay = token_delay
+        self.upstream = HTTPClient(upstream) if mode == "record" else None
+        self.verbose = verbose
+        self.stats = {}
+        self.bytes_sent = 0  # response body bytes
+        self.synthesized_photos = {}
+        self._tokens = {}  # next_page_token -> (usable from, synthesized page or None)
+        self._lock = threading.Lock()
+        self._thread = None
+        os.makedirs(fixtures, exist_ok=True)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, what, endpoint):
+        with self._lock:
+            counts = self.stats.setdefault(endpoint, {})
+            counts[what] = counts.get(what, 0) + 1
+
+    def count_sent(self, sent):
+        with self._lock:
+            self.bytes_sent += sent
+
+    # --- page tokens -------------------------------------------------------
+
+    def issue_token(self, token, page=None):
+        with self._lock:
+            if token not in self._tokens:
+                self._tokens[token] = (time.monotonic() + self.token_delay, page)
+
+    def token_ready(self, token):
+        """False for a token issued less than ``token_delay`` ago
+
+        Tokens this server never issued (replaying a recording from an
+        earlier run) are left to the fixture lookup.
+        """
+        with self._lock:
+            issued = self._tokens.get(token)
+        return issued is None or time.monotonic() >= issued[0]
+
+    # --- fixtures ----------------------------------------------------------
+
+    def load_file(self, name):
+        try:
+            with open(os.path.join(self.fixtures, os.path.basename(name)), encoding="utf-8") as fp:
+                return json.load(fp)
+        except FileNotFoundError:
+            return None
+
+    def load(self, endpoint, params):
+        fixture = self.load_file(fixture_name(endpoint, params))
+        if fixture is not None:
+            self.count("replayed", endpoint)
+        return fixture
+
+    def _save(self, name, fixture):
+        path = os.path.join(self.fixtures, name)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as fp:
+            json.dump(fixture, fp, indent=1)
+        os.replace(f"{path}.tmp", path)
+
+    def record(self, endpoint, path, params):
+        """Fetch from Google, save the fixture and return it"""
+        name = fixture_name(endpoint, params)
+        resp = self.upstream.get(self.upstream.base_url + path, params=params)
+        request = {k: v for k, v in params.items() if k != "key"}
+        if endpoint == "photo":
+            fixture = {"name": name, "request": request,
+                       "content_type": resp.headers.get("Content-Type", "image/jpeg"),
+                       "body": base64.b64encode(resp.body).decode()}
+        else:
+            fixture = {"name": name, "request": request, "body": resp.json()}
+        self._save(name, fixture)
+        self.count("recorded", endpoint)
+        return fixture
+
+    # --- made-up answers ---------------------------------------------------
+
+    def synthesized(self, endpoint, params):
+        self.count("synthesized", endpoint)
+        name = fixture_name(endpoint, params)
+        if endpoint == "textsearch":
+            return {"name": name, "body": self._search_page(params)}
+        if endpoint == "details":
+            place_id = params.get("place_id", "")
+            photos = [{"photo_reference": f"fakeref-{_digest(place_id)[:12]}-{i}",
+                       "width": 1600, "height": 1200, "html_attributions": []}
+                      for i in range(self.photos)]
+            result = {"place_id": place_id, "name": f"Fake place {place_id[-6:]}", "photos": photos}
+            fields = params.get("fields", "photos").split(",")
+            if "editorial_summary" in fields:
+                result["editorial_summary"] = {"overview": "A fake sauna with a steam room and cold plunge."}
+            if "reviews" in fields:
+                result["reviews"] = [{"rating": 5, "text": text} for text in _FAKE_REVIEWS]
+            return {"name": name, "body": {"status": "OK", "result": result}}
+        width = int(params.get("maxwidth") or 800)
+        seed = _digest(params.get("photoreference", ""))
+        photo = {"name": name, "content_type": "image/png",
+                 "body": base64.b64encode(pattern_png(width, width * 3 // 4, seed)).decode()}
+        with self._lock:
+            self.synthesized_photos[name] = photo
+        return photo
+
+    def _search_page(self, params):
+        token = params.get("pagetoken")
+        if token:
+            with self._lock:
+                issued = self._tokens.get(token)
+            if not issued or not issued[1]:
+                return {"status": "INVALID_REQUEST", "results": []}
+            query, page = issued[1]
+        else:
+            query, page = params.get("query", ""), 0
+        if not query.strip():
+            return {"status": "INVALID_REQUEST", "results": []}
+        total = self.results
+        if total == 0:
+            return {"status": "ZERO_RESULTS", "results": []}
+        first = page * PAGE_SIZE
+        results = [{"place_id": f"ChIJfake{_digest(f'{query}#{i}')[:19]}",
+                    "name": query if i == 0 else f"{query} ({i + 1})",
+                    "formatted_address": query}
+                   for i in range(first, min(total, first + PAGE_SIZE))]
+        body = {"status": "OK", "results": results}
+        if first + PAGE_SIZE < total:
+            body["next_page_token"] = secrets.token_urlsafe(24)
+            self.issue_token(body["next_page_token"], (query, page + 1))
+        return body
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self.upstream:
+            self.upstream.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def summary(self):
+        return "\n".join(
+            f"{endpoint:<10} " + ", ".join(f"{what} {n}" for what, n in sorted(counts.items()))
+            for endpoint, counts in sorted(self.stats.items())
+        )
@@ -0,0 +1,441 @@
+"""A local, SQLite-backed stand-in for the bits of Supabase the scripts use
+
+Covers the PostgREST calls made on ``/rest/v1/saunas``:
+
+- GET with ``select``, ``order``, column filters (``eq``, ``neq``, ``gt``,
+  ``gte``, ``lt``, ``lte``, ``in``, ``is``), ``limit``/``offset`` and
+  ``Range`` headers, answering with an ETag and 304 for a matching
+  ``If-None-Match``
+- POST of one object or an array, with ``Prefer: return=representation``
+  and upserts via ``on_conflict`` + ``resolution=merge-duplicates`` (or
+  ``ignore-duplicates``)
+- PATCH with filters such as ``id=eq.<id>``
+
+plus Storage uploads (``POST /storage/v1/object/<bucket>/<path>``) and
+public downloads, enough for the photo scripts. Columns are the ones in
+saunalib.schema, so writing a column the real table doesn't have fails
+here too, and so does a row without one of the NOT NULL columns
+(``name``, ``address``, ``city_slug``), upserts included. ``latency``
+(seconds, plus up to ``jitter``) and ``error_rate`` (a fraction of requests
+answered with ``error_status``) are injected before any work is done, to
+exercise retries and concurrency without a network.
+
+Run it with scripts/fake-supabase.py, or in-process::
+
+    with FakeSupabase() as fake:
+        client = supabase_client(fake.url, key="local")
+"""
+
+import hashlib
+import json
+import random
+import re
+import sqlite3
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .schema import COLUMNS, FLOAT_COLUMNS, INT_COLUMNS, JSON_COLUMNS, LIST_COLUMNS, NOT_NULL_COLUMNS
+
+DEFAULT_PORT = 54321
+TABLE = "saunas"
+# saunalib.schema's columns plus the ones the database fills in itself
+ALL_COLUMNS = ("id", *COLUMNS, "created_at", "updated_at")
+_OPERATORS = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+_RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+_RANGE = re.compile(r"^(\d+)-(\d*)$")
+
+
+class PostgRESTError(Exception):
+    """An error answered as PostgREST's JSON error body"""
+
+    def __init__(self, status, message, code="PGRST000", details=None):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.details = details
+
+
+def _sql_type(col):
+    if col == "id" or col in INT_COLUMNS:
+        return "INTEGER"
+    if col in FLOAT_COLUMNS:
+        return "REAL"
+    return "TEXT"
+
+
+def _quoted(cols):
+    return ", ".join(f'"{col}"' for col in cols)
+
+
+def _now():
+    return time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime())
+
+
+class Store:
+    """The ``saunas`` table and storage objects in one SQLite database"""
+
+    def __init__(self, path=":memory:"):
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        columns = ", ".join(
+            "id INTEGER PRIMARY KEY AUTOINCREMENT" if col == "id" else f'"{col}" {_sql_type(col)}'
+            for col in ALL_COLUMNS
+        )
+        with self.db:
+            self.db.execute(f"CREATE TABLE IF NOT EXISTS {TABLE} ({columns})")
+            self.db.execute("CREATE TABLE IF NOT EXISTS objects "
+                            "(path TEXT PRIMARY KEY, content_type TEXT, data BLOB)")
+
+    def __len__(self):
+        with self.lock:
+            return self.db.execute(f"SELECT count(*) FROM {TABLE}").fetchone()[0]
+
+    # --- rows --------------------------------------------------------------
+
+    @staticmethod
+    def _encode(col, value):
+        if col in LIST_COLUMNS + JSON_COLUMNS and value is not None:
+            return json.dumps(value)
+        return value
+
+    @staticmethod
+    def _decode(col, value):
+        if col in LIST_COLUMNS + JSON_COLUMNS and value is not None:
+            return json.loads(value)
+        return value
+
+    @staticmethod
+    def _check_columns(cols):
+        unknown = [col for col in cols if col not in ALL_COLUMNS]
+        if unknown:
+            raise PostgRESTError(400, f"Could not find the '{unknown[0]}' column of '{TABLE}' "
+                                 "in the schema cache", code="PGRST204")
+
+    @staticmethod
+    def _check_not_null(values, cols=NOT_NULL_COLUMNS):
+        missing = [col for col in cols if values.get(col) in (None, "")]
+        if missing:
+            raise PostgRESTError(400, f'null value in column "{missing[0]}" of relation "{TABLE}" '
+                                 "violates not-null constraint", code="23502")
+
+    def _select_list(self, select):
+        cols = ALL_COLUMNS if select in (None, "", "*") else [c.strip() for c in select.split(",")]
+        self._check_columns(cols)
+        return cols
+
+    def _where(self, filters):
+        clauses, args = [], []
+        for col, expr in filters:
+            self._check_columns([col])
+            negate = expr.startswith("not.")
+            op, _, value = expr[4:].partition(".") if negate else expr.partition(".")
+            if op in _OPERATORS:
+                clause = f'"{col}" {_OPERATORS[op]} ?'
+                args.append(value)
+            elif op == "in":
+                items = [item.strip().strip('"') for item in value.strip("()").split(",") if item.strip()]
+                clause = f'"{col}" IN ({", ".join("?" * len(items))})'
+                args.extend(items)
+            elif op == "is" and value in ("null", "true", "false"):
+                clause = f'"{col}" IS {value.upper()}'
+            else:
+                raise PostgRESTError(400, f'"failed to parse filter ({expr})"', code="PGRST100")
+            clauses.append(f"NOT ({clause})" if negate else clause)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+    def _order(self, order):
+        if not order:
+            return ""
+        terms = []
+        for term in order.split(","):
+            col, *mods = term.strip().split(".")
+            self._check_columns([col])
+            direction = "DESC" if "desc" in mods else "ASC"
+            nulls = " NULLS FIRST" if "nullsfirst" in mods else " NULLS LAST" if "nullslast" in mods else ""
+            terms.append(f'"{col}" {direction}{nulls}')
+        return " ORDER BY " + ", ".join(terms)
+
+    def _rows(self, cursor, cols):
+        return [{col: self._decode(col, value) for col, value in zip(cols, row)} for row in cursor]
+
+    def select(self, select=None, filters=(), order=None, offset=0, limit=None):
+        cols = self._select_list(select)
+        where, args = self._where(filters)
+        sql = f"SELECT {_quoted(cols)} FROM {TABLE}{where}{self._order(order)}"
+        sql += f" LIMIT {int(limit) if limit is not None else -1} OFFSET {int(offset)}"
+        with self.lock:
+            return self._rows(self.db.execute(sql, args), cols)
+
+    def _select_ids(self, ids, select):
+        if not ids:
+            return []
+        cols = self._select_list(select)
+        placeholders = ", ".join("?" * len(ids))
+        rows = self.db.execute(f"SELECT {_quoted(cols)}, id FROM {TABLE} WHERE id IN ({placeholders})",
+                               ids).fetchall()
+        by_id = {row[-1]: row[:-1] for row in rows}
+        return self._rows((by_id[i] for i in ids if i in by_id), cols)
+
+    def insert(self, records, select=None, on_conflict=None, resolution=None, columns=None,
+               missing=None):
+        """Insert (or upsert) ``records``; returns the written rows
+
+        With ``columns``, a column a record lacks is NULL, or its default
+        with ``missing="default"`` (so a record without ``id`` is numbered).
+        """
+        for record in records:
+            self._check_columns(columns or record)
+        ids = []
+        with self.lock, self.db:
+            for record in records:
+                values = {col: record.get(col) for col in (columns or record)}
+                if "id" in values and values["id"] is None:
+                    if "id" in record or missing != "default":
+                        self._check_not_null(values, ["id"])
+                    del values["id"]
+                # Like Postgres, check the proposed row before resolving any conflict, so an
+                # upsert of only some columns fails even when the row already exists
+                self._check_not_null(values)
+                existing = None
+                if on_conflict and values.get(on_conflict) is not None:
+                    existing = self.db.execute(
+                        f'SELECT id FROM {TABLE} WHERE "{on_conflict}" = ?', (values[on_conflict],)
+                    ).fetchone()
+                elif "id" in values:
+                    existing = self.db.execute(f"SELECT id FROM {TABLE} WHERE id = ?",
+                                               (values["id"],)).fetchone()
+                if existing:
+                    if resolution == "ignore-duplicates":
+                        continue
+                    if resolution != "merge-duplicates":
+                        raise PostgRESTError(409, "duplicate key value violates unique constraint "
+                                             f'"{TABLE}_pkey"', code="23505")
+                    changes = {k: v for k, v in values.items() if k not in ("id", on_conflict)}
+                    self._update_ids([existing[0]], changes)
+                    ids.append(existing[0])
+                    continue
+                now = _now()
+                values.setdefault("created_at", now)
+                values.setdefault("updated_at", now)
+                cols = list(values)
+                cursor = self.db.execute(
+                    f"INSERT INTO {TABLE} ({_quoted(cols)}) VALUES ({', '.join('?' * len(cols))})",
+                    [self._encode(col, values[col]) for col in cols])
+                ids.append(cursor.lastrowid)
+            return self._select_ids(ids, select)
+
+    def _update_ids(self, ids, changes):
+        changes = {**changes, "updated_at": _now()}
+        assignments = ", ".join(f'"{col}" = ?' for col in changes)
+        args = [self._encode(col, value) for col, value in changes.items()]
+        self.db.execute(f"UPDATE {TABLE} SET {assignments} WHERE id IN ({', '.join('?' * len(ids))})",
+                        args + list(ids))
+
+    def update(self, changes, filters, select=None):
+        """PATCH: apply ``changes`` to the rows matching ``filters``; returns them"""
+        if not filters:
+            raise PostgRESTError(400, "UPDATE requires a WHERE clause", code="21000")
+        self._check_columns(changes)
+        self._check_not_null(changes, [col for col in NOT_NULL_COLUMNS if col in changes])
+        where, args = self._where(filters)
+        with self.lock, self.db:
+            ids = [row[0] for row in self.db.execute(f"SELECT id FROM {TABLE}{where}", args)]
+            if ids and changes:
+                self._update_ids(ids, {k: v for k, v in changes.items() if k != "id"})
+            return self._select_ids(ids, select)
+
+    # --- storage -----------------------------------------------------------
+
+    def put_object(self, path, data, content_type, upsert=False):
+        with self.lock, self.db:
+            if not upsert and self.db.execute("SELECT 1 FROM objects WHERE path = ?", (path,)).fetchone():
+                raise PostgRESTError(409, "The resource already exists", code="Duplicate")
+            self.db.execute("INSERT OR REPLACE INTO objects VALUES (?, ?, ?)", (path, content_type, data))
+
+    def get_object(self, path):
+        with self.lock:
+            return self.db.execute("SELECT content_type, data FROM objects WHERE path = ?",
+                                   (path,)).fetchone()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        if self.server.verbose:
+            super().log_message(*args)
+
+    def _send(self, status, body=b"", content_type="application/json", headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+            self.server.count_sent(len(body))
+
+    def _send_json(self, status, value, headers=None):
+        self._send(status, json.dumps(value).encode(), headers=headers)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _prefer(self):
+        prefs = {}
+        for part in (self.headers.get("Prefer") or "").split(","):
+            key, _, value = part.strip().partition("=")
+            if key:
+                prefs[key] = value
+        return prefs
+
+    def _dispatch(self):
+        server = self.server
+        # Read the body even for injected errors so the keep-alive connection stays usable
+        body = self._read_body()
+        server.count_request(self.command, len(body))
+        if server.latency or server.jitter:
+            time.sleep(server.latency + random.uniform(0, server.jitter))
+        if server.error_rate and random.random() < server.error_rate:
+            server.count_error()
+            return self._send_json(server.error_status, {"message": "injected error", "code": "FAKE"})
+
+        parts = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        try:
+            if parts.path == f"/rest/v1/{TABLE}":
+                handler = getattr(self, f"_rest_{self.command.lower()}", None)
+                if handler is None:
+                    raise PostgRESTError(405, f"{self.command} not supported")
+                return handler(query, body)
+            if parts.path.startswith("/storage/v1/object/"):
+                return self._storage(urllib.parse.unquote(parts.path[len("/storage/v1/object/"):]), body)
+            raise PostgRESTError(404, f"no route for {parts.path}", code="PGRST125")
+        except PostgRESTError as e:
+            self._send_json(e.status, {"code": e.code, "message": str(e), "details": e.details, "hint": None})
+        except (ValueError, sqlite3.Error) as e:
+            self._send_json(400, {"code": "PGRST102", "message": str(e), "details": None, "hint": None})
+
+    do_GET = do_HEAD = do_POST = do_PATCH = _dispatch
+
+    @staticmethod
+    def _filters(query):
+        return [(key, value) for key, value in query if key not in _RESERVED_PARAMS]
+
+    def _rest_get(self, query, body):
+        params = dict(query)
+        offset, limit = int(params.get("offset", 0)), params.get("limit")
+        match = _RANGE.match(self.headers.get("Range") or "")
+        if match:
+            offset = int(match.group(1))
+            if match.group(2):
+                limit = int(match.group(2)) - offset + 1
+        rows = self.server.store.select(params.get("select"), self._filters(query),
+                                        params.get("order"), offset, limit)
+        data = json.dumps(rows).encode()
+        etag = f'W/"{hashlib.sha1(data).hexdigest()}"'
+        end = f"{offset + len(rows) - 1}" if rows else ""
+        headers = {"ETag": etag, "Content-Range": f"{offset}-{end}/*" if rows else "*/*"}
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, headers=headers)
+        self._send(200, data, headers=headers)
+
+    def _rest_post(self, query, body):
+        params = dict(query)
+        payload = json.loads(body or b"null")
+        records = payload if isinstance(payload, list) else [payload]
+        if not all(isinstance(record, dict) for record in records):
+            raise PostgRESTError(400, "Empty or invalid json", code="PGRST102")
+        prefer = self._prefer()
+        columns = params["columns"].split(",") if params.get("columns") else None
+        rows = self.server.store.insert(records, select=params.get("select"),
+                                        on_conflict=params.get("on_conflict"),
+                                        resolution=prefer.get("resolution"), columns=columns,
+                                        missing=prefer.get("missing"))
+        if prefer.get("return") == "representation":
+            return self._send_json(201, rows)
+        self._send(201)
+
+    def _rest_patch(self, query, body):
+        params = dict(query)
+        changes = json.loads(body or b"{}")
+        rows = self.server.store.update(changes, self._filters(query), select=params.get("select"))
+        if self._prefer().get("return") == "representation":
+            return self._send_json(200, rows)
+        self._send(204)
+
+    def _storage(self, path, body):
+        store = self.server.store
+        if self.command == "POST":
+            upsert = (self.headers.get("x-upsert") or "").lower() == "true"
+            store.put_object(path, body, self.headers.get("Content-Type") or "application/octet-stream",
+                             upsert=upsert)
+            return self._send_json(200, {"Key": path})
+        found = store.get_object(path[len("public/"):] if path.startswith("public/") else path)
+        if self.command not in ("GET", "HEAD") or not found:
+            raise PostgRESTError(404, "Object not found", code="not_found")
+        self._send(200, found[1], content_type=found[0])
+
+
+class FakeSupabase(ThreadingHTTPServer):
+    """The fake served on ``host:port`` (0 picks a free port) from a background thread"""
+
+    daemon_threads = True
+    # Room for many concurrent workers connecting at once
+    request_queue_size = 1024
+
+    def __init__(self, db=":memory:", host="127.0.0.1", port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, error_status=503, verbose=False):
+        super().__init__((host, port), _Handler)
+        self.store = Store(db)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.verbose = verbose
+        self.requests = {}
+        self.errors = 0
+        # Request and response body bytes
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self._stats_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self, method, received):
+        with self._stats_lock:
+            self.requests[method] = self.requests.get(method, 0) + 1
+            self.bytes_received += received
+
+    def count_sent(self, sent):
+        with self._stats_lock:
+            self.bytes_sent += sent
+
+    def count_error(self):
+        with self._stats_lock:
+            self.errors += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,194 @@
+"""Batch coordinate checks for seed records, vectorized with NumPy
+
+Hand-typed ``lat``/``lng`` values go wrong in a few typical ways: a dropped
+minus sign or swapped pair lands the venue on another continent, a wrong
+digit moves it into the next city, and a copy-pasted pair gives two
+venues the same pin. ``check_coordinates`` looks at a whole seed batch at
+once and returns errors (reject the record) and warnings (worth a look):
+
+- missing or out-of-range coordinates, and venues outside their city's
+  ``bbox`` or more than ``max_center_km`` from its center (errors)
+- venues far from the rest of their city's venues (warnings)
+- different venues within ``same_spot_m`` of each other (warnings)
+
+City centers and bounding boxes come from src/data/cities.json.
+"""
+
+from collections import defaultdict
+
+from .cities import CITY_CONFIG
+from .existing import normalize_text
+
+EARTH_RADIUS_KM = 6371
+DEFAULT_MAX_CENTER_KM = 80
+# A venue is an outlier when it is this many MADs further from its city's median point...
+OUTLIER_MADS = 6
+# ...and at least this far from it
+OUTLIER_MIN_KM = 40
+# Cities need this many venues before outliers mean anything
+OUTLIER_MIN_VENUES = 8
+DEFAULT_SAME_SPOT_M = 15
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise SystemExit("Coordinate checks need NumPy: pip install numpy (or pass --no-geo-check)")
+    return numpy
+
+
+def _number(value):
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _haversine_km(np, lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(np.radians, (lat1, lng1, lat2, lng2))
+    h = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(h, 0, 1)))
+
+
+class GeoReport:
+    def __init__(self):
+        self.checked = 0
+        self.errors = defaultdict(list)
+        self.warnings = defaultdict(list)
+
+
+def check_coordinates(records, max_center_km=DEFAULT_MAX_CENTER_KM, same_spot_m=DEFAULT_SAME_SPOT_M,
+                      cross_checks=True):
+    """Check the coordinates of ``(source, record)`` pairs; returns a GeoReport
+
+    Only the source, name, city and coordinates of each record are kept, so
+    a large seed can be streamed through. Without ``cross_checks`` only the
+    per-record checks run (no outliers or shared pins), so a chunk of a
+    larger set can be checked on its own.
+    """
+    np = _numpy()
+    sources, names, slugs, lats, lngs = [], [], [], [], []
+    for source, record in records:
+        sources.append(source)
+        names.append(record.get("name") or "")
+        slugs.append(record.get("city_slug") or "")
+        lats.append(_number(record.get("lat")))
+        lngs.append(_number(record.get("lng")))
+
+    report = GeoReport()
+    report.checked = len(sources)
+    if not sources:
+        return report
+    lat = np.array(lats, dtype=float)
+    lng = np.array(lngs, dtype=float)
+
+    valid = np.isfinite(lat) & np.isfinite(lng) & (np.abs(lat) <= 90) & (np.abs(lng) <= 180)
+    for i in np.flatnonzero(~valid):
+        report.errors[sources[i]].append("missing or out-of-range lat/lng")
+
+    city_slugs, city_of = np.unique(np.array(slugs), return_inverse=True)
+    fenced = _check_geofence(np, report, sources, lat, lng, valid, city_slugs, city_of,
+                             max_center_km)
+    if cross_checks:
+        _check_outliers(np, report, sources, lat, lng, fenced, city_slugs, city_of)
+        _check_same_spot(np, report, sources, names, lat, lng, valid, same_spot_m)
+    return report
+
+
+def _check_geofence(np, report, sources, lat, lng, valid, city_slugs, city_of, max_center_km):
+    """Distance from each city's center and containment in its bbox
+
+    Returns the mask of valid rows that passed.
+    """
+    nan = float("nan")
+    centers = np.array([
+        (CITY_CONFIG[s]["center"]["lat"], CITY_CONFIG[s]["center"]["lng"]) if s in CITY_CONFIG
+        else (nan, nan) for s in city_slugs
+    ]).reshape(-1, 2)
+    boxes = np.array([
+        CITY_CONFIG[s].get("bbox") or (nan,) * 4 if s in CITY_CONFIG else (nan,) * 4
+        for s in city_slugs
+    ], dtype=float).reshape(-1, 4)
+
+    center_lat, center_lng = centers[city_of, 0], centers[city_of, 1]
+    known = valid & np.isfinite(center_lat)
+    distance = _haversine_km(np, lat, lng, center_lat, center_lng)
+    swapped = _haversine_km(np, lng, lat, center_lat, center_lng)
+    far = known & (distance > max_center_km)
+
+    south, west, north, east = (boxes[city_of, k] for k in range(4))
+    boxed = valid & np.isfinite(south)
+    outside = boxed & ~((lat >= south) & (lat <= north) & (lng >= west) & (lng <= east))
+
+    for i in np.flatnonzero(far | outside):
+        slug = city_slugs[city_of[i]]
+        problem = (f"{lat[i]:.5f},{lng[i]:.5f} is {distance[i]:.0f} km from the {slug} center"
+                   if far[i] else f"{lat[i]:.5f},{lng[i]:.5f} is outside the {slug} bbox")
+        if swapped[i] <= max_center_km:
+            problem += " (lat/lng swapped?)"
+        report.errors[sources[i]].append(problem)
+
+    unknown = valid & ~np.isfinite(center_lat)
+    for i in np.flatnonzero(unknown):
+        report.warnings[sources[i]].append(f"no center configured for city {city_slugs[city_of[i]]!r}")
+    return valid & ~(far | outside)
+
+
+def _check_outliers(np, report, sources, lat, lng, valid, city_slugs, city_of):
+    """Venues unusually far from the median point of their own city's venues"""
+    for city in range(len(city_slugs)):
+        members = np.flatnonzero(valid & (city_of == city))
+        if len(members) < OUTLIER_MIN_VENUES:
+            continue
+        mid_lat, mid_lng = np.median(lat[members]), np.median(lng[members])
+        distance = _haversine_km(np, lat[members], lng[members], mid_lat, mid_lng)
+        typical = np.median(distance)
+        spread = max(np.median(np.abs(distance - typical)), 1.0)
+        limit = max(typical + OUTLIER_MADS * spread, OUTLIER_MIN_KM)
+        for i, km in zip(members[distance > limit], distance[distance > limit]):
+            report.warnings[sources[i]].append(
+                f"{km:.0f} km from the middle of {city_slugs[city]}'s other venues "
+                f"(most are within {typical + spread:.0f} km)")
+
+
+def _check_same_spot(np, report, sources, names, lat, lng, valid, same_spot_m):
+    """Different venues with (nearly) the same coordinates
+
+    Points are projected to metres and snapped to a grid of ``2 *
+    same_spot_m`` cells four times, shifted by half a cell in each
+    direction; any two points closer than ``same_spot_m`` share a cell in
+    at least one of the grids, so only points sharing a cell are compared.
+    """
+    rows = np.flatnonzero(valid)
+    if len(rows) < 2:
+        return
+    y = np.radians(lat[rows]) * EARTH_RADIUS_KM * 1000
+    x = np.radians(lng[rows]) * EARTH_RADIUS_KM * 1000 * np.cos(np.radians(lat[rows]))
+    cell = 2.0 * same_spot_m
+
+    pairs = set()
+    for dx in (0.0, 0.5):
+        for dy in (0.0, 0.5):
+            col = np.floor(x / cell + dx).astype(np.int64)
+            row = np.floor(y / cell + dy).astype(np.int64)
+            keys = (col << 32) + row
+            order = np.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+            same = np.flatnonzero(sorted_keys[1:] == sorted_keys[:-1])
+            if not len(same):
+                continue
+            # Group consecutive equal keys into runs and pair up their members
+            starts = same[np.insert(np.diff(same) != 1, 0, True)]
+            for start in starts:
+                end = start + 1
+                while end < len(sorted_keys) and sorted_keys[end] == sorted_keys[start]:
+                    end += 1
+                members = sorted(rows[order[start:end]])
+                pairs.update((a, b) for n, a in enumerate(members) for b in members[n + 1:])
+
+    for a, b in sorted(pairs):
+        if normalize_text(names[a]) == normalize_text(names[b]):
+            continue
+        meters = _haversine_km(np, lat[a], lng[a], lat[b], lng[b]) * 1000
+        if meters <= same_spot_m:
+            report.warnings[sources[b]].append(
+                f"{meters:.0f} m from {sources[a]} ({names[a]}), a different venue")
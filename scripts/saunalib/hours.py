@@ -0,0 +1,190 @@
+"""Compile free-text opening hours into a weekly quarter-hour bitmask
+
+``hours`` is written by hand ("Mon-Thu: 9AM-9PM, Fri: 9AM-10PM", "24/7",
+"8AM-8PM daily"). ``parse_hours`` turns it into a 7×96 grid, one bit per
+quarter hour starting Monday 00:00, so "open at T" is a single bit test:
+bit ``day * 96 + minute // 15`` with Monday = 0.
+
+``encode_mask`` stores the grid as 168 hex digits, least significant
+nibble first, so the frontend can test a bit without big integers:
+``parseInt(mask[bit >> 2], 16) >> (bit & 3) & 1``.
+"""
+
+import re
+
+SLOTS_PER_DAY = 96
+DAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+ALWAYS_OPEN = (1 << (7 * SLOTS_PER_DAY)) - 1
+HEX_DIGITS = 7 * SLOTS_PER_DAY // 4
+
+_ALWAYS_OPEN_TEXT = re.compile(r"^\s*(24\s*/\s*7|(open\s+)?24\s*hours?(\s+daily)?|always open)\s*$", re.I)
+_TIME = r"(\d{1,2})(?::(\d{2}))?\s*(am|pm|a\.m\.|p\.m\.)?|noon|midnight"
+_TOKEN = re.compile(
+    rf"(?P<range>(?:{_TIME})\s*(?:-|to|until)\s*(?:{_TIME}))"
+    r"|(?P<days>\b(?:mon|tue|wed|thu|fri|sat|sun)[a-z]*\.?(?:\s*(?:-|to)\s*(?:mon|tue|wed|thu|fri|sat|sun)[a-z]*\.?)?)"
+    r"|(?P<daily>\b(?:daily|every\s*day|7\s*days)\b)"
+    r"|(?P<word>[a-z]+)",
+    re.I,
+)
+_SINGLE_TIME = re.compile(_TIME, re.I)
+# Words that carry no schedule information
+_FILLER = {"open", "spa", "hours", "and", "am", "pm", "a", "week"}
+
+
+class HoursError(ValueError):
+    """Hours text that could not be compiled at all"""
+
+
+def _day_index(token):
+    return DAYS.index(token[:3].lower())
+
+
+def _days(token):
+    parts = re.split(r"\s*(?:-|to)\s*", token.strip().rstrip("."), flags=re.I)
+    first = _day_index(parts[0])
+    if len(parts) == 1:
+        return [first]
+    last = _day_index(parts[1])
+    return [(first + i) % 7 for i in range((last - first) % 7 + 1)]
+
+
+def _minutes(text, default_meridiem=None):
+    """Minutes after midnight for one time, and the am/pm it used"""
+    text = text.strip().lower()
+    if text == "noon":
+        return 12 * 60, "pm"
+    if text == "midnight":
+        return 0, "am"
+    match = _SINGLE_TIME.fullmatch(text)
+    hour, minute = int(match.group(1)), int(match.group(2) or 0)
+    meridiem = (match.group(3) or "").replace(".", "") or default_meridiem
+    if hour > 24 or minute >= 60:
+        raise HoursError(f"bad time {text!r}")
+    if meridiem:
+        if hour > 12:
+            raise HoursError(f"bad time {text!r}")
+        hour = hour % 12 + (12 if meridiem == "pm" else 0)
+    return hour * 60 + minute, meridiem
+
+
+def _time_range(text):
+    """``(open, close)`` in minutes; close may exceed 24h when it runs past midnight"""
+    start_text, end_text = re.split(r"\s*(?:-|to|until)\s*", text.strip(), maxsplit=1, flags=re.I)
+    close, close_meridiem = _minutes(end_text)
+    start, _ = _minutes(start_text, default_meridiem=None)
+    if not re.search(r"am|pm|a\.m|p\.m|noon|midnight", start_text, re.I) and close_meridiem:
+        # "9-5PM": borrow the closing am/pm unless that would open after closing
+        borrowed, _ = _minutes(start_text, close_meridiem)
+        start = borrowed if borrowed < close or close == 0 else start
+    if close <= start:
+        close += 24 * 60
+    return start, close
+
+
+def _set_slots(mask, day, start, close):
+    first = day * SLOTS_PER_DAY + start // 15
+    last = day * SLOTS_PER_DAY + -(-close // 15)  # ceil: open until 9:20 counts 9:15-9:30
+    for slot in range(first, last):
+        mask |= 1 << (slot % (7 * SLOTS_PER_DAY))
+    return mask
+
+
+def parse_hours(text):
+    """Compile an hours string; returns ``(mask, problems)``
+
+    ``mask`` is an int with one bit per open quarter hour (see module
+    docstring). ``problems`` lists text that was not understood; when
+    nothing could be understood ``HoursError`` is raised instead. Times
+    without days apply to every day ("8AM-8PM daily", "9AM-9PM"), a day
+    list applies to the time ranges that follow it ("Mon, Wed-Fri: 1PM-11PM
+    & 5PM-9PM"), and a range ending at or before its start runs past
+    midnight into the next day.
+    """
+    if not text or not text.strip():
+        raise HoursError("no hours")
+    if _ALWAYS_OPEN_TEXT.match(text):
+        return ALWAYS_OPEN, []
+
+    mask = 0
+    problems = []
+    days = []           # days named since the last time range
+    applied = False     # whether ``days`` already received a time range
+    pending = []        # time ranges seen before any day
+    unknown = []
+    used = False
+    for token in _TOKEN.finditer(text.replace("–", "-").replace("—", "-")):
+        kind = token.lastgroup
+        if kind == "days" or kind == "daily":
+            new_days = list(range(7)) if kind == "daily" else _days(token.group())
+            if applied:
+                days, applied = [], False
+            days.extend(new_days)
+            if pending:
+                for start, close in pending:
+                    for day in days:
+                        mask = _set_slots(mask, day, start, close)
+                pending, applied, used = [], True, True
+        elif kind == "range":
+            try:
+                start, close = _time_range(token.group())
+            except HoursError as e:
+                problems.append(str(e))
+                continue
+            if days:
+                for day in days:
+                    mask = _set_slots(mask, day, start, close)
+                applied = used = True
+            else:
+                pending.append((start, close))
+        elif token.group().lower() not in _FILLER:
+            unknown.append(token.group())
+
+    if pending:
+        # Times with no day at all ("9AM-9PM") mean every day
+        for start, close in pending:
+            for day in range(7):
+                mask = _set_slots(mask, day, start, close)
+        used = True
+    if unknown:
+        problems.insert(0, f"unrecognised {' '.join(unknown)!r}")
+    if days and not applied:
+        problems.append(f"no times for {', '.join(DAYS[d].title() for d in sorted(set(days)))}")
+    if not used:
+        raise HoursError("; ".join(problems) or "no times found")
+    return mask, problems
+
+
+def encode_mask(mask):
+    """168 hex digits, nibble ``k`` holding bits ``4k..4k+3``"""
+    return "".join("0123456789abcdef"[(mask >> (4 * k)) & 0xF] for k in range(HEX_DIGITS))
+
+
+def decode_mask(encoded):
+    return sum(int(digit, 16) << (4 * k) for k, digit in enumerate(encoded))
+
+
+def is_open(mask, weekday, minute):
+    """Whether ``mask`` is open on ``weekday`` (Monday = 0) at ``minute`` after midnight"""
+    return bool(mask >> (weekday * SLOTS_PER_DAY + minute // 15) & 1)
+
+
+def hours_mask(text):
+    """``(encoded mask or None, problems)`` for the ``hours_mask`` column"""
+    try:
+        mask, problems = parse_hours(text)
+    except HoursError as e:
+        return None, [str(e)]
+    return encode_mask(mask), problems
+
+
+def compile_hours(records, on_unparsed=None):
+    """Set ``hours_mask`` on each ``(source, record)`` as it passes
+
+    Records whose hours could not be fully understood are passed to
+    ``on_unparsed(source, record, problems)`` as they go by.
+    """
+    for source, record in records:
+        mask, problems = hours_mask(record.get("hours"))
+        if problems and on_unparsed:
+            on_unparsed(source, record, problems)
+        yield source, {**record, "hours_mask": mask}
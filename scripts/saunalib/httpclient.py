@@ -0,0 +1,163 @@
+"""Small keep-alive HTTP client shared by the Python data scripts
+
+``urllib.request.urlopen`` opens a fresh TCP (and TLS) connection for every
+call. ``HTTPClient`` keeps idle ``http.client`` connections per host and hands
+them back out, so a run against Supabase or Google Places pays for the
+handshake once per worker instead of once per request.
+"""
+
+import gzip
+import http.client
+import json as jsonlib
+import threading
+import urllib.parse
+
+from .config import service_key, supabase_url
+from .errors import HTTPError
+from .ratelimit import IDEMPOTENT_METHODS, SCHEDULERS
+
+DEFAULT_TIMEOUT = 30
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+# Errors that mean a pooled connection was closed by the server while idle
+_STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                 ConnectionResetError, BrokenPipeError)
+
+
+class Response:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        return jsonlib.loads(self.body) if self.body else None
+
+
+class HTTPClient:
+    """Thread-safe client with per-host connection reuse and default headers
+
+    With a ``scheduler`` (see saunalib.ratelimit) every request is rate
+    limited and retried on 429/5xx.
+    """
+
+    def __init__(self, base_url="", headers=None, timeout=DEFAULT_TIMEOUT, scheduler=None):
+        self.base_url = base_url.rstrip("/")
+        self.scheduler = scheduler
+        self.headers = {"Accept-Encoding": "gzip", **(headers or {})}
+        self.timeout = timeout
+        self.connections_opened = 0
+        self.requests_sent = 0
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _acquire(self, scheme, netloc):
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop(), True
+            self.connections_opened += 1
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(netloc, timeout=self.timeout), False
+
+    def _release(self, scheme, netloc, conn):
+        with self._lock:
+            self._idle.setdefault((scheme, netloc), []).append(conn)
+
+    def request(self, method, url, params=None, json=None, data=None, headers=None):
+        """Send a request and return a ``Response``; raises ``HTTPError`` on 4xx/5xx"""
+        if not url.startswith(("http://", "https://")):
+            url = self.base_url + url
+        if params:
+            url += ("&" if "?" in url else "?") + urllib.parse.urlencode(params, safe=",.()*:")
+        if json is not None:
+            data = jsonlib.dumps(json).encode("utf-8")
+
+        if self.scheduler is None:
+            return self._send(method, url, data, headers)
+        return self.scheduler.call(lambda: self._send(method, url, data, headers),
+                                   idempotent=method in IDEMPOTENT_METHODS)
+
+    def _send(self, method, url, data, headers):
+        for _ in range(MAX_REDIRECTS + 1):
+            resp, body = self._exchange(method, url, data, headers)
+            location = resp.getheader("Location")
+            if resp.status not in REDIRECT_STATUSES or not location:
+                break
+            # Places Photo answers with a redirect to the image on googleusercontent.com
+            url = urllib.parse.urljoin(url, location)
+            if resp.status == 303 or (resp.status in (301, 302) and method == "POST"):
+                method, data = "GET", None
+
+        if resp.getheader("Content-Encoding", "").lower() == "gzip":
+            body = gzip.decompress(body)
+        if resp.status >= 400:
+            raise HTTPError(method, url, resp.status, resp.reason, body, resp.headers)
+        return Response(resp.status, resp.headers, body)
+
+    def _exchange(self, method, url, data, headers):
+        """One request/response on a pooled connection; returns ``(response, raw_body)``"""
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        merged = {**self.headers, **(headers or {})}
+        if parts.netloc != urllib.parse.urlsplit(self.base_url).netloc:
+            # Credentials in the default headers are only for our own host
+            for name in ("apikey", "Authorization"):
+                if name in merged and not (headers and name in headers):
+                    del merged[name]
+
+        while True:
+            conn, reused = self._acquire(parts.scheme, parts.netloc)
+            try:
+                conn.request(method, path, body=data, headers=merged)
+                resp = conn.getresponse()
+                body = resp.read()
+            except _STALE_ERRORS:
+                conn.close()
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            break
+
+        with self._lock:
+            self.requests_sent += 1
+        if resp.will_close:
+            conn.close()
+        else:
+            self._release(parts.scheme, parts.netloc, conn)
+        return resp, body
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request("PATCH", url, **kwargs)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+def supabase_client(base_url=None, key=None, scheduler=SCHEDULERS["supabase"]):
+    """Client for the Supabase REST API authenticated with the service key
+
+    ``base_url`` defaults to ``supabase_url()``.
+    """
+    key = key or service_key()
+    return HTTPClient(base_url or supabase_url(), headers={
+        "apikey": key,
+        "Authorization": f"Bearer {key}",
+        "Content-Type": "application/json",
+    }, scheduler=scheduler)
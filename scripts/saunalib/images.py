@@ -0,0 +1,128 @@
+"""Responsive variants of scraped photos, made locally with Pillow
+
+Google serves every photo at one size (``maxwidth=800``), and cards show it
+in a 160px-high strip. ``optimize_photo`` turns one downloaded JPEG into
+AVIF and WebP copies at a few widths (never wider than the original) plus a
+tiny blurred WebP placeholder as a ``data:`` URI, which the frontend shows
+while the real image loads. It is a plain function of bytes so it can run
+on a process pool.
+
+``phash`` is a 64-bit perceptual hash (the sign pattern of the lowest 8×8
+DCT frequencies of a 32×32 grayscale thumbnail): resized, recompressed or
+slightly retouched copies of a photo land within a few bits of each other,
+which is how near-duplicate photos of one venue are spotted.
+"""
+
+import base64
+import io
+import math
+import os
+
+DEFAULT_WIDTHS = (320, 480, 800)
+DEFAULT_FORMATS = ("avif", "webp")
+CONTENT_TYPES = {"avif": "image/avif", "webp": "image/webp", "jpg": "image/jpeg"}
+QUALITY = {"avif": 50, "webp": 72}
+PLACEHOLDER_WIDTH = 16
+# Photos whose perceptual hashes differ in at most this many of 64 bits are near-duplicates
+DEFAULT_NEAR_DUPLICATE_BITS = 8
+_HASH_SIZE = 32
+_DCT = [[math.cos((2 * x + 1) * u * math.pi / (2 * _HASH_SIZE)) for x in range(_HASH_SIZE)]
+        for u in range(8)]
+
+
+def _pillow():
+    try:
+        from PIL import Image, features
+    except ImportError:
+        raise SystemExit("Photo processing needs Pillow: pip install pillow "
+                         "(or pass --no-variants --keep-near-duplicates)")
+    return Image, features
+
+
+def check_formats(formats):
+    """Fail early if this Pillow can't write one of ``formats``"""
+    _, features = _pillow()
+    for fmt in formats:
+        if fmt not in QUALITY:
+            raise SystemExit(f"Unknown photo variant format {fmt!r} (use {', '.join(QUALITY)})")
+        if not features.check(fmt):
+            raise SystemExit(f"This Pillow can't write {fmt.upper()}: pip install -U pillow "
+                             f"(or pass --formats {' '.join(f for f in formats if f != fmt) or 'webp'})")
+
+
+def variant_filename(filename, width, fmt):
+    """``<sha256>.jpg`` → ``<sha256>-320w.webp``
+
+    e.g. ``50d858e0…f6545c.jpg`` → ``50d858e0…f6545c-320w.webp`` for a photo
+    stored under ``storage.content_filename``.
+    """
+    return f"{os.path.splitext(filename)[0]}-{width}w.{fmt}"
+
+
+def _encode(image, fmt, quality):
+    out = io.BytesIO()
+    if fmt == "webp":
+        image.save(out, "WEBP", quality=quality, method=4)
+    else:
+        image.save(out, fmt.upper(), quality=quality)
+    return out.getvalue()
+
+
+def placeholder(image):
+    """A ~16px wide WebP of ``image`` as a ``data:`` URI (a few hundred bytes)"""
+    height = max(1, round(image.height * PLACEHOLDER_WIDTH / image.width))
+    small = image.resize((PLACEHOLDER_WIDTH, height))
+    return "data:image/webp;base64," + base64.b64encode(_encode(small, "webp", 30)).decode()
+
+
+def optimize_photo(data, filename, widths=DEFAULT_WIDTHS, formats=DEFAULT_FORMATS):
+    """Variants of one photo
+
+    Returns ``{"width", "height", "placeholder", "files"}``, where ``files``
+    are ``(filename, format, width, bytes)`` for each format and width, in
+    ``formats`` order and by increasing width.
+    """
+    Image, _ = _pillow()
+    with Image.open(io.BytesIO(data)) as source:
+        image = source.convert("RGB")
+    sizes = sorted({min(width, image.width) for width in widths})
+    files = []
+    for width in sizes:
+        resized = image if width == image.width else image.resize(
+            (width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+        for fmt in formats:
+            files.append((variant_filename(filename, width, fmt), fmt, width,
+                          _encode(resized, fmt, QUALITY[fmt])))
+    files.sort(key=lambda f: (formats.index(f[1]), f[2]))
+    return {"width": image.width, "height": image.height, "placeholder": placeholder(image),
+            "files": files}
+
+
+def phash(data):
+    """Perceptual hash of image bytes as a 64-bit int"""
+    Image, _ = _pillow()
+    with Image.open(io.BytesIO(data)) as source:
+        pixels = list(source.convert("L").resize((_HASH_SIZE, _HASH_SIZE), Image.LANCZOS).getdata())
+    rows = [pixels[y * _HASH_SIZE:(y + 1) * _HASH_SIZE] for y in range(_HASH_SIZE)]
+    # The 2-D DCT is separable: transform the rows, then the columns, keeping 8 frequencies of each
+    row_freqs = [[sum(p * c for p, c in zip(row, basis)) for basis in _DCT] for row in rows]
+    coeffs = [sum(row_freqs[y][u] * _DCT[v][y] for y in range(_HASH_SIZE))
+              for v in range(8) for u in range(8)]
+    median = sorted(coeffs)[len(coeffs) // 2]
+    bits = 0
+    for coeff in coeffs:
+        bits = bits << 1 | (coeff > median)
+    return bits
+
+
+def hash_distance(a, b):
+    """Number of differing bits between two ``phash`` values"""
+    return bin(a ^ b).count("1")
+
+
+def srcsets(urls):
+    """``{format: "url 320w, url 480w"}`` from ``(format, width, url)`` triples"""
+    sets = {}
+    for fmt, width, url in urls:
+        sets.setdefault(fmt, []).append(f"{url} {width}w")
+    return {fmt: ", ".join(entries) for fmt, entries in sets.items()}
@@ -0,0 +1,181 @@
+"""Chunked, parallel inserts of seed records into the `saunas` table"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+from .existing import changed_fields
+from .httpclient import HTTPError
+from .ratelimit import RetryBudgetExceeded
+from .schema import ValidationError, validate_record
+from .supabase import upsert_rows
+
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_PARALLEL = 4
+
+NEW = "new"
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+SIMILAR = "similar"
+# Filled in by the database; a sync never writes them back
+MANAGED_COLUMNS = ("created_at", "updated_at")
+
+
+def chunked(iterable, size):
+    """Yield lists of up to ``size`` items without materializing ``iterable``"""
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validated(records, errors, rejected=None):
+    """Pass through valid ``(source, record)`` pairs, appending the rest to ``errors``
+
+    ``rejected`` maps sources to problems found by batch-level checks (see
+    saunalib.geocheck) that a single record can't reveal on its own.
+    """
+    for source, record in records:
+        problems = validate_record(record) + (rejected or {}).get(source, [])
+        if problems:
+            errors.append(ValidationError(source, problems))
+        else:
+            yield source, record
+
+
+def classify(records, index, partial=False, on_diff=None, on_similar=None):
+    """Tag ``(source, record)`` pairs as ``(action, source, record)``.
+
+    Without an ``index`` every record is NEW. With one (see
+    saunalib.existing.ExistingIndex), records matching a stored row become
+    CHANGED (with the row's ``id`` added) or UNCHANGED, and with a fuzzy
+    index records that only resemble a stored (or earlier) one become
+    SIMILAR and are reported to ``on_similar(source, record, match)``
+    instead of being written. New records are added to the index so a venue
+    repeated in the input is only inserted once. With ``partial`` a CHANGED
+    record is the stored row with only the differing columns replaced, so
+    columns the input doesn't have keep their stored value, and ``on_diff(row,
+    changed)`` sees every field-level difference.
+    """
+    for source, record in records:
+        row = index.match(record) if index is not None else None
+        if row is None:
+            match = index.similar(record) if index is not None else None
+            if match is not None:
+                if on_similar:
+                    on_similar(source, record, match)
+                yield SIMILAR, source, record
+                continue
+            if index is not None:
+                index.add(record)
+            yield NEW, source, record
+        elif "id" not in row:
+            # Matches a record earlier in this same input
+            yield UNCHANGED, source, record
+        else:
+            changed = changed_fields(record, row)
+            if not changed:
+                yield UNCHANGED, source, record
+                continue
+            if on_diff:
+                on_diff(row, changed)
+            if partial:
+                stored = {col: value for col, value in row.items() if col not in MANAGED_COLUMNS}
+                yield CHANGED, source, {**stored, **changed}
+            else:
+                yield CHANGED, source, {**record, "id": row["id"]}
+
+
+def write_chunk(client, chunk):
+    """Write the NEW and CHANGED records of one chunk in a single upsert.
+
+    CHANGED records are complete rows with their stored ``id`` (see
+    ``classify``) and NEW ones have no ``id``, so both go out in the same
+    ``upsert_rows`` request; the table numbers the new rows.
+
+    Returns ``(inserted_rows, update_results)``.
+    """
+    records = [record for action, _, record in chunk if action in (NEW, CHANGED)]
+    changed = {record["id"] for action, _, record in chunk if action == CHANGED}
+    written = upsert_rows(records, client=client, select="id,name,city_slug") if records else []
+    inserted = [row for row in written if row["id"] not in changed]
+    updated_ids = {row["id"] for row in written}
+    return inserted, {sauna_id: sauna_id in updated_ids for sauna_id in changed}
+
+
+class IngestResult:
+    def __init__(self):
+        self.valid = 0
+        self.inserted = []
+        self.updated = []
+        self.unchanged = 0
+        self.similar = 0
+        self.failed = []
+        self.invalid = []
+
+
+def ingest(records, client, batch_size=DEFAULT_BATCH_SIZE, parallel=DEFAULT_PARALLEL,
+           dry_run=False, index=None, partial=False, on_diff=None, on_similar=None,
+           on_chunk=None, rejected=None):
+    """Validate ``(source, record)`` pairs and write them in parallel chunks.
+
+    At most ``parallel`` chunks are in flight and only twice that many are
+    read ahead, so memory stays bounded however large the input is. Passing
+    an ``index`` of existing rows makes the run idempotent: records already
+    stored unchanged are skipped and changed ones are upserted by id
+    (onto the stored row with ``partial``; see ``classify``). Records
+    a fuzzy index flags as SIMILAR are held back and counted, not written.
+    ``on_chunk(chunk, inserted, updated, error)`` is called as each chunk
+    finishes; chunk items are ``(action, source, record)``. Sources in
+    ``rejected`` are counted as invalid with the given problems.
+    """
+    result = IngestResult()
+
+    def finished(future, chunk):
+        try:
+            inserted, updated = future.result()
+        except (HTTPError, OSError, RetryBudgetExceeded) as e:
+            result.failed.append((chunk, e))
+            inserted, updated, error = [], {}, e
+        else:
+            result.inserted.extend(inserted)
+            result.updated.extend(sauna_id for sauna_id, ok in updated.items() if ok)
+            result.failed.extend(
+                ([(a, s, r) for a, s, r in chunk if r.get("id") == sauna_id], "update failed")
+                for sauna_id, ok in updated.items() if not ok
+            )
+            error = None
+        if on_chunk:
+            on_chunk(chunk, inserted, updated, error)
+
+    def pending_writes():
+        valid = validated(records, result.invalid, rejected)
+        for item in classify(valid, index, partial, on_diff, on_similar):
+            result.valid += 1
+            if item[0] == UNCHANGED:
+                result.unchanged += 1
+            elif item[0] == SIMILAR:
+                result.similar += 1
+            else:
+                yield item
+
+    chunks = chunked(pending_writes(), batch_size)
+    if dry_run:
+        for chunk in chunks:
+            if on_chunk:
+                on_chunk(chunk, [], {}, None)
+        return result
+
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+        pending = {}
+        for chunk in chunks:
+            pending[pool.submit(write_chunk, client, chunk)] = chunk
+            if len(pending) >= parallel * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finished(future, pending.pop(future))
+        done, _ = wait(pending)
+        for future in done:
+            finished(future, pending.pop(future))
+    return result
@@ -0,0 +1,83 @@
+"""Append-only checkpoint journals for restartable batch jobs
+
+A job appends one JSON line per finished unit of work (a venue, a seed
+record) with its outcome. Rerunning with ``--resume`` skips units whose last
+outcome is final; ``--retry-failed`` reruns only the units that failed.
+Lines are flushed as they are written, so a crash or Ctrl-C loses at most
+the unit in progress.
+"""
+
+import json
+import os
+import threading
+import time
+
+JOURNAL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "journals")
+
+
+def journal_path(job):
+    return os.path.join(JOURNAL_DIR, f"{job}.jsonl")
+
+
+class Journal:
+    """Outcome per key, persisted as JSON Lines at ``path``
+
+    ``done_statuses`` are outcomes that need no more work; everything else
+    counts as failed.
+    """
+
+    def __init__(self, path, done_statuses, fresh=False):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.done_statuses = set(done_statuses)
+        self.entries = {}
+        self._lock = threading.Lock()
+        if not fresh and os.path.exists(path):
+            with open(path, encoding="utf-8") as fp:
+                for line in fp:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line from a crash
+                    self.entries[entry["key"]] = entry
+        self._fp = open(path, "w" if fresh else "a", encoding="utf-8")
+
+    def record(self, key, status, **details):
+        entry = {"key": key, "status": status, "ts": round(time.time(), 3), **details}
+        with self._lock:
+            self.entries[key] = entry
+            self._fp.write(json.dumps(entry) + "\n")
+            self._fp.flush()
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def is_done(self, key):
+        entry = self.entries.get(key)
+        return entry is not None and entry["status"] in self.done_statuses
+
+    def is_failed(self, key):
+        entry = self.entries.get(key)
+        return entry is not None and entry["status"] not in self.done_statuses
+
+    def select(self, items, key, resume=False, retry_failed=False):
+        """Filter ``items`` down to the work still to do for this run"""
+        for item in items:
+            k = key(item)
+            if retry_failed and not self.is_failed(k):
+                continue
+            if resume and self.is_done(k):
+                continue
+            yield item
+
+    def close(self):
+        with self._lock:
+            self._fp.close()
+
+
+def add_journal_args(parser):
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--resume", action="store_true",
+                       help="skip work finished by the previous run (see the job journal)")
+    group.add_argument("--retry-failed", action="store_true",
+                       help="only rerun work that failed in previous runs")
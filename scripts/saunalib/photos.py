@@ -0,0 +1,297 @@
+"""Asynchronous photo scrape pipeline
+
+The SCRAPING_GUIDE flow (Place Details → download → Storage upload → update
+the `photos` column) as asyncio stages joined by bounded queues. Each
+stage runs its own number of workers, so slow Google downloads don't hold up
+uploads and a full queue pushes back on the stage feeding it. The blocking
+HTTP calls run on a thread pool through the shared keep-alive clients and
+rate-limit schedulers. The last stage buffers finished saunas and upserts
+their `photos` (and `photo_variants`) ``batch_size`` rows per request; the
+saunas should carry ``name``, ``address`` and ``city_slug`` so those rows are
+complete (see ``bulk_update``).
+
+Photos are stored under the SHA-256 of their bytes (see saunalib.storage),
+so an image that is already in Storage, from an earlier run or another
+venue of the same chain, is not uploaded again. A photo whose perceptual
+hash is within ``near_duplicate_bits`` of one already kept for the same
+venue is dropped.
+
+With ``variants``, an optimize stage between download and upload makes
+AVIF/WebP copies at several widths and a placeholder (see saunalib.images)
+on a process pool of ``processes`` workers. They are uploaded next to the
+original and described in the `photo_variants` column, one entry per URL
+in `photos`.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from . import images, places, storage
+from .schema import NOT_NULL_COLUMNS
+from .supabase import bulk_update
+
+DEFAULT_WORKERS = {"details": 4, "download": 8, "upload": 8}
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_BATCH_SIZE = 100
+
+_DONE = object()
+
+
+class StageStats:
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.done = 0
+        self.failed = 0
+        self.busy = 0.0
+        self.started = None
+        self.finished = None
+
+    def summary(self):
+        elapsed = (self.finished or time.perf_counter()) - (self.started or time.perf_counter())
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        return (f"{self.name:<9} {self.workers:>3} workers  {self.done:>6} done  "
+                f"{self.failed:>4} failed  {rate:>8.1f}/s")
+
+
+class PhotoJob:
+    """One photo of one sauna moving through the pipeline"""
+
+    __slots__ = ("sauna", "index", "reference", "filename", "data", "variants")
+
+    def __init__(self, sauna, index, reference, filename):
+        self.sauna = sauna
+        self.index = index
+        self.reference = reference
+        self.filename = filename
+        self.data = None
+        self.variants = None
+
+
+class PhotoPipeline:
+    """Scrape up to ``max_photos`` photos per sauna into Storage and the DB
+
+    ``on_sauna(sauna, urls, errors)`` is called once every photo of a sauna
+    has been uploaded, dropped as a duplicate or has failed. With
+    ``variants``, each photo is also stored at ``widths`` in ``formats``
+    (see saunalib.images). ``near_duplicate_bits=None`` keeps near-duplicates.
+    """
+
+    def __init__(self, client, max_photos=5, max_width=800, workers=None,
+                 queue_size=DEFAULT_QUEUE_SIZE, batch_size=DEFAULT_BATCH_SIZE, on_sauna=None,
+                 variants=False, widths=images.DEFAULT_WIDTHS, formats=images.DEFAULT_FORMATS,
+                 processes=None, near_duplicate_bits=images.DEFAULT_NEAR_DUPLICATE_BITS):
+        self.client = client
+        self.max_photos = max_photos
+        self.max_width = max_width
+        self.workers = {**DEFAULT_WORKERS, **(workers or {})}
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.on_sauna = on_sauna
+        self.variants = variants
+        self.widths = tuple(widths)
+        self.formats = tuple(formats)
+        self.near_duplicate_bits = near_duplicate_bits
+        if variants:
+            images.check_formats(self.formats)
+            self.workers["optimize"] = processes or os.cpu_count() or 1
+        self.stats = {name: StageStats(name, self.workers[name])
+                      for name in ("details", "download", "optimize", "upload") if name in self.workers}
+        self.stats["update"] = StageStats("update", 1)
+        self.updated = {}
+        self.duplicates = 0
+        self.uploaded = 0
+        self.existing = 0
+        self._progress = {}
+
+    def run(self, saunas):
+        """Run the pipeline over ``saunas`` (rows with id, name, place_id)"""
+        return asyncio.run(self._run(saunas))
+
+    async def _run(self, saunas):
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=sum(self.workers.values()) + 1))
+        details_q = asyncio.Queue(self.queue_size)
+        download_q = asyncio.Queue(self.queue_size)
+        optimize_q = asyncio.Queue(self.queue_size) if self.variants else None
+        upload_q = asyncio.Queue(self.queue_size)
+        update_q = asyncio.Queue(self.queue_size)
+
+        async def feed():
+            for sauna in saunas:
+                await details_q.put(sauna)
+            for _ in range(self.workers["details"]):
+                await details_q.put(_DONE)
+
+        async def worker(name, inq, outq, handler):
+            stats = self.stats[name]
+            stats.started = stats.started or time.perf_counter()
+            while True:
+                item = await inq.get()
+                if item is _DONE:
+                    break
+                start = time.perf_counter()
+                try:
+                    produced = await handler(item)
+                except Exception as e:
+                    stats.failed += 1
+                    await self._photo_finished(item, None, e, update_q)
+                    continue
+                finally:
+                    stats.busy += time.perf_counter() - start
+                stats.done += 1
+                for out in produced:
+                    await outq.put(out)
+            stats.finished = time.perf_counter()
+
+        async def stage(name, inq, outq, handler, downstream_workers):
+            """Run a stage's workers, then tell each downstream worker to stop"""
+            await asyncio.gather(*(worker(name, inq, outq, handler) for _ in range(self.workers[name])))
+            for _ in range(downstream_workers):
+                await outq.put(_DONE)
+
+        async def details(sauna):
+            refs = await asyncio.to_thread(places.get_place_photos, sauna["place_id"], self.max_photos)
+            if not refs:
+                await self._finish_sauna(sauna, [], [], update_q)
+                return []
+            self._progress[sauna["id"]] = {"remaining": len(refs), "urls": [None] * len(refs),
+                                           "variants": [None] * len(refs), "errors": [], "kept": []}
+            return [PhotoJob(sauna, i, ref["photo_reference"], None) for i, ref in enumerate(refs)]
+
+        async def download(job):
+            job.data = await asyncio.to_thread(places.download_photo, job.reference, self.max_width)
+            job.filename = storage.content_filename(job.data)
+            fingerprint = None
+            if self.near_duplicate_bits is not None:
+                fingerprint = await asyncio.to_thread(images.phash, job.data)
+            if self._is_duplicate(job, fingerprint):
+                self.duplicates += 1
+                job.data = None
+                await self._photo_finished(job, None, None, update_q)
+                return []
+            return [job]
+
+        async def optimize(job):
+            job.variants = await loop.run_in_executor(
+                pool, images.optimize_photo, job.data, job.filename, self.widths, self.formats)
+            return [job]
+
+        async def upload(job):
+            url, _ = await asyncio.to_thread(self._upload, job.data, job.filename)
+            job.data = None
+            variant = None
+            if job.variants:
+                variant = await asyncio.to_thread(self._upload_variants, job.variants)
+                job.variants = None
+                variant = {"src": url, **variant}
+            await self._photo_finished(job, url, None, update_q, variant)
+            return []
+
+        if self.variants:
+            downloaded = [stage("download", download_q, optimize_q, download, self.workers["optimize"]),
+                          stage("optimize", optimize_q, upload_q, optimize, self.workers["upload"])]
+        else:
+            downloaded = [stage("download", download_q, upload_q, download, self.workers["upload"])]
+        pool = ProcessPoolExecutor(max_workers=self.workers["optimize"]) if self.variants else None
+        try:
+            await asyncio.gather(
+                feed(),
+                stage("details", details_q, download_q, details, self.workers["download"]),
+                *downloaded,
+                stage("upload", upload_q, update_q, upload, 1),
+                self._update_stage(update_q),
+            )
+        finally:
+            if pool:
+                pool.shutdown()
+        return self.updated
+
+    def _is_duplicate(self, job, fingerprint):
+        """Whether ``job``'s photo repeats (or nearly repeats) one kept for its sauna"""
+        kept = self._progress[job.sauna["id"]]["kept"]
+        for filename, other in kept:
+            if filename == job.filename:
+                return True
+            if fingerprint is not None and images.hash_distance(fingerprint, other) <= self.near_duplicate_bits:
+                return True
+        kept.append((job.filename, fingerprint))
+        return False
+
+    def _upload(self, data, filename, content_type="image/jpeg"):
+        url, uploaded = storage.upload_new(self.client, data, filename, content_type=content_type)
+        if uploaded:
+            self.uploaded += 1
+        else:
+            self.existing += 1
+        return url, uploaded
+
+    def _upload_variants(self, optimized):
+        """Upload ``images.optimize_photo`` output; returns its `photo_variants` entry"""
+        urls = [(fmt, width, self._upload(data, filename, images.CONTENT_TYPES[fmt])[0])
+                for filename, fmt, width, data in optimized["files"]]
+        return {"width": optimized["width"], "height": optimized["height"],
+                "placeholder": optimized["placeholder"], "srcset": images.srcsets(urls)}
+
+    async def _photo_finished(self, item, url, error, update_q, variant=None):
+        """Record one photo's outcome; hand the sauna to the update stage once all are in"""
+        if not isinstance(item, PhotoJob):
+            # Place Details itself failed
+            await self._finish_sauna(item, [], [error], update_q)
+            return
+        progress = self._progress[item.sauna["id"]]
+        progress["urls"][item.index] = url
+        progress["variants"][item.index] = variant
+        if error is not None:
+            progress["errors"].append(error)
+        progress["remaining"] -= 1
+        if progress["remaining"] == 0:
+            del self._progress[item.sauna["id"]]
+            urls = [u for u in progress["urls"] if u]
+            variants = [v for u, v in zip(progress["urls"], progress["variants"]) if u]
+            await self._finish_sauna(item.sauna, urls, progress["errors"], update_q, variants)
+
+    async def _finish_sauna(self, sauna, urls, errors, update_q, variants=None):
+        if self.on_sauna:
+            self.on_sauna(sauna, urls, errors)
+        if urls:
+            row = {"id": sauna["id"], **{col: sauna[col] for col in NOT_NULL_COLUMNS if col in sauna},
+                   "photos": urls}
+            if self.variants:
+                row["photo_variants"] = variants
+            await update_q.put(row)
+
+    async def _update_stage(self, update_q):
+        stats = self.stats["update"]
+        batch = []
+
+        async def flush():
+            start = time.perf_counter()
+            stats.started = stats.started or start
+            results = await asyncio.to_thread(bulk_update, batch, len(batch), self.client)
+            stats.busy += time.perf_counter() - start
+            for sauna_id, ok in results.items():
+                self.updated[sauna_id] = ok
+                if ok:
+                    stats.done += 1
+                else:
+                    stats.failed += 1
+            batch.clear()
+
+        while True:
+            row = await update_q.get()
+            if row is _DONE:
+                break
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                await flush()
+        if batch:
+            await flush()
+        stats.finished = time.perf_counter()
+
+    def summary(self):
+        return "\n".join([*(stats.summary() for stats in self.stats.values()),
+                          f"storage   {self.uploaded} uploaded, {self.existing} already stored, "
+                          f"{self.duplicates} near-duplicate photos dropped"])
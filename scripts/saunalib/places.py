@@ -0,0 +1,94 @@
+"""Google Places API lookups"""
+
+from .cache import MISS, normalize_query
+from .config import places_api_key, places_url
+from .httpclient import HTTPClient
+from .ratelimit import SCHEDULERS, Throttled
+
+# Endpoint paths under places_url()
+TEXT_SEARCH_PATH = "/maps/api/place/textsearch/json"
+DETAILS_PATH = "/maps/api/place/details/json"
+PHOTO_PATH = "/maps/api/place/photo"
+
+# One keep-alive client for every maps.googleapis.com call in the process
+client = HTTPClient()
+scheduler = SCHEDULERS["places"]
+
+
+class PlacesError(Exception):
+    """Google answered with an error status (REQUEST_DENIED, INVALID_REQUEST, ...)"""
+
+
+def places_get(path, params):
+    """GET a Places web-service endpoint under the rate limit, retrying when throttled.
+
+    Returns the decoded JSON. ``OVER_QUERY_LIMIT`` comes back as HTTP 200, so
+    it is turned into ``Throttled`` here for the scheduler to back off on.
+    """
+    def send():
+        data = client.get(places_url() + path, params={**params, "key": places_api_key()}).json()
+        if data.get("status") == "OVER_QUERY_LIMIT":
+            raise Throttled(f"OVER_QUERY_LIMIT: {data.get('error_message', '')}".rstrip(": "))
+        return data
+
+    return scheduler.call(send)
+
+
+def find_place_id(name, address, cache=None):
+    """Search for a place using Google Places Text Search API
+
+    Returns the first result's place_id, or None when Google has no match.
+    Quota and request errors are raised (after retries) rather than being
+    mistaken for "not found". With a ``cache`` (see saunalib.cache), answers
+    from earlier runs are reused, including "not found".
+    """
+    query = f"{name} {address}"
+    key = "textsearch:" + normalize_query(query)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not MISS:
+            return cached
+
+    data = places_get(TEXT_SEARCH_PATH, {"query": query})
+    status = data.get("status")
+    if status not in ("OK", "ZERO_RESULTS"):
+        raise PlacesError(f"{status}: {data.get('error_message', '')}".rstrip(": "))
+
+    place_id = None
+    if status == "OK" and data.get("results"):
+        place_id = data["results"][0].get("place_id")
+    if cache is not None:
+        cache.set(key, place_id)
+    return place_id
+
+
+def get_place_photos(place_id, limit=5):
+    """Photo metadata for a place from Place Details (empty if it has none)"""
+    data = places_get(DETAILS_PATH, {"place_id": place_id, "fields": "photos"})
+    if data.get("status") != "OK":
+        return []
+    return data.get("result", {}).get("photos", [])[:limit]
+
+
+def get_place_text(place_id):
+    """``(editorial summary, review texts)`` for a place from Place Details
+
+    A place Google no longer knows has no text; other error statuses raise
+    PlacesError.
+    """
+    data = places_get(DETAILS_PATH, {"place_id": place_id, "fields": "editorial_summary,reviews"})
+    status = data.get("status")
+    if status in ("NOT_FOUND", "ZERO_RESULTS"):
+        return None, []
+    if status != "OK":
+        raise PlacesError(f"{status}: {data.get('error_message', '')}".rstrip(": "))
+    result = data.get("result", {})
+    reviews = [review.get("text") or "" for review in result.get("reviews") or []]
+    return (result.get("editorial_summary") or {}).get("overview"), reviews
+
+
+def download_photo(photo_reference, max_width=800):
+    """Image bytes for a photo reference from the Places Photo endpoint"""
+    return scheduler.call(lambda: client.get(places_url() + PHOTO_PATH, params={
+        "maxwidth": max_width, "photoreference": photo_reference, "key": places_api_key(),
+    }).body)
@@ -0,0 +1,204 @@
+"""Token-bucket rate limiting and retry with backoff for API calls
+
+Each upstream API gets one ``Scheduler`` (see ``SCHEDULERS``) that every
+thread shares. A call waits for a token, runs, and is retried with
+exponential backoff and full jitter when the API pushes back: HTTP 429, 5xx,
+dropped connections, or a ``Throttled`` error raised by the caller (Google
+answers ``OVER_QUERY_LIMIT`` with HTTP 200). Throttling also halves the
+bucket's rate, which then creeps back up to the configured rate as calls
+succeed, so a run settles just under the real quota. Retries come out of a
+budget so an outage can't multiply traffic without bound.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+
+from .errors import HTTPError
+
+# Only methods that are safe to send twice are retried after a 5xx or a dropped connection
+IDEMPOTENT_METHODS = ("GET", "HEAD", "PUT", "PATCH", "DELETE")
+# "Try again later" statuses, retried for any method
+THROTTLE_STATUSES = (429, 503)
+LATENCY_SAMPLES = 10_000
+
+
+class Throttled(Exception):
+    """The API answered but asked us to slow down"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RetryBudgetExceeded(Exception):
+    """Gave up because the scheduler's retry budget is spent"""
+
+
+class TokenBucket:
+    """Allow ``rate`` acquisitions per second with bursts of up to ``burst``"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate):
+        with self._lock:
+            self.rate = rate
+
+    def acquire(self):
+        """Block until a token is available; returns the seconds spent waiting"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+def _retry_reason(error, idempotent):
+    """Why ``error`` is worth retrying (None if it isn't), plus any Retry-After hint"""
+    if isinstance(error, Throttled):
+        return "throttled", error.retry_after
+    if isinstance(error, HTTPError):
+        retry_after = None
+        if error.headers is not None:
+            try:
+                retry_after = float(error.headers.get("Retry-After"))
+            except (TypeError, ValueError):
+                pass
+        if error.status in THROTTLE_STATUSES:
+            return "throttled", retry_after
+        if error.status >= 500 and idempotent:
+            return "server error", retry_after
+        return None, None
+    if isinstance(error, OSError) and idempotent:
+        return "connection error", None
+    return None, None
+
+
+class Scheduler:
+    """Rate limit, retry and measure calls to one API"""
+
+    def __init__(self, name, rate, burst=None, max_retries=5, base_delay=0.5,
+                 max_delay=30.0, retry_budget=0.5, min_retry_budget=10):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.target_rate = rate
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        # Retries allowed: min_retry_budget plus retry_budget × calls made so far
+        self.retry_budget = retry_budget
+        self.min_retry_budget = min_retry_budget
+        self.calls = 0
+        self.sent = 0
+        self.throttled = 0
+        self.retried = 0
+        self.failed = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._lock = threading.Lock()
+
+    def configure(self, rate=None, burst=None, max_retries=None):
+        if rate is not None:
+            self.bucket = TokenBucket(rate, burst)
+            self.target_rate = rate
+        if max_retries is not None:
+            self.max_retries = max_retries
+
+    def _take_retry(self):
+        with self._lock:
+            if self.retried >= self.min_retry_budget + self.retry_budget * self.calls:
+                return False
+            self.retried += 1
+            return True
+
+    def _slow_down(self):
+        self.bucket.set_rate(max(self.target_rate / 16, self.bucket.rate / 2))
+
+    def _speed_up(self):
+        if self.bucket.rate < self.target_rate:
+            self.bucket.set_rate(min(self.target_rate, self.bucket.rate + self.target_rate / 20))
+
+    def backoff(self, attempt, retry_after=None):
+        """Full-jitter exponential delay for ``attempt`` (0-based)"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def call(self, fn, idempotent=True):
+        """Run ``fn()`` under the rate limit, retrying when the API pushes back"""
+        with self._lock:
+            self.calls += 1
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            start = time.perf_counter()
+            try:
+                result = fn()
+            except Exception as e:
+                reason, retry_after = _retry_reason(e, idempotent)
+                with self._lock:
+                    self.sent += 1
+                    self.latencies.append(time.perf_counter() - start)
+                    if reason == "throttled":
+                        self.throttled += 1
+                        self._slow_down()
+                if reason is None or attempt >= self.max_retries:
+                    with self._lock:
+                        self.failed += 1
+                    raise
+                if not self._take_retry():
+                    with self._lock:
+                        self.failed += 1
+                    raise RetryBudgetExceeded(f"{self.name}: retry budget spent ({e})") from e
+                time.sleep(self.backoff(attempt, retry_after))
+                attempt += 1
+                continue
+            with self._lock:
+                self.sent += 1
+                self.latencies.append(time.perf_counter() - start)
+                self._speed_up()
+            return result
+
+    def percentile(self, q):
+        with self._lock:
+            samples = sorted(self.latencies)
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(q / 100 * len(samples)))]
+
+    def metrics(self):
+        return {
+            "api": self.name,
+            "sent": self.sent,
+            "throttled": self.throttled,
+            "retried": self.retried,
+            "failed": self.failed,
+            "p50_ms": round(self.percentile(50) * 1000, 1),
+            "p90_ms": round(self.percentile(90) * 1000, 1),
+            "p99_ms": round(self.percentile(99) * 1000, 1),
+        }
+
+    def summary(self):
+        m = self.metrics()
+        return (f"{m['api']}: {m['sent']} requests, {m['throttled']} throttled, "
+                f"{m['retried']} retried, {m['failed']} failed, "
+                f"p50 {m['p50_ms']}ms p90 {m['p90_ms']}ms p99 {m['p99_ms']}ms")
+
+
+SCHEDULERS = {
+    "places": Scheduler("places", rate=10, burst=10),
+    "supabase": Scheduler("supabase", rate=50, burst=50),
+}
@@ -0,0 +1,198 @@
+"""CSV reports in the format written by the Node scrape/enrich scripts
+
+Reports are written a row at a time (``ReportWriter``), so a long job keeps
+no report in memory and a crash still leaves every row written so far. They
+are read back just as lazily: ``iter_reports`` chains the rows of every
+``<kind>-report-<city>-<ms>.csv`` in ``scripts/`` in run order, for
+aggregations across hundreds of runs (``added_values``, ``status_counts``).
+"""
+
+import csv
+import glob
+import os
+import re
+import time
+from collections import Counter
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CHANGE_HEADER = "id,name,field,before,after,status"
+HOURS_HEADER = "source,name,hours,problem"
+# Scrape report statuses (scrape-saunas.js): a venue was new, already in the table, or filtered out
+NEW = "NEW"
+EXISTS = "EXISTS"
+FILTERED = "FILTERED"
+CHANGED = "CHANGED"
+
+_REPORT_NAME = re.compile(r"^(?P<kind>[a-z]+)-report-(?P<city>.+)-(?P<ms>\d+)\.csv$")
+
+
+def report_path(kind, city_slug=None):
+    """``scripts/<kind>-report-<slug>-<ms>.csv``, like enrich-saunas.js"""
+    return os.path.join(SCRIPTS_DIR, f"{kind}-report-{city_slug or 'all'}-{int(time.time() * 1000)}.csv")
+
+
+def _esc(value):
+    return '"' + str(value if value is not None else "").replace('"', '""') + '"'
+
+
+def _cell(value):
+    return "; ".join(str(v) for v in value) if isinstance(value, list) else value
+
+
+def split_list(cell):
+    """``"a; b"`` (how reports store list columns) → ``["a", "b"]``"""
+    return [part.strip() for part in (cell or "").split(";") if part.strip()]
+
+
+class ReportWriter:
+    """Append-only CSV report, created when the first row is written
+
+    Every row is flushed as it is written. Use as a context manager, or call
+    ``close()``; ``path`` is None until a row has been written. ``rename()``
+    moves a finished report, e.g. to its city's name once a run has seen
+    which cities it touched.
+    """
+
+    def __init__(self, path, header):
+        self.target = path
+        self.header = header
+        self.path = None
+        self.rows = 0
+        self._fp = None
+
+    def open(self):
+        """Create the file (header only) if no row has been written yet"""
+        if self._fp is None:
+            self._fp = open(self.target, "w", encoding="utf-8", buffering=1)
+            self._fp.write(self.header + "\n")
+            self.path = self.target
+        return self
+
+    def write_line(self, line):
+        self.open()._fp.write(line + "\n")
+        self.rows += 1
+
+    def close(self):
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+    def rename(self, path):
+        """Close the report and move it to ``path`` (for a name only known at the end)"""
+        self.close()
+        if self.path is not None and path != self.path:
+            os.replace(self.path, path)
+            self.path = path
+        self.target = path
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ChangeReport(ReportWriter):
+    """``id,name,field,before,after,status`` rows, as in enrich-saunas.js"""
+
+    def __init__(self, path):
+        super().__init__(path, CHANGE_HEADER)
+
+    def change(self, sauna_id, name, field, before, after):
+        self.write_line(f"{sauna_id},{_esc(name)},{field},{_esc(_cell(before))},{_esc(_cell(after))},{CHANGED}")
+
+    def error(self, sauna_id, name, message):
+        self.write_line(f"{sauna_id},{_esc(name)},error,,,{_esc(message)}")
+
+
+class HoursReport(ReportWriter):
+    """``source,name,hours,problem`` rows for hours that could not be compiled"""
+
+    def __init__(self, path):
+        super().__init__(path, HOURS_HEADER)
+
+    def unparsed(self, source, record, problems):
+        self.write_line(f"{_esc(source)},{_esc(record.get('name'))},{_esc(record.get('hours'))},"
+                        f"{_esc('; '.join(problems))}")
+
+
+def write_change_report(path, changes, errors=()):
+    """Write field-level changes as ``id,name,field,before,after,status``.
+
+    ``changes`` are ``(id, name, field, before, after)`` tuples and become
+    CHANGED rows; ``errors`` are ``(id, name, message)`` tuples and become
+    ``error`` rows, matching enrich-saunas.js.
+    """
+    with ChangeReport(path).open() as report:
+        for change in changes:
+            report.change(*change)
+        for error in errors:
+            report.error(*error)
+    return path
+
+
+def write_hours_report(path, unparsed):
+    """Write hours that could not be compiled as ``source,name,hours,problem``"""
+    with HoursReport(path).open() as report:
+        for item in unparsed:
+            report.unparsed(*item)
+    return path
+
+
+# --- reading -----------------------------------------------------------------
+
+def report_files(kind, city_slug=None, directory=SCRIPTS_DIR):
+    """``(path, city, run ms)`` of every ``kind`` report in ``directory``, oldest first"""
+    found = []
+    for path in glob.glob(os.path.join(directory, f"{kind}-report-*.csv")):
+        match = _REPORT_NAME.match(os.path.basename(path))
+        if match and match["kind"] == kind and city_slug in (None, match["city"]):
+            found.append((path, match["city"], int(match["ms"])))
+    return sorted(found, key=lambda item: item[2])
+
+
+def latest_report(kind, city_slug=None, directory=SCRIPTS_DIR):
+    """Path of the newest ``kind`` report named for ``city_slug`` (``all`` when None), or None"""
+    found = report_files(kind, city_slug or "all", directory)
+    return found[-1][0] if found else None
+
+
+def iter_report(path):
+    """Yield each row of one report as a dict keyed by its header"""
+    with open(path, encoding="utf-8", newline="") as fp:
+        yield from csv.DictReader(fp)
+
+
+def iter_reports(kind, city_slug=None, directory=SCRIPTS_DIR):
+    """Yield the rows of every ``kind`` report (optionally one city's), oldest run first
+
+    Each row also carries ``city`` and ``run`` (the report's millisecond
+    timestamp). Only one file is open at a time and no rows are kept.
+    """
+    for path, city, run in report_files(kind, city_slug, directory):
+        for row in iter_report(path):
+            row["city"] = city
+            row["run"] = run
+            yield row
+
+
+def added_values(rows, field):
+    """Counter of list values CHANGED rows of ``field`` added (``after`` minus ``before``)"""
+    added = Counter()
+    for row in rows:
+        if row.get("field") == field and row.get("status") == CHANGED:
+            before = set(split_list(row.get("before")))
+            added.update(value for value in split_list(row.get("after")) if value not in before)
+    return added
+
+
+def status_counts(rows):
+    """Counter of the ``status`` column (NEW / EXISTS / FILTERED for scrape reports)"""
+    return Counter(row.get("status") for row in rows)
+
+
+def acceptance_rate(counts):
+    """Share of found venues that were new rather than already in the table"""
+    seen = counts[NEW] + counts[EXISTS]
+    return counts[NEW] / seen if seen else 0.0
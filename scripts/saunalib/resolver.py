@@ -0,0 +1,34 @@
+"""Concurrent Place ID resolution for lists of venues"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .places import find_place_id
+
+DEFAULT_CONCURRENCY = 8
+
+
+def resolve_place_ids(venues, concurrency=DEFAULT_CONCURRENCY, lookup=find_place_id, cache=None):
+    """Look up Place IDs for venues on a bounded thread pool.
+
+    Yields ``(venue, place_id, error)`` in the same order as ``venues`` as
+    soon as each one (and everything before it) has finished, so callers can
+    print progress in a stable order while lookups keep running in the
+    background. ``place_id`` is None when the venue could not be found;
+    ``error`` is the exception when the lookup itself failed (quota, network)
+    so such venues can be retried instead of being dropped. ``cache`` is
+    handed to ``lookup`` so repeat runs skip venues resolved before.
+    """
+    venues = list(venues)
+    if not venues:
+        return
+
+    def resolve(venue):
+        try:
+            return lookup(venue["name"], venue["address"], cache=cache), None
+        except Exception as e:
+            return None, e
+
+    workers = max(1, min(concurrency, len(venues)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for venue, (place_id, error) in zip(venues, pool.map(resolve, venues)):
+            yield venue, place_id, error
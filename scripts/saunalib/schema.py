@@ -0,0 +1,96 @@
+"""Column definitions and validation for rows of the `saunas` table
+
+Mirrors the schema table in SCRAPING_GUIDE.md.
+"""
+
+REQUIRED_COLUMNS = (
+    "name", "address", "neighborhood", "lat", "lng", "rating", "rating_count",
+    "price", "types", "amenities", "hours", "place_id", "description", "city_slug",
+)
+OPTIONAL_COLUMNS = ("photos", "photo_variants", "website_url", "gender_policy", "hours_mask")
+COLUMNS = REQUIRED_COLUMNS + OPTIONAL_COLUMNS
+
+# NOT NULL in the table, so every row written, upserts included, has to carry them
+NOT_NULL_COLUMNS = ("name", "address", "city_slug")
+LIST_COLUMNS = ("types", "amenities", "photos")
+# jsonb: one {src, width, height, placeholder, srcset} object per entry in photos
+JSON_COLUMNS = ("photo_variants",)
+FLOAT_COLUMNS = ("lat", "lng", "rating")
+INT_COLUMNS = ("rating_count",)
+PRICES = ("$", "$$", "$$$")
+# Unrated venues are stored with a null rating / rating_count
+NULLABLE_NUMBERS = ("rating", "rating_count")
+
+
+class ValidationError(ValueError):
+    """A seed record that can't be written to the `saunas` table"""
+
+    def __init__(self, source, problems):
+        super().__init__(f"{source}: {'; '.join(problems)}")
+        self.source = source
+        self.problems = problems
+
+
+def coerce_record(record):
+    """Convert text fields (as read from CSV) to the column's type.
+
+    List columns accept "a; b" strings, the same separator the scrape and
+    enrich reports use. Empty optional columns become None.
+    """
+    out = dict(record)
+    for col in LIST_COLUMNS:
+        value = out.get(col)
+        if isinstance(value, str):
+            out[col] = [part.strip() for part in value.split(";") if part.strip()]
+    for cols, cast in ((FLOAT_COLUMNS, float), (INT_COLUMNS, int)):
+        for col in cols:
+            value = out.get(col)
+            if not isinstance(value, str):
+                continue
+            if not value.strip():
+                out[col] = None
+                continue
+            try:
+                out[col] = cast(value)
+            except ValueError:
+                pass
+    for col in OPTIONAL_COLUMNS:
+        if out.get(col) == "":
+            out[col] = None
+    return out
+
+
+def validate_record(record):
+    """Return a list of problems with ``record`` (empty if it is valid)"""
+    problems = []
+    missing = [col for col in REQUIRED_COLUMNS if col not in record]
+    if missing:
+        problems.append(f"missing {', '.join(missing)}")
+    unknown = sorted(set(record) - set(COLUMNS) - {"id"})
+    if unknown:
+        problems.append(f"unknown columns {', '.join(unknown)}")
+
+    for col in ("name", "address", "city_slug"):
+        if col in record and not (isinstance(record[col], str) and record[col].strip()):
+            problems.append(f"{col} must be a non-empty string")
+    for col in FLOAT_COLUMNS + INT_COLUMNS:
+        value = record.get(col)
+        if col in NULLABLE_NUMBERS and value is None:
+            continue
+        if col in record and (not isinstance(value, (int, float)) or isinstance(value, bool)):
+            problems.append(f"{col} must be a number, got {value!r}")
+    if isinstance(record.get("lat"), (int, float)) and not -90 <= record["lat"] <= 90:
+        problems.append(f"lat {record['lat']} out of range")
+    if isinstance(record.get("lng"), (int, float)) and not -180 <= record["lng"] <= 180:
+        problems.append(f"lng {record['lng']} out of range")
+    if isinstance(record.get("rating"), (int, float)) and not 0 <= record["rating"] <= 5:
+        problems.append(f"rating {record['rating']} out of range")
+    if "price" in record and record["price"] not in PRICES:
+        problems.append(f"price must be one of {', '.join(PRICES)}")
+    for col in LIST_COLUMNS:
+        value = record.get(col)
+        if value is not None and col in record and not (
+            isinstance(value, list) and all(isinstance(v, str) for v in value)
+        ):
+            problems.append(f"{col} must be a list of strings")
+    return problems
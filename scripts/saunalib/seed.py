@@ -0,0 +1,109 @@
+"""Streaming readers for city seed files (JSON, JSON Lines, CSV, YAML)
+
+Each reader yields ``(source, record)`` pairs one at a time, where ``source``
+is ``"file.json#n"`` for error messages, so a large seed file never has to be held
+in memory as a whole. YAML needs PyYAML and is loaded in one go.
+"""
+
+import csv
+import json
+import os
+
+from .schema import coerce_record
+
+CHUNK_SIZE = 64 * 1024
+
+
+def iter_json_array(fp, chunk_size=CHUNK_SIZE):
+    """Yield the elements of a top-level JSON array without loading the whole file"""
+    decoder = json.JSONDecoder()
+    buf = ""
+    started = False
+    eof = False
+    while True:
+        pos = 0
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if not started and pos < len(buf):
+                if buf[pos] != "[":
+                    raise ValueError("expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if pos == len(buf):
+                break
+            if buf[pos] == "]":
+                return
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                break
+            # A bare number or literal cut off by the chunk boundary ("1." of
+            # "1.5") must wait for the next chunk before it can be trusted
+            if (not isinstance(value, (dict, list, str)) and not eof
+                    and (end == len(buf) or buf[end] not in " \t\r\n,]")):
+                break
+            yield value
+            pos = end
+        buf = buf[pos:]
+        if eof:
+            raise ValueError("unterminated JSON array")
+        chunk = fp.read(chunk_size)
+        eof = not chunk
+        buf += chunk
+
+
+def _iter_json(path):
+    with open(path, encoding="utf-8") as fp:
+        yield from iter_json_array(fp)
+
+
+def _iter_jsonl(path):
+    with open(path, encoding="utf-8") as fp:
+        for line in fp:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _iter_csv(path):
+    with open(path, encoding="utf-8", newline="") as fp:
+        for row in csv.DictReader(fp):
+            yield coerce_record(row)
+
+
+def _iter_yaml(path):
+    try:
+        import yaml
+    except ImportError:
+        raise SystemExit(f"Reading {path} needs PyYAML: pip install pyyaml")
+    with open(path, encoding="utf-8") as fp:
+        data = yaml.safe_load(fp) or []
+    yield from data
+
+
+READERS = {
+    ".json": _iter_json,
+    ".jsonl": _iter_jsonl,
+    ".ndjson": _iter_jsonl,
+    ".csv": _iter_csv,
+    ".yaml": _iter_yaml,
+    ".yml": _iter_yaml,
+}
+
+
+def iter_seed_file(path):
+    """Yield ``(source, record)`` for every record in a seed file"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in READERS:
+        raise ValueError(f"{path}: unsupported seed format {ext or '(none)'}")
+    name = os.path.basename(path)
+    for i, record in enumerate(READERS[ext](path), 1):
+        yield f"{name}#{i}", record
+
+
+def iter_seed_files(paths):
+    for path in paths:
+        yield from iter_seed_file(path)
@@ -0,0 +1,297 @@
+"""Streaming export of the `saunas` table to compact per-city JSON shards
+
+Python counterpart of scripts/prefetch-saunas.js. Rows are paged from
+PostgREST with Range headers and written straight to one minified JSON
+array per ``city_slug`` as they arrive, so memory stays at one page however
+big the table gets. Each file is hashed while it is written; cities whose
+hash matches the previous export keep their existing files (and compressed
+copies) untouched, and when the server answers every page with 304 Not
+Modified for the ETags it sent last time nothing is rewritten at all.
+
+Next to the shards a small ``manifest.json`` lists every city's file,
+row count, bounding box, content hash and last-modified time, so a page can
+fetch the manifest and then only the shard it needs.
+
+``hours_mask`` is recompiled from ``hours`` on the way out, so shards stay
+right for rows whose hours were edited in the admin UI after ingestion.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import time
+
+from .hours import hours_mask
+from .supabase import DEFAULT_PAGE_SIZE, SAUNAS_PATH
+
+STATE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "snapshot.json")
+COMPRESSIONS = {"gzip": ".gz", "br": ".br"}
+MANIFEST_NAME = "manifest.json"
+_COPY_CHUNK = 1 << 16
+
+
+def minified(value):
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _utc_now():
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+def load_state(path=STATE_PATH):
+    """What the previous export recorded: page ETags and per-city hashes"""
+    try:
+        with open(path, encoding="utf-8") as fp:
+            return json.load(fp)
+    except FileNotFoundError:
+        return {}
+
+
+def save_state(state, path=STATE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fp:
+        json.dump(state, fp, indent=2)
+    os.replace(tmp, path)
+
+
+def iter_pages(client, etags=(), select="*", params=None, page_size=DEFAULT_PAGE_SIZE):
+    """Yield ``(rows, etag)`` per page of the table in id order
+
+    The first pages are requested with the previous run's ``etags``. Pages
+    the server answers with 304 are held back until one has changed, then
+    refetched so rows still come out in order; if every page is unchanged
+    (including the short last page) nothing is yielded.
+    """
+    def fetch(start, etag=None):
+        headers = {"Range-Unit": "items", "Range": f"{start}-{start + page_size - 1}"}
+        if etag:
+            headers["If-None-Match"] = etag
+        return client.get(SAUNAS_PATH, params={"select": select, "order": "id.asc", **(params or {})},
+                          headers=headers)
+
+    held = 0  # leading pages answered 304 and not yielded yet
+    changed = False
+    start = 0
+    while True:
+        page = start // page_size
+        resp = fetch(start, etags[page] if not changed and page < len(etags) else None)
+        if resp.status == 304:
+            held += 1
+            if held == len(etags):
+                return
+            start += page_size
+            continue
+        if not changed:
+            changed = True
+            for held_page in range(held):
+                again = fetch(held_page * page_size)
+                yield again.json() or [], again.headers.get("ETag")
+        rows = resp.json() or []
+        yield rows, resp.headers.get("ETag")
+        if len(rows) < page_size:
+            return
+        start += page_size
+
+
+class _ArrayWriter:
+    """A minified JSON array, written to a temp file and hashed on the way"""
+
+    def __init__(self, path):
+        self.path = path
+        self.tmp = f"{path}.tmp"
+        self.fp = open(self.tmp, "wb")
+        self.sha = hashlib.sha256()
+        self.count = 0
+        self.bytes = 0
+        self.bbox = None  # [south, west, north, east] of the rows' lat/lng
+        self._write(b"[")
+
+    def _write(self, data):
+        self.fp.write(data)
+        self.sha.update(data)
+        self.bytes += len(data)
+
+    def add(self, row):
+        self._write((b"," if self.count else b"") + minified(row).encode())
+        self.count += 1
+        lat, lng = row.get("lat"), row.get("lng")
+        if isinstance(lat, (int, float)) and isinstance(lng, (int, float)):
+            if self.bbox is None:
+                self.bbox = [lat, lng, lat, lng]
+            else:
+                box = self.bbox
+                box[0], box[1] = min(box[0], lat), min(box[1], lng)
+                box[2], box[3] = max(box[2], lat), max(box[3], lng)
+
+    def close(self):
+        self._write(b"]")
+        self.fp.close()
+        return self.sha.hexdigest()
+
+    def discard(self):
+        self.fp.close()
+        os.remove(self.tmp)
+
+    def commit(self, previous_hash, compress=()):
+        """Close, and replace the old file unless the content hash is the same
+
+        Returns ``(hash, changed)``.
+        """
+        digest = self.close()
+        unchanged = (digest == previous_hash and os.path.exists(self.path)
+                     and all(os.path.exists(self.path + COMPRESSIONS[kind]) for kind in compress))
+        if unchanged:
+            os.remove(self.tmp)
+        else:
+            os.replace(self.tmp, self.path)
+            for kind, suffix in COMPRESSIONS.items():
+                if kind in compress:
+                    _compress(self.path, kind)
+                elif os.path.exists(self.path + suffix):
+                    os.remove(self.path + suffix)  # stale copy of the old content
+        return digest, not unchanged
+
+
+def _compress(path, kind):
+    """Write ``path + .gz/.br`` next to ``path``, streaming"""
+    out = path + COMPRESSIONS[kind]
+    tmp = f"{out}.tmp"
+    with open(path, "rb") as src, open(tmp, "wb") as dst:
+        if kind == "gzip":
+            # mtime=0 keeps the output byte-identical for identical input
+            with gzip.GzipFile(fileobj=dst, mode="wb", compresslevel=9, mtime=0) as gz:
+                while chunk := src.read(_COPY_CHUNK):
+                    gz.write(chunk)
+        else:
+            try:
+                import brotli
+            except ImportError:
+                raise SystemExit("Brotli copies need the brotli package: pip install brotli")
+            compressor = brotli.Compressor(quality=11)
+            while chunk := src.read(_COPY_CHUNK):
+                dst.write(compressor.process(chunk))
+            dst.write(compressor.finish())
+    os.replace(tmp, out)
+    return out
+
+
+def write_manifest(out_dir, cities, compress=()):
+    """Write ``manifest.json`` for the shards in ``out_dir``; returns True if it changed
+
+    The manifest only depends on the shards, so an export that changes
+    nothing leaves it byte-for-byte the same.
+    """
+    manifest = {
+        "total": sum(city["count"] for city in cities.values()),
+        "last_modified": max((city["last_modified"] for city in cities.values()), default=None),
+        "cities": {
+            slug: {
+                "file": f"{slug}.json",
+                **{key: city[key] for key in ("count", "bytes", "bbox", "hash", "last_modified")},
+                "compressed": {kind: os.path.getsize(os.path.join(out_dir, f"{slug}.json{COMPRESSIONS[kind]}"))
+                               for kind in compress},
+            }
+            for slug, city in cities.items()
+        },
+    }
+    data = (minified(manifest) + "\n").encode()
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    try:
+        with open(path, "rb") as fp:
+            if fp.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(f"{path}.tmp", "wb") as fp:
+        fp.write(data)
+    os.replace(f"{path}.tmp", path)
+    return True
+
+
+class SnapshotResult:
+    def __init__(self):
+        self.rows = 0
+        self.pages = 0
+        self.not_modified = False
+        self.cities = {}  # slug -> {"count", "bytes", "hash", "changed"}
+        self.combined_changed = False
+        self.manifest_changed = False
+        self.removed = []
+
+
+def export_snapshot(client, out_dir, compress=(), combined=None, state_path=STATE_PATH,
+                    select="*", page_size=DEFAULT_PAGE_SIZE, on_page=None):
+    """Export the table to ``out_dir/<city_slug>.json`` (plus compressed copies)
+
+    ``compress`` lists formats from COMPRESSIONS to write next to each file.
+    ``combined`` is an optional path for a single file with every row, the
+    minified equivalent of prefetch-saunas.js's output. Returns a
+    SnapshotResult; ``on_page(rows_so_far)`` is called after each page.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    state = load_state(state_path)
+    previous = state.get("cities", {})
+    expected = [os.path.join(out_dir, name) for name in (MANIFEST_NAME, *(f"{slug}.json" for slug in previous))]
+    expected += [combined] if combined else []
+    if state.get("page_size") != page_size or not all(map(os.path.exists, expected)):
+        state["etags"] = []
+    result = SnapshotResult()
+    writers = {}
+    everything = _ArrayWriter(combined) if combined else None
+    extra = [everything] if everything else []
+    etags = []
+    try:
+        for rows, etag in iter_pages(client, etags=state.get("etags", []), select=select,
+                                     page_size=page_size):
+            result.pages += 1
+            etags.append(etag)
+            for row in rows:
+                if "hours" in row:
+                    row["hours_mask"] = hours_mask(row["hours"])[0]
+                slug = row.get("city_slug") or "unknown"
+                if slug not in writers:
+                    writers[slug] = _ArrayWriter(os.path.join(out_dir, f"{slug}.json"))
+                writers[slug].add(row)
+                if everything:
+                    everything.add(row)
+            result.rows += len(rows)
+            if on_page:
+                on_page(result.rows)
+    except BaseException:
+        for writer in [*writers.values(), *extra]:
+            writer.discard()
+        raise
+
+    if not result.pages:
+        for writer in [*writers.values(), *extra]:
+            writer.discard()
+        result.not_modified = True
+        return result
+
+    now = _utc_now()
+    cities = {}
+    for slug, writer in sorted(writers.items()):
+        digest, changed = writer.commit(previous.get(slug, {}).get("hash"), compress)
+        cities[slug] = {
+            "count": writer.count, "bytes": writer.bytes, "bbox": writer.bbox, "hash": digest,
+            "last_modified": now if changed else previous[slug].get("last_modified", now),
+        }
+        result.cities[slug] = {**cities[slug], "changed": changed}
+    combined_hash = None
+    if everything:
+        combined_hash, result.combined_changed = everything.commit(state.get("combined_hash"))
+
+    for slug in sorted(set(previous) - set(writers)):
+        for suffix in ("", *COMPRESSIONS.values()):
+            path = os.path.join(out_dir, f"{slug}.json{suffix}")
+            if os.path.exists(path):
+                os.remove(path)
+        result.removed.append(slug)
+
+    result.manifest_changed = write_manifest(out_dir, cities, compress)
+    # ETags only help next time if the server sent one for every page
+    save_state({"page_size": page_size, "etags": etags if all(etags) else [],
+                "cities": cities, "combined_hash": combined_hash}, state_path)
+    return result
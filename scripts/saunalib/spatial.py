@@ -0,0 +1,166 @@
+"""Uniform-grid spatial index over venue coordinates
+
+Points are bucketed into square lat/lng cells, so nearest-venue and radius
+queries only look at the cells around the query point instead of running a
+haversine over every row (as ``findClosestCity`` in src/lib/cities.js does).
+Distances are great-circle kilometres, same Earth radius as the frontend.
+"""
+
+import heapq
+import math
+from collections import defaultdict
+
+EARTH_RADIUS_KM = 6371
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+# Aim for about this many points per occupied cell when sizing the grid
+DEFAULT_POINTS_PER_CELL = 4
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    h = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+def _cell_size(points, per_cell):
+    """Cell edge in degrees that puts roughly ``per_cell`` points in each occupied cell
+
+    Venues cluster in a handful of cities, so the grid is sized from the
+    area the points cover within each 1° square they occupy rather than from
+    the overall bounding box.
+    """
+    points = list(points)
+    if len(points) < 2:
+        return 1.0
+    clusters = defaultdict(list)
+    for lat, lng in points:
+        clusters[math.floor(lat), math.floor(lng)].append((lat, lng))
+    area = 0.0
+    for members in clusters.values():
+        lats = [lat for lat, _ in members]
+        lngs = [lng for _, lng in members]
+        area += max(max(lats) - min(lats), 0.01) * max(max(lngs) - min(lngs), 0.01)
+    return max(1e-4, min(1.0, math.sqrt(area * per_cell / len(points))))
+
+
+class GridIndex:
+    """Points with ids, bucketed by ``(floor(lat / size), floor(lng / size))``"""
+
+    def __init__(self, points, cell_size=None, points_per_cell=DEFAULT_POINTS_PER_CELL):
+        """``points`` is an iterable of ``(id, lat, lng)``"""
+        self.ids, self.lats, self.lngs = [], [], []
+        for point_id, lat, lng in points:
+            self.ids.append(point_id)
+            self.lats.append(float(lat))
+            self.lngs.append(float(lng))
+        self.cell_size = cell_size or _cell_size(zip(self.lats, self.lngs), points_per_cell)
+        self.cells = defaultdict(list)
+        for i, (lat, lng) in enumerate(zip(self.lats, self.lngs)):
+            self.cells[self._cell(lat, lng)].append(i)
+
+    @classmethod
+    def from_rows(cls, rows, key="id", **kwargs):
+        """Index rows that have ``lat``/``lng``, identified by ``row[key]``; others are skipped"""
+        return cls(((row[key], row["lat"], row["lng"]) for row in rows
+                    if isinstance(row.get("lat"), (int, float))
+                    and isinstance(row.get("lng"), (int, float))), **kwargs)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _cell(self, lat, lng):
+        return math.floor(lat / self.cell_size), math.floor(lng / self.cell_size)
+
+    def _ring(self, row, col, radius):
+        """Occupied cells exactly ``radius`` cells away (Chebyshev) from ``(row, col)``"""
+        if radius == 0:
+            cell = self.cells.get((row, col))
+            return [cell] if cell else []
+        found = []
+        for r in (row - radius, row + radius):
+            for c in range(col - radius, col + radius + 1):
+                cell = self.cells.get((r, c))
+                if cell:
+                    found.append(cell)
+        for r in range(row - radius + 1, row + radius):
+            for c in (col - radius, col + radius):
+                cell = self.cells.get((r, c))
+                if cell:
+                    found.append(cell)
+        return found
+
+    def _min_km_outside(self, lat, radius):
+        """Lower bound on the distance to any point more than ``radius`` rings out"""
+        degrees = radius * self.cell_size
+        widest = min(90.0, abs(lat) + degrees)
+        return degrees * KM_PER_DEGREE * math.cos(math.radians(widest))
+
+    def nearest(self, lat, lng, k=1, exclude=None):
+        """The ``k`` closest points as ``[(km, id), ...]``, nearest first
+
+        Searches square rings of cells outward from the query's cell and
+        stops once the k-th best distance is closer than anything an
+        unsearched ring could hold. ``exclude`` is an id to leave out
+        (the query venue itself).
+        """
+        k = min(k, len(self.ids) - (exclude is not None))
+        if k <= 0:
+            return []
+        row, col = self._cell(lat, lng)
+        best = []  # max-heap of (-km, index)
+
+        def consider(cell):
+            for i in cell:
+                if exclude is not None and self.ids[i] == exclude:
+                    continue
+                km = haversine_km(lat, lng, self.lats[i], self.lngs[i])
+                if len(best) < k:
+                    heapq.heappush(best, (-km, i))
+                elif km < -best[0][0]:
+                    heapq.heapreplace(best, (-km, i))
+
+        radius = 0
+        while True:
+            if (2 * radius + 1) ** 2 > len(self.cells):
+                # Sparse surroundings: walking more rings costs more than a full scan
+                best.clear()
+                for cell in self.cells.values():
+                    consider(cell)
+                break
+            for cell in self._ring(row, col, radius):
+                consider(cell)
+            if len(best) == k and -best[0][0] <= self._min_km_outside(lat, radius):
+                break
+            radius += 1
+        return sorted((-neg_km, self.ids[i]) for neg_km, i in best)
+
+    def within(self, lat, lng, km):
+        """Points within ``km`` of the query as ``[(km, id), ...]``, nearest first"""
+        lat_span = km / KM_PER_DEGREE
+        cos_lat = math.cos(math.radians(min(90.0, abs(lat) + lat_span)))
+        lng_span = 180.0 if cos_lat < 1e-9 else min(180.0, lat_span / cos_lat)
+        row_lo, col_lo = self._cell(lat - lat_span, lng - lng_span)
+        row_hi, col_hi = self._cell(lat + lat_span, lng + lng_span)
+        found = []
+        if (row_hi - row_lo + 1) * (col_hi - col_lo + 1) > len(self.cells):
+            candidates = (i for cell in self.cells.values() for i in cell)
+        else:
+            candidates = (i for r in range(row_lo, row_hi + 1) for c in range(col_lo, col_hi + 1)
+                          for i in self.cells.get((r, c), ()))
+        for i in candidates:
+            distance = haversine_km(lat, lng, self.lats[i], self.lngs[i])
+            if distance <= km:
+                found.append((distance, self.ids[i]))
+        found.sort()
+        return found
+
+    def nearest_table(self, n, max_km=None):
+        """``{id: [(km, neighbour_id), ...]}`` with each point's ``n`` nearest others"""
+        table = {}
+        for point_id, lat, lng in zip(self.ids, self.lats, self.lngs):
+            neighbours = self.nearest(lat, lng, n, exclude=point_id)
+            if max_km is not None:
+                neighbours = [(km, other) for km, other in neighbours if km <= max_km]
+            table[point_id] = neighbours
+        return table
@@ -0,0 +1,63 @@
+"""Uploads to Supabase Storage
+
+Photos are stored under content-addressed names (the SHA-256 of their
+bytes), so the same image is only ever uploaded once: a re-run, or a chain
+location sharing another's stock photo, finds the object already there.
+"""
+
+import hashlib
+
+from .errors import HTTPError
+
+BUCKET = "sauna-photos"
+FOLDER = "public"
+
+
+def object_path(filename, bucket=BUCKET):
+    return f"{bucket}/{FOLDER}/{filename}"
+
+
+def public_url(client, filename, bucket=BUCKET):
+    """URL stored in the `photos` column for an uploaded file"""
+    return f"{client.base_url}/storage/v1/object/public/{object_path(filename, bucket)}"
+
+
+def content_filename(data, extension="jpg"):
+    """``<sha256 of data>.<extension>``"""
+    return f"{hashlib.sha256(data).hexdigest()}.{extension}"
+
+
+def upload_photo(client, image_data, filename, bucket=BUCKET, content_type="image/jpeg"):
+    """Upload image bytes to ``sauna-photos/public/<filename>``; returns its public URL"""
+    client.post(f"/storage/v1/object/{object_path(filename, bucket)}", data=image_data,
+                headers={"Content-Type": content_type})
+    return public_url(client, filename, bucket)
+
+
+def object_exists(client, filename, bucket=BUCKET):
+    """Whether ``sauna-photos/public/<filename>`` is already stored"""
+    try:
+        client.head(public_url(client, filename, bucket))
+    except HTTPError as e:
+        # Storage answers 400 rather than 404 for some missing objects
+        if e.status in (400, 404):
+            return False
+        raise
+    return True
+
+
+def upload_new(client, image_data, filename, bucket=BUCKET, content_type="image/jpeg"):
+    """Upload ``image_data`` unless ``filename`` is already stored
+
+    Meant for content-addressed names, where an existing object has the same
+    bytes. Returns ``(public URL, uploaded)``.
+    """
+    if object_exists(client, filename, bucket):
+        return public_url(client, filename, bucket), False
+    try:
+        return upload_photo(client, image_data, filename, bucket, content_type), True
+    except HTTPError as e:
+        # Uploaded by another worker since the check
+        if e.status == 409 or b"Duplicate" in (e.body or b""):
+            return public_url(client, filename, bucket), False
+        raise
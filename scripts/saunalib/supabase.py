@@ -0,0 +1,185 @@
+"""Reads and writes of the Supabase `saunas` table over the PostgREST API"""
+
+import json
+import threading
+
+from .httpclient import HTTPError, supabase_client
+from .ratelimit import RetryBudgetExceeded
+from .schema import NOT_NULL_COLUMNS
+
+DEFAULT_BATCH_SIZE = 100
+# Supabase caps a single response at 1000 rows by default
+DEFAULT_PAGE_SIZE = 1000
+SAUNAS_PATH = "/rest/v1/saunas"
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def default_client():
+    """Process-wide keep-alive Supabase client"""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = supabase_client()
+        return _default_client
+
+
+def iter_rows(client=None, select="*", params=None, page_size=DEFAULT_PAGE_SIZE):
+    """Yield every sauna row, paging through the table in id order with Range headers"""
+    client = client or default_client()
+    start = 0
+    while True:
+        resp = client.get(
+            SAUNAS_PATH,
+            params={"select": select, "order": "id.asc", **(params or {})},
+            headers={"Range-Unit": "items", "Range": f"{start}-{start + page_size - 1}"},
+        )
+        rows = resp.json() or []
+        yield from rows
+        if len(rows) < page_size:
+            return
+        start += page_size
+
+
+def update_row(sauna_id, fields, client=None):
+    """PATCH a single sauna row; returns True if a row was updated"""
+    client = client or default_client()
+    try:
+        resp = client.patch(SAUNAS_PATH, params={"id": f"eq.{sauna_id}", "select": "id"},
+                            json=fields, headers={"Prefer": "return=representation"})
+        return bool(resp.json())
+    except (HTTPError, OSError, RetryBudgetExceeded) as e:
+        print(f"Error updating ID {sauna_id}: {e}")
+        return False
+
+
+def update_place_id(sauna_id, place_id, client=None):
+    """Update a single sauna's place_id in Supabase"""
+    return update_row(sauna_id, {"place_id": place_id}, client=client)
+
+
+def _patch_ids(ids, fields, client):
+    resp = client.patch(
+        SAUNAS_PATH,
+        params={"id": f"in.({','.join(str(i) for i in ids)})", "select": "id"},
+        json=fields,
+        headers={"Prefer": "return=representation"},
+    )
+    return {row["id"] for row in resp.json() or []}
+
+
+def _key(row):
+    return frozenset(col for col in row if col != "id")
+
+
+def upsert_rows(rows, batch_size=None, client=None, select="id"):
+    """POST ``rows`` as upserts on ``id``, ``batch_size`` per request; returns the written rows
+
+    Every row must carry the NOT NULL columns (``schema.NOT_NULL_COLUMNS``):
+    Postgres checks them on the proposed insert row before it resolves the
+    conflict. Rows with an ``id`` update that row, only in the columns they
+    hold; rows without one are inserted (``missing=default`` lets the table
+    number them). Rows are grouped by their other columns, since a column
+    missing from one object of a bulk body would be written as its default.
+    """
+    client = client or default_client()
+    groups = {}
+    for row in rows:
+        groups.setdefault(_key(row), []).append(row)
+    written = []
+    for group in groups.values():
+        size = batch_size or len(group)
+        for start in range(0, len(group), size):
+            batch = group[start:start + size]
+            resp = client.post(
+                SAUNAS_PATH,
+                params={"on_conflict": "id", "columns": ",".join(sorted({c for r in batch for c in r})),
+                        "select": select},
+                json=batch,
+                headers={"Prefer": "resolution=merge-duplicates,missing=default,return=representation"},
+            )
+            written.extend(resp.json() or [])
+    return written
+
+
+def _with_required(batch, client):
+    """``batch`` with the stored NOT NULL columns filled in where a row lacks them
+
+    One GET per batch. Rows whose id isn't in the table are left out, so they
+    can't be inserted by the upsert.
+    """
+    missing = [row["id"] for row in batch if any(col not in row for col in NOT_NULL_COLUMNS)]
+    if not missing:
+        return batch
+    stored = {row["id"]: row for row in iter_rows(
+        client, select=",".join(("id", *NOT_NULL_COLUMNS)),
+        params={"id": f"in.({','.join(str(i) for i in missing)})"})}
+    complete = []
+    for row in batch:
+        if row["id"] in missing:
+            if row["id"] not in stored:
+                continue
+            row = {**stored[row["id"]], **row}
+        complete.append(row)
+    return complete
+
+
+def bulk_update(rows, batch_size=DEFAULT_BATCH_SIZE, client=None):
+    """Apply partial updates to many saunas in about ``len(rows) / batch_size`` requests.
+
+    ``rows`` are dicts holding an ``id`` plus the columns to change. Rows
+    whose changes are identical (the same price, the same hours compiled)
+    share one ``PATCH ...?id=in.(...)`` per ``batch_size`` ids. The rest are
+    upserted ``batch_size`` at a time (``upsert_rows``). Rows that don't
+    carry the NOT NULL columns get them from one GET per batch first, which
+    also keeps an unknown id from being inserted. Callers that already hold
+    the stored ``name``, ``address`` and ``city_slug`` should pass them and
+    save that GET. If a batch fails, its rows are retried one PATCH at a
+    time so a single bad row doesn't fail its neighbours.
+
+    Returns a dict mapping each id to True (written) or False (failed).
+    """
+    client = client or default_client()
+    groups = {}
+    for row in rows:
+        fields = {k: v for k, v in row.items() if k != "id"}
+        key = json.dumps(fields, sort_keys=True)
+        groups.setdefault(key, (fields, []))[1].append(row["id"])
+
+    results = {}
+    singles = []
+    for fields, ids in groups.values():
+        if len(ids) == 1:
+            singles.append({"id": ids[0], **fields})
+            continue
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            try:
+                written = _patch_ids(batch, fields, client)
+            except (HTTPError, OSError, RetryBudgetExceeded, ValueError) as e:
+                _report_failed(batch, e)
+                for sauna_id in batch:
+                    results[sauna_id] = update_row(sauna_id, fields, client=client)
+                continue
+            for sauna_id in batch:
+                results[sauna_id] = sauna_id in written
+
+    for start in range(0, len(singles), batch_size):
+        batch = singles[start:start + batch_size]
+        try:
+            written = {row["id"] for row in upsert_rows(_with_required(batch, client), client=client)}
+        except (HTTPError, OSError, RetryBudgetExceeded, ValueError) as e:
+            _report_failed(batch, e)
+            for row in batch:
+                results[row["id"]] = update_row(row["id"], {k: v for k, v in row.items() if k != "id"},
+                                                client=client)
+            continue
+        for row in batch:
+            results[row["id"]] = row["id"] in written
+    return results
+
+
+def _report_failed(batch, error):
+    detail = error.text() if isinstance(error, HTTPError) else error
+    print(f"Bulk update of {len(batch)} rows failed ({detail}); retrying row by row")
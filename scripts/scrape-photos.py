@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Scrape Google Places photos for saunas that have none
+
+Python version of the SCRAPING_GUIDE.md photo flow, run as a concurrent
+pipeline: Place Details → photo download → Storage upload → batched upsert
+of the `photos` column.
+
+Photos are stored as <sha256>.jpg, so images already in Storage (from an
+earlier run, or a chain's stock photo) are not uploaded again, and photos
+that look like one already kept for the same sauna are dropped.
+
+Each photo is also stored as AVIF and WebP at a few widths, plus a tiny
+placeholder, made with Pillow on one worker process per CPU and recorded in
+the `photo_variants` column. --no-variants uploads the originals only.
+
+Usage: python3 scripts/scrape-photos.py [--city nyc] [--limit N] [--max-photos 5]
+"""
+
+import argparse
+
+from saunalib.httpclient import supabase_client
+from saunalib.images import DEFAULT_FORMATS, DEFAULT_NEAR_DUPLICATE_BITS, DEFAULT_WIDTHS
+from saunalib.photos import DEFAULT_BATCH_SIZE, DEFAULT_WORKERS, PhotoPipeline
+from saunalib.ratelimit import SCHEDULERS
+from saunalib.supabase import iter_rows
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape Google Places photos for saunas missing them")
+    parser.add_argument("--city", help="only saunas with this city_slug")
+    parser.add_argument("--limit", type=int, help="process at most N saunas")
+    parser.add_argument("--max-photos", type=int, default=5, help="photos per sauna (default 5)")
+    for stage, workers in DEFAULT_WORKERS.items():
+        parser.add_argument(f"--{stage}-workers", type=int, default=workers,
+                            help=f"concurrent {stage} calls (default {workers})")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"saunas per bulk photos upsert (default {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--no-variants", action="store_true",
+                        help="upload the original JPEGs only (no Pillow needed)")
+    parser.add_argument("--widths", type=int, nargs="+", default=list(DEFAULT_WIDTHS),
+                        help=f"variant widths in px (default {' '.join(map(str, DEFAULT_WIDTHS))})")
+    parser.add_argument("--formats", nargs="+", default=list(DEFAULT_FORMATS),
+                        help=f"variant formats (default {' '.join(DEFAULT_FORMATS)})")
+    parser.add_argument("--processes", type=int,
+                        help="worker processes making variants (default: one per CPU)")
+    parser.add_argument("--near-duplicate-bits", type=int, default=DEFAULT_NEAR_DUPLICATE_BITS,
+                        help="drop a photo within this many bits (of 64) of one already kept "
+                             f"for the sauna (default {DEFAULT_NEAR_DUPLICATE_BITS})")
+    parser.add_argument("--keep-near-duplicates", action="store_true",
+                        help="only drop exact duplicates (no Pillow needed)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    client = supabase_client()
+
+    params = {"city_slug": f"eq.{args.city}"} if args.city else None
+    missing = [
+        row for row in iter_rows(client, select="id,name,address,city_slug,place_id,photos", params=params)
+        if row.get("place_id") and not row.get("photos")
+    ][:args.limit]
+    print(f"📷 {len(missing)} saunas missing photos\n")
+
+    def report(sauna, urls, errors):
+        if urls:
+            print(f"✓ {sauna['name']}: {len(urls)} photo(s)")
+        elif not errors:
+            print(f"⊘ No photos found for {sauna['name']}")
+        for error in errors:
+            print(f"✗ {sauna['name']}: {error}")
+
+    pipeline = PhotoPipeline(
+        client,
+        max_photos=args.max_photos,
+        workers={stage: getattr(args, f"{stage}_workers") for stage in DEFAULT_WORKERS},
+        batch_size=args.batch_size,
+        on_sauna=report,
+        variants=not args.no_variants,
+        widths=args.widths,
+        formats=args.formats,
+        processes=args.processes,
+        near_duplicate_bits=None if args.keep_near_duplicates else args.near_duplicate_bits,
+    )
+    try:
+        updated = pipeline.run(missing)
+    finally:
+        client.close()
+
+    print(f"\n✅ Updated photos for {sum(updated.values())}/{len(missing)} saunas\n")
+    print(pipeline.summary())
+    for scheduler in SCHEDULERS.values():
+        if scheduler.calls:
+            print(scheduler.summary())
+
+
+if __name__ == "__main__":
+    main()
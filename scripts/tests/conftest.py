@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pytest
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from saunalib.fake_supabase import FakeSupabase  # noqa: E402
+from saunalib.httpclient import supabase_client  # noqa: E402
+
+
+def venue(n, city_slug="nyc", **fields):
+    """A complete `saunas` row for seeding the fake"""
+    return {"name": f"Sauna {n}", "address": f"{n} Main St", "neighborhood": "Midtown",
+            "lat": 40.75, "lng": -73.98, "rating": 4.5, "rating_count": 10, "price": "$$",
+            "types": ["Bathhouse"], "amenities": ["sauna"], "hours": "Daily 9AM-9PM",
+            "place_id": f"place-{n}", "description": "A sauna.", "city_slug": city_slug, **fields}
+
+
+@pytest.fixture
+def fake():
+    with FakeSupabase() as server:
+        yield server
+
+
+@pytest.fixture
+def client(fake):
+    return supabase_client(fake.url, key="local")
+
+
+@pytest.fixture
+def seed(fake):
+    """``seed(n, **fields)`` stores ``n`` complete rows and returns their ids"""
+    def add(n, **fields):
+        return [row["id"] for row in fake.store.insert([venue(i, **fields) for i in range(n)])]
+    return add
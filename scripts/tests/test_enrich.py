@@ -0,0 +1,18 @@
+from saunalib.enrich import enrich_table
+from saunalib.supabase import iter_rows
+
+
+def test_enrich_upserts_each_chunk_and_cross_checks_each_city(fake, client, seed):
+    # Every seeded venue has the same hours; each city's venues share one pin
+    nyc = seed(3)
+    la = seed(2, city_slug="la", lat=34.05, lng=-118.29)
+    fake.requests.clear()
+
+    result = enrich_table(client, processes=1)
+
+    assert result.processed == 5 and result.updated == 5 and result.failed == 0
+    # One GET, then one upsert of the chunk's five changed rows
+    assert fake.requests == {"GET": 1, "POST": 1}
+    assert len({row["hours_mask"] for row in iter_rows(client)}) == 1
+    # A shared pin flags the later venue of each pair
+    assert result.flagged == set(nyc[1:] + la[1:])
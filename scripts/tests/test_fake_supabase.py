@@ -0,0 +1,50 @@
+import pytest
+
+from saunalib.httpclient import HTTPError
+from saunalib.supabase import SAUNAS_PATH, iter_rows
+
+
+def upsert(client, rows, columns=None):
+    params = {"on_conflict": "id", "select": "id"}
+    if columns:
+        params["columns"] = ",".join(columns)
+    return client.post(SAUNAS_PATH, params=params, json=rows,
+                       headers={"Prefer": "resolution=merge-duplicates,return=representation"})
+
+
+def test_partial_row_upsert_fails_on_not_null(fake, client, seed):
+    ids = seed(2)
+    with pytest.raises(HTTPError) as error:
+        upsert(client, [{"id": i, "price": "$"} for i in ids], columns=["id", "price"])
+    assert error.value.status == 400
+    assert "23502" in error.value.text()
+    # The whole statement is rolled back
+    assert {row["price"] for row in iter_rows(client)} == {"$$"}
+
+
+def test_full_row_upsert_merges(fake, client, seed):
+    ids = seed(1)
+    row = next(iter_rows(client))
+    upsert(client, [{**row, "price": "$"}])
+    assert [r["price"] for r in iter_rows(client)] == ["$"]
+    assert len(fake.store) == len(ids)
+
+
+def test_patch_cannot_null_a_required_column(fake, client, seed):
+    ids = seed(1)
+    with pytest.raises(HTTPError) as error:
+        client.patch(SAUNAS_PATH, params={"id": f"eq.{ids[0]}"}, json={"name": None})
+    assert "23502" in error.value.text()
+
+
+def test_missing_id_needs_missing_default(fake, client, seed):
+    seed(1)
+    row = next(iter_rows(client))
+    new = {k: v for k, v in row.items() if k not in ("id", "created_at", "updated_at")}
+    columns = ["id", *new]
+    with pytest.raises(HTTPError) as error:
+        upsert(client, [new], columns=columns)
+    assert "23502" in error.value.text()
+    client.post(SAUNAS_PATH, params={"on_conflict": "id", "columns": ",".join(columns)}, json=[new],
+                headers={"Prefer": "resolution=merge-duplicates,missing=default"})
+    assert len(fake.store) == 2
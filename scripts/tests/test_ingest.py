@@ -0,0 +1,60 @@
+from saunalib.existing import CityIndex, ExistingIndex
+from saunalib.ingest import ingest
+from saunalib.schema import REQUIRED_COLUMNS
+from saunalib.supabase import iter_rows
+
+
+def test_sync_writes_one_upsert_per_chunk(fake, client, seed):
+    seed(5)
+    records = [(f"seed:{row['id']}", {col: row[col] for col in REQUIRED_COLUMNS})
+               for row in iter_rows(client)]
+    # Three venues get the same new price, one a rating of its own, one stays as it is
+    for _, record in records[:3]:
+        record["price"] = "$"
+    records[3][1]["rating"] = 4.9
+    fake.requests.clear()
+
+    result = ingest(records, client, index=CityIndex(client), partial=True)
+
+    assert not result.failed and not result.invalid
+    assert len(result.updated) == 4 and result.unchanged == 1
+    # One GET for the city's rows and one upsert for the chunk's four changes
+    assert fake.requests == {"GET": 1, "POST": 1}
+    stored = {row["id"]: row for row in iter_rows(client)}
+    assert [stored[i]["price"] for i in sorted(stored)] == ["$", "$", "$", "$$", "$$"]
+    assert stored[sorted(stored)[3]]["rating"] == 4.9
+
+
+def test_sync_keeps_columns_the_input_lacks(fake, client, seed):
+    ids = seed(2, website_url="https://example.com")
+    records = [(f"seed:{row['id']}", {col: row[col] for col in REQUIRED_COLUMNS})
+               for row in iter_rows(client)]
+    for _, record in records:
+        record["rating"] = 3.0
+    fake.requests.clear()
+
+    result = ingest(records, client, batch_size=1, index=CityIndex(client), partial=True)
+
+    assert sorted(result.updated) == ids
+    assert fake.requests == {"GET": 1, "POST": 2}
+    assert all(row["rating"] == 3.0 and row["website_url"] == "https://example.com"
+               for row in iter_rows(client))
+
+
+def test_reingest_writes_new_and_changed_records_in_one_request(fake, client, seed):
+    seed(50)
+    records = [(f"seed:{row['id']}", {col: row[col] for col in REQUIRED_COLUMNS})
+               for row in iter_rows(client)]
+    for _, record in records:
+        record["rating"] = 4.0
+    new = dict(records[0][1], name="Brand New Sauna", address="1 New St", place_id="place-new")
+    records.append(("seed:new", new))
+    fake.requests.clear()
+
+    result = ingest(records, client, index=ExistingIndex.fetch(client))
+
+    assert len(result.updated) == 50 and [row["name"] for row in result.inserted] == ["Brand New Sauna"]
+    # The index read, then one upsert for the 200-record chunk
+    assert fake.requests == {"GET": 1, "POST": 1}
+    assert len(fake.store) == 51
+    assert {row["rating"] for row in iter_rows(client)} == {4.0}
@@ -0,0 +1,22 @@
+import math
+
+from saunalib.fake_places import FakePlaces
+from saunalib.photos import PhotoPipeline
+from saunalib.supabase import iter_rows
+
+
+def test_photo_rows_are_upserted_in_batches(fake, client, seed, tmp_path, monkeypatch):
+    seed(5)
+    with FakePlaces(str(tmp_path), synthesize=True, photos=2) as places:
+        monkeypatch.setenv("PLACES_URL", places.url)
+        monkeypatch.setenv("GOOGLE_PLACES_API_KEY", "local")
+        saunas = list(iter_rows(client, select="id,name,address,city_slug,place_id"))
+        fake.requests.clear()
+        pipeline = PhotoPipeline(client, batch_size=2, near_duplicate_bits=None)
+        updated = pipeline.run(saunas)
+
+    assert updated == {sauna["id"]: True for sauna in saunas}
+    # Storage uploads aside, the rows go out as ceil(5 / 2) upserts and nothing else
+    assert fake.requests.get("POST", 0) - pipeline.uploaded == math.ceil(len(saunas) / 2)
+    assert "PATCH" not in fake.requests and "GET" not in fake.requests
+    assert all(len(row["photos"]) == 2 for row in iter_rows(client))
@@ -0,0 +1,55 @@
+import math
+
+from saunalib.supabase import bulk_update, iter_rows
+
+
+def rows_by_id(client):
+    return {row["id"]: row for row in iter_rows(client)}
+
+
+def test_identical_changes_share_one_patch(fake, client, seed):
+    ids = seed(5)
+    fake.requests.clear()
+    results = bulk_update([{"id": i, "amenities": ["sauna", "steam_room"]} for i in ids], client=client)
+    assert results == {i: True for i in ids}
+    assert fake.requests == {"PATCH": 1}
+    assert all(row["amenities"] == ["sauna", "steam_room"] for row in rows_by_id(client).values())
+
+
+def test_distinct_changes_are_upserted_per_batch(fake, client, seed):
+    ids = seed(5)
+    stored = rows_by_id(client)
+    fake.requests.clear()
+    rows = [{"id": i, "place_id": f"new-{i}",
+             **{col: stored[i][col] for col in ("name", "address", "city_slug")}} for i in ids]
+    results = bulk_update(rows, batch_size=2, client=client)
+    assert results == {i: True for i in ids}
+    # ceil(5 / 2) upserts and nothing else
+    assert fake.requests == {"POST": math.ceil(len(ids) / 2)}
+    assert {row["place_id"] for row in rows_by_id(client).values()} == {f"new-{i}" for i in ids}
+    assert len(fake.store) == len(ids)
+
+
+def test_missing_required_columns_are_fetched_once_per_batch(fake, client, seed):
+    ids = seed(5)
+    fake.requests.clear()
+    results = bulk_update([{"id": i, "place_id": f"new-{i}"} for i in ids], batch_size=2, client=client)
+    assert results == {i: True for i in ids}
+    assert fake.requests == {"GET": 3, "POST": 3}
+    assert {row["place_id"] for row in rows_by_id(client).values()} == {f"new-{i}" for i in ids}
+
+
+def test_groups_are_split_into_batches(fake, client, seed):
+    ids = seed(5)
+    fake.requests.clear()
+    bulk_update([{"id": i, "price": "$"} for i in ids], batch_size=2, client=client)
+    assert fake.requests == {"PATCH": 3}
+
+
+def test_unknown_id_is_not_inserted(fake, client, seed):
+    ids = seed(2)
+    results = bulk_update([{"id": i, "price": "$"} for i in ids + [999]], client=client)
+    assert results == {ids[0]: True, ids[1]: True, 999: False}
+    results = bulk_update([{"id": i, "place_id": f"new-{i}"} for i in ids + [999]], client=client)
+    assert results == {ids[0]: True, ids[1]: True, 999: False}
+    assert len(fake.store) == 2
@@ -101,7 +101,7 @@ export default function BottomSheet({
       <div className="overflow-y-auto custom-scrollbar" style={{ maxHeight: '60vh' }}>
         {/* Photo carousel */}
         {photos.length > 0 && (
-          <PhotoCarousel photos={photos} alt={sauna.name} />
+          <PhotoCarousel photos={photos} variants={sauna.photo_variants} alt={sauna.name} />
         )}
 
         <div className="px-3 py-3">
@@ -70,6 +70,7 @@ function SaunaMarker({ sauna, isSelected, onClick, disableInfoWindow }) {
               <div className="relative">
                 <PhotoCarousel
                   photos={sauna.photos || (sauna.photo_url ? [sauna.photo_url] : [])}
+                  variants={sauna.photo_variants}
                   alt={sauna.name}
                   hideCounter
                 />
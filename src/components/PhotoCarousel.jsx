@@ -1,7 +1,10 @@
 import { useState, useRef } from 'react';
 import CarouselArrowButton from './CarouselArrowButton';
 
-export default function PhotoCarousel({ photos, alt = 'Sauna', hideCounter = false }) {
+// Cards are at most ~400px wide; full width on phones
+const SIZES = '(max-width: 640px) 100vw, 400px';
+
+export default function PhotoCarousel({ photos, variants, alt = 'Sauna', hideCounter = false }) {
   const [currentIndex, setCurrentIndex] = useState(0);
   const touchStartX = useRef(null);
   const mouseStartX = useRef(null);
@@ -10,6 +13,9 @@ export default function PhotoCarousel({ photos, alt = 'Sauna', hideCounter = fal
     return null;
   }
 
+  // Smaller AVIF/WebP copies from scrape-photos.py, if this photo has them
+  const variant = variants?.find(v => v?.src === photos[currentIndex]);
+
   const goToPrevious = (e) => {
     e.stopPropagation();
     setCurrentIndex((prevIndex) =>
@@ -62,12 +68,21 @@ export default function PhotoCarousel({ photos, alt = 'Sauna', hideCounter = fal
       onTouchStart={handleTouchStart}
       onTouchEnd={handleTouchEnd}
     >
-      <img
-        src={photos[currentIndex]}
-        alt={`${alt} ${currentIndex + 1}`}
-        className="w-full h-full object-cover"
-        style={{ maxWidth: '100%', maxHeight: '100%' }}
-      />
+      <picture className="block w-full h-full">
+        {variant && Object.entries(variant.srcset || {}).map(([format, srcSet]) => (
+          <source key={format} type={`image/${format}`} srcSet={srcSet} sizes={SIZES} />
+        ))}
+        <img
+          src={photos[currentIndex]}
+          alt={`${alt} ${currentIndex + 1}`}
+          className="w-full h-full object-cover"
+          style={{
+            maxWidth: '100%',
+            maxHeight: '100%',
+            ...(variant?.placeholder && { backgroundImage: `url(${variant.placeholder})`, backgroundSize: 'cover' }),
+          }}
+        />
+      </picture>
 
       {photos.length > 1 && (
         <>
@@ -29,6 +29,7 @@ export default function SaunaCard({ sauna, isSelected, onClick, user, isFavorite
       {(sauna.photos || sauna.photo_url) && (
         <PhotoCarousel
           photos={sauna.photos || (sauna.photo_url ? [sauna.photo_url] : [])}
+          variants={sauna.photo_variants}
           alt={sauna.name}
         />
       )}